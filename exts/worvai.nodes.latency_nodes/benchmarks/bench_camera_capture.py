@@ -0,0 +1,97 @@
+"""
+Microbenchmark: per-frame cost of the Camera Data Capture frame path,
+at 720p, 1080p and 4K, runnable without Isaac Sim:
+    python benchmarks/bench_camera_capture.py
+
+"original" is the path the node used to take: np.array(data), the
+data[:, :, :3] alpha strip, flatten() of the non-contiguous view, and a
+last copy when the flat array is written to the uchar[] output.
+"pool" copied the frame into a FramePool slab, then into the output.
+"direct" is what the node does now: one strided copy (pack_frame, channel
+by channel for the alpha-stripped view) straight into the output array,
+which is only resized when the resolution changes.
+The output array is modeled by a preallocated NumPy buffer, and the write
+of a flat array to it (what Fabric does on assignment) by np.copyto.
+Rows are for the RGBA LdrColor annotator (alpha stripped) and the float32
+depth annotator (layout already matches, values cast to the uchar output).
+"""
+import os
+import sys
+import timeit
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(
+    os.path.dirname(os.path.abspath(__file__)),
+    os.pardir, "worvai", "nodes", "latency_nodes"
+))
+
+from latency_core import FramePool, pack_frame  # noqa: E402
+
+
+RESOLUTIONS = (
+    ("720p", 1280, 720),
+    ("1080p", 1920, 1080),
+    ("4K", 3840, 2160),
+)
+N_FRAMES = 20
+
+
+def annotator_frame(width, height, data_type):
+    rng = np.random.default_rng(0)
+    if data_type == "rgb":
+        return rng.integers(0, 256, (height, width, 4), dtype=np.uint8)
+    return rng.random((height, width), dtype=np.float32) * 255
+
+
+def strip_alpha(data):
+    return data[:, :, :3] if data.ndim == 3 and data.shape[2] == 4 else data
+
+
+def original(data, output):
+    frame = np.array(data)
+    frame = strip_alpha(frame)
+    flat = frame.flatten()
+    # Assigning the flat array to the output copies (and casts) it once more
+    np.copyto(output, flat, casting='unsafe')
+
+
+def pooled(data, output, pool):
+    frame = strip_alpha(np.asarray(data))
+    flat = pool.acquire()
+    np.copyto(flat.reshape(frame.shape), frame)
+    np.copyto(output, flat, casting='unsafe')
+    pool.release(flat)
+
+
+def direct(data, output):
+    pack_frame(strip_alpha(np.asarray(data)), output)
+
+
+def per_frame_ms(function):
+    return min(timeit.repeat(function, number=N_FRAMES, repeat=3)) / N_FRAMES * 1e3
+
+
+def main():
+    print(f"{'frame':<14}{'original':>12}{'pool':>12}{'direct':>12}{'speedup':>11}   (ms/frame)")
+    for data_type in ("rgb", "depth"):
+        for name, width, height in RESOLUTIONS:
+            data = annotator_frame(width, height, data_type)
+            frame = strip_alpha(data)
+            output = np.empty(frame.size, dtype=np.uint8)
+            pool = FramePool((frame.size,), frame.dtype, capacity=2)
+
+            before = per_frame_ms(lambda: original(data, output))
+            pool_ms = per_frame_ms(lambda: pooled(data, output, pool))
+            after = per_frame_ms(lambda: direct(data, output))
+
+            expected = np.empty_like(output)
+            original(data, expected)
+            assert np.array_equal(output, expected)
+
+            label = f"{data_type} {name}"
+            print(f"{label:<14}{before:>12.3f}{pool_ms:>12.3f}{after:>12.3f}{before / after:>10.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+"""
+Simulation: frame readbacks of the Render Product Latency Controller with
+and without capture coalescing, runnable without Isaac Sim:
+    python benchmarks/bench_capture_coalescing.py
+
+The node runs at a fixed tick rate, captures one frame per tick (a
+readback) and emits the newest ready frame. With coalescing, plan_capture
+skips frames the queue would drop and lets a frame released on the same
+tick as the last queued one replace it. The "emitted" column checks that
+both runs emit the same frames on the same ticks, and "queued" is the
+largest number of frames held at once.
+"""
+import os
+import sys
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(
+    os.path.dirname(os.path.abspath(__file__)),
+    os.pardir, "worvai", "nodes", "latency_nodes"
+))
+
+from latency_core import CaptureAction, LatencyQueue, plan_capture  # noqa: E402
+
+
+N_TICKS = 10_000
+DT = 1.0 / 60.0
+
+
+def latency_schedules(rng):
+    """(name, one latency per tick) of the simulated latency inputs"""
+    steps = np.repeat(rng.uniform(0.0, 0.5, N_TICKS // 100), 100)
+    return (
+        ("constant 100 ms", np.full(N_TICKS, 0.1)),
+        ("normal(100, 30) ms", np.clip(rng.normal(0.1, 0.03, N_TICKS), 0.0, None)),
+        ("exponential 50 ms", rng.exponential(0.05, N_TICKS)),
+        ("steps every 100 ticks", steps),
+        # Frames held until the next 10 Hz boundary: emitted at 10 Hz
+        ("10 Hz sample and hold", 0.1 - (np.arange(N_TICKS) % 6) * DT),
+    )
+
+
+def simulate(latencies, coalesce):
+    """Readbacks, emitted (tick, frame) pairs and peak queue length"""
+    queue = LatencyQueue()
+    readbacks = 0
+    emitted = []
+    peak = 0
+    for tick, latency in enumerate(latencies):
+        current_time = tick * DT
+        action = plan_capture(queue, current_time, latency, DT) if coalesce else CaptureAction.PUSH
+        if action == CaptureAction.REPLACE:
+            readbacks += 1
+            queue.replace_last(current_time, latency, tick)
+        elif action == CaptureAction.PUSH:
+            readbacks += 1
+            queue.push(current_time, latency, tick)
+        peak = max(peak, len(queue))
+
+        ready = queue.pop_ready(current_time)
+        if ready:
+            emitted.append((tick, ready[-1][1]))
+    return readbacks, emitted, peak
+
+
+def main():
+    rng = np.random.default_rng(0)
+    print(f"{'latency':<24}{'readbacks':>11}{'coalesced':>11}{'emitted':>9}{'queued':>14}{'saved':>8}")
+    for name, latencies in latency_schedules(rng):
+        before, emitted, peak = simulate(latencies, coalesce=False)
+        after, coalesced_emitted, coalesced_peak = simulate(latencies, coalesce=True)
+        same = "" if emitted == coalesced_emitted else "  DIFFERENT"
+        print(f"{name:<24}{before:>11}{after:>11}{len(emitted):>9}"
+              f"{peak:>7} -> {coalesced_peak:<4}{1 - after / before:>8.0%}{same}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+"""
+Microbenchmark: per-frame cost, size and error of the depth encodings of
+the camera nodes, at 720p, 1080p and 4K, runnable without Isaac Sim:
+    python benchmarks/bench_depth_encoding.py
+
+"per-frame" is the path the Render Product Latency Controller used to
+take: normalize each float32 depth frame by its own min / max into a
+pooled uint8 frame. Its scale changes every frame and is not published,
+so its error is only recoverable here, and a single inf pixel (no hit)
+turns the whole frame to 0. The other rows are DepthEncoder writing into
+a preallocated frame with the fixed range [DEPTH_MIN, DEPTH_MAX]; "error"
+is the largest decoding error in millimetres over the range.
+"""
+import os
+import sys
+import timeit
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(
+    os.path.dirname(os.path.abspath(__file__)),
+    os.pardir, "worvai", "nodes", "latency_nodes"
+))
+
+from latency_core import DepthEncoder, DepthEncoding  # noqa: E402
+
+
+RESOLUTIONS = (
+    ("720p", 1280, 720),
+    ("1080p", 1920, 1080),
+    ("4K", 3840, 2160),
+)
+N_FRAMES = 20
+DEPTH_MIN = 0.0
+DEPTH_MAX = 10.0
+
+
+def depth_frame(width, height):
+    rng = np.random.default_rng(0)
+    return rng.uniform(0.3, DEPTH_MAX, (height, width)).astype(np.float32)
+
+
+def per_frame(data, frame, scratch):
+    data_min = data.min()
+    data_range = data.max() - data_min
+    scale = 255.0 / data_range if data_range > 0 else 0.0
+    np.subtract(data, data_min, out=scratch, casting='unsafe')
+    np.multiply(scratch, scale, out=frame, casting='unsafe')
+
+
+def decode(encoding, frame):
+    """Depth in meters of an encoded frame"""
+    if encoding == DepthEncoding.MONO8:
+        return frame / 255.0 * (DEPTH_MAX - DEPTH_MIN) + DEPTH_MIN
+    if encoding == DepthEncoding.MILLIMETERS_16:
+        return frame / 1000.0
+    return frame.astype(np.float64)
+
+
+def per_frame_ms(function):
+    return min(timeit.repeat(function, number=N_FRAMES, repeat=3)) / N_FRAMES * 1e3
+
+
+def main():
+    print(f"{'frame':<8}{'encoding':<12}{'ms/frame':>10}{'MB/frame':>10}{'error mm':>10}")
+    for name, width, height in RESOLUTIONS:
+        data = depth_frame(width, height)
+        depth = data.astype(np.float64)
+
+        frame = np.empty(data.shape, dtype=np.uint8)
+        scratch = np.empty(data.shape, dtype=np.float32)
+        ms = per_frame_ms(lambda: per_frame(data, frame, scratch))
+        data_min = float(data.min())
+        decoded = frame / 255.0 * (float(data.max()) - data_min) + data_min
+        error = np.abs(decoded - depth).max() * 1e3
+        print(f"{name:<8}{'per-frame':<12}{ms:>10.3f}{frame.nbytes / 1e6:>10.2f}{error:>10.2f}")
+
+        for encoding in DepthEncoding.ALL:
+            encoder = DepthEncoder(encoding, DEPTH_MIN, DEPTH_MAX)
+            slab = np.empty(encoder.nbytes(data), dtype=np.uint8)
+            frame = slab.view(encoder.dtype).reshape(data.shape)
+            ms = per_frame_ms(lambda: encoder.encode(data, frame))
+            error = np.abs(decode(encoding, frame) - depth).max() * 1e3
+            print(f"{'':<8}{encoding:<12}{ms:>10.3f}{slab.nbytes / 1e6:>10.2f}{error:>10.2f}")
+
+
+if __name__ == "__main__":
+    main()
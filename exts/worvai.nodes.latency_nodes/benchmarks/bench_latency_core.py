@@ -0,0 +1,135 @@
+"""
+Benchmark suite for latency_core, runnable without Isaac Sim:
+    python benchmarks/bench_latency_core.py
+
+Measures, for each queue policy:
+    - enqueue / dequeue throughput (items per second)
+    - release jitter: how late an item is released compared to its
+      requested release time when the queue is polled once per tick
+    - memory per queued item (tracemalloc, payload excluded)
+and, for many mostly idle queues, the per-tick cost of polling every queue
+with and without the shared timing wheel.
+"""
+import os
+import random
+import statistics
+import sys
+import timeit
+import tracemalloc
+
+sys.path.insert(0, os.path.join(
+    os.path.dirname(os.path.abspath(__file__)),
+    os.pardir, "worvai", "nodes", "latency_nodes"
+))
+
+from latency_core import LatencyQueue, LatencyQueuePolicy, TimingWheel  # noqa: E402
+
+
+N_ITEMS = 100_000
+DT = 1.0 / 60.0
+LATENCY = 0.4
+LATENCY_STD = 0.1
+
+
+def bench_throughput(policy):
+    """Enqueue N_ITEMS, then dequeue all of them in one pop_ready"""
+    rng = random.Random(0)
+    latencies = [max(0.0, rng.gauss(LATENCY, LATENCY_STD)) for _ in range(N_ITEMS)]
+    payload = object()
+
+    def enqueue():
+        queue = LatencyQueue(policy)
+        push = queue.push
+        for i, latency in enumerate(latencies):
+            push(i * DT, latency, payload)
+        return queue
+
+    enqueue_s = min(timeit.repeat(enqueue, number=1, repeat=3))
+
+    dequeue_s = float('inf')
+    for _ in range(3):
+        queue = enqueue()
+        n_items = len(queue)
+        dequeue_s = min(dequeue_s, timeit.timeit(
+            lambda: queue.pop_ready(float('inf')), number=1
+        ))
+
+    return N_ITEMS / enqueue_s, n_items / dequeue_s
+
+
+def bench_release_jitter(policy):
+    """Poll once per tick and record (actual - requested) release time"""
+    rng = random.Random(0)
+    queue = LatencyQueue(policy)
+    requested = {}
+    lateness = []
+
+    n_ticks = 20_000
+    for tick in range(n_ticks):
+        now = tick * DT
+        latency = max(0.0, rng.gauss(LATENCY, LATENCY_STD))
+        if queue.push(now, latency, tick):
+            requested[tick] = now + latency
+        for _, item in queue.pop_ready(now):
+            lateness.append(now - requested.pop(item))
+
+    lateness.sort()
+    return (
+        statistics.fmean(lateness),
+        lateness[int(0.99 * (len(lateness) - 1))],
+        lateness[-1],
+        queue.dropped_count / n_ticks,
+    )
+
+
+def bench_memory_per_item(policy):
+    """Memory held by the queue per item, excluding the payload itself"""
+    payload = object()
+    tracemalloc.start()
+    before, _ = tracemalloc.get_traced_memory()
+    queue = LatencyQueue(policy)
+    for i in range(N_ITEMS):
+        queue.push(i * DT, LATENCY, payload)
+    after, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return (after - before) / len(queue)
+
+
+def bench_idle_queues(n_queues, scheduler):
+    """Per-tick cost of polling n_queues queues whose items are far ahead"""
+    queues = [LatencyQueue(scheduler=scheduler) for _ in range(n_queues)]
+    for i, queue in enumerate(queues):
+        # One queue in 100 releases an item per second
+        queue.push(0.0, 1.0 + (i % 100) * DT, i)
+
+    n_ticks = 600
+    now = [0.0]
+
+    def tick():
+        now[0] += DT
+        for queue in queues:
+            queue.pop_ready(now[0])
+
+    return timeit.timeit(tick, number=n_ticks) / n_ticks * 1e6
+
+
+def main():
+    print(f"{'policy':<10}{'enqueue/s':>14}{'dequeue/s':>14}"
+          f"{'jitter mean':>14}{'jitter p99':>14}{'jitter max':>14}"
+          f"{'drop rate':>12}{'B/item':>10}")
+    for policy in LatencyQueuePolicy.ALL:
+        enqueue_rate, dequeue_rate = bench_throughput(policy)
+        mean, p99, worst, drop_rate = bench_release_jitter(policy)
+        per_item = bench_memory_per_item(policy)
+        print(f"{policy:<10}{enqueue_rate:>14,.0f}{dequeue_rate:>14,.0f}"
+              f"{mean * 1e3:>12.2f}ms{p99 * 1e3:>12.2f}ms{worst * 1e3:>12.2f}ms"
+              f"{drop_rate:>12.1%}{per_item:>10.0f}")
+
+    print(f"\n{'idle queues':<12}{'heap peek':>14}{'timing wheel':>14}   (us/tick)")
+    for n_queues in (100, 1_000, 10_000):
+        print(f"{n_queues:<12}{bench_idle_queues(n_queues, None):>14.1f}"
+              f"{bench_idle_queues(n_queues, TimingWheel(tick=DT)):>14.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+"""
+Microbenchmark: heap-backed LatencyQueue vs. the original deque queue.
+
+Runs without Isaac Sim:
+    python benchmarks/bench_latency_queue.py
+
+For each queue depth, the queue is pre-filled and then driven in a steady
+state (one push and one pop_ready per tick), which is what the latency
+controller does every compute.
+"""
+import os
+import random
+import sys
+import timeit
+from collections import deque
+
+sys.path.insert(0, os.path.join(
+    os.path.dirname(os.path.abspath(__file__)),
+    os.pardir, "worvai", "nodes", "latency_nodes"
+))
+
+from latency_core import LatencyQueue, LatencyQueuePolicy  # noqa: E402
+
+
+DEPTHS = (10, 100, 1_000, 10_000, 100_000)
+TICKS = 10_000
+DT = 1.0 / 60.0
+
+
+class DequeQueue:
+    """The original LatencyController queue, kept as the baseline"""
+
+    def __init__(self):
+        self.latency_queue = deque()
+        self.dropped_count = 0
+
+    def push(self, current_time, latency, data):
+        delayed_time = current_time + latency
+        if self.latency_queue and self.latency_queue[-1][0] >= delayed_time:
+            self.dropped_count += 1
+            return False
+        self.latency_queue.append((delayed_time, data))
+        return True
+
+    def pop_ready(self, current_time):
+        ready = []
+        while self.latency_queue and self.latency_queue[0][0] <= current_time:
+            ready.append(self.latency_queue.popleft())
+        return ready
+
+
+def run(queue, depth, jitter):
+    """Fill the queue to 'depth' and run TICKS steady-state ticks"""
+    rng = random.Random(0)
+    latency = depth * DT
+
+    # Pre-fill: the oldest item is released at the first measured tick
+    for i in range(depth):
+        queue.push(i * DT, latency, i)
+
+    t0 = depth * DT
+
+    def step():
+        for i in range(TICKS):
+            now = t0 + i * DT
+            queue.push(now, latency + rng.gauss(0.0, jitter), i)
+            queue.pop_ready(now)
+
+    seconds = timeit.timeit(step, number=1)
+    return seconds / TICKS * 1e6
+
+
+def main():
+    cases = (
+        ("deque (drop)", lambda: DequeQueue()),
+        ("heap drop", lambda: LatencyQueue(LatencyQueuePolicy.DROP)),
+        ("heap hold", lambda: LatencyQueue(LatencyQueuePolicy.HOLD)),
+        ("heap reorder", lambda: LatencyQueue(LatencyQueuePolicy.REORDER)),
+    )
+
+    for jitter in (0.0, 5 * DT):
+        print(f"\n=== latency jitter std = {jitter:.4f} s ===")
+        print(f"{'queue':<14}" + "".join(f"{d:>12}" for d in DEPTHS) + "   (us/tick)")
+        for name, factory in cases:
+            row, drops = [], []
+            for depth in DEPTHS:
+                queue = factory()
+                row.append(run(queue, depth, jitter))
+                drops.append(queue.dropped_count)
+            print(f"{name:<14}" + "".join(f"{v:>12.2f}" for v in row))
+            print(f"{'  dropped':<14}" + "".join(f"{d:>12}" for d in drops))
+
+
+if __name__ == "__main__":
+    main()
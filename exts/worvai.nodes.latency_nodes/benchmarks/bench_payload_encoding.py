@@ -0,0 +1,95 @@
+"""
+Microbenchmark: per-frame cost, size and error of the normal and
+segmentation encodings of the camera nodes, at 720p, 1080p and 4K,
+runnable without Isaac Sim:
+    python benchmarks/bench_payload_encoding.py
+
+Normals are float32 xyzw frames of random unit normals; the raw 32FC4
+copy is compared with the octahedral encodings (NormalEncoder), and
+"error" is the largest angle between a normal and its decoded value.
+Segmentation frames hold N_SEGMENTS uint32 IDs spread over a wide ID
+range; the raw 32SC1 copy is compared with the lookup table remapping
+(SegmentationEncoder), timed once its table holds every ID, and every
+frame is checked to decode back to its IDs.
+"""
+import os
+import sys
+import timeit
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(
+    os.path.dirname(os.path.abspath(__file__)),
+    os.pardir, "worvai", "nodes", "latency_nodes"
+))
+
+from latency_core import (  # noqa: E402
+    NormalEncoder,
+    NormalEncoding,
+    SegmentationEncoder,
+    SegmentationEncoding,
+    octahedral_decode
+)
+
+
+RESOLUTIONS = (
+    ("720p", 1280, 720),
+    ("1080p", 1920, 1080),
+    ("4K", 3840, 2160),
+)
+N_FRAMES = 10
+N_SEGMENTS = 200
+
+
+def normal_frame(width, height, rng):
+    normals = rng.normal(size=(height, width, 4)).astype(np.float32)
+    normals[..., :3] /= np.linalg.norm(normals[..., :3], axis=-1, keepdims=True)
+    normals[..., 3] = 0.0
+    return normals
+
+
+def segmentation_frame(width, height, rng):
+    ids = np.concatenate(([0], rng.choice(1 << 20, N_SEGMENTS - 1, replace=False))).astype(np.uint32)
+    return ids[rng.integers(0, N_SEGMENTS, (height, width))]
+
+
+def max_angle_deg(normals, frame):
+    decoded = octahedral_decode(frame)
+    cos = np.clip(np.einsum('...i,...i', decoded, normals[..., :3]), -1.0, 1.0)
+    return float(np.degrees(np.arccos(cos)).max())
+
+
+def per_frame_ms(function):
+    return min(timeit.repeat(function, number=N_FRAMES, repeat=3)) / N_FRAMES * 1e3
+
+
+def encoded_frame(encoder, data):
+    slab = np.empty(encoder.nbytes(data), dtype=np.uint8)
+    return slab.view(encoder.dtype).reshape(encoder.frame_shape(data))
+
+
+def main():
+    rng = np.random.default_rng(0)
+    print(f"{'frame':<8}{'payload':<10}{'encoding':<14}{'ms/frame':>10}{'MB/frame':>10}{'error':>14}")
+    for name, width, height in RESOLUTIONS:
+        normals = normal_frame(width, height, rng)
+        for encoding in NormalEncoding.ALL:
+            encoder = NormalEncoder(encoding)
+            frame = encoded_frame(encoder, normals)
+            ms = per_frame_ms(lambda: encoder.encode(normals, frame))
+            error = 0.0 if encoding == NormalEncoding.FLOAT32 else max_angle_deg(normals, frame)
+            print(f"{name:<8}{'normals':<10}{encoding:<14}{ms:>10.3f}{frame.nbytes / 1e6:>10.2f}{error:>10.4f} deg")
+
+        ids = segmentation_frame(width, height, rng)
+        for encoding in SegmentationEncoding.ALL:
+            encoder = SegmentationEncoder(encoding)
+            frame = encoded_frame(encoder, ids)
+            encoder.encode(ids, frame)
+            ms = per_frame_ms(lambda: encoder.encode(ids, frame))
+            if encoding != SegmentationEncoding.INT32:
+                assert np.array_equal(encoder.ids[frame], ids)
+            print(f"{name:<8}{'ids':<10}{encoding:<14}{ms:>10.3f}{frame.nbytes / 1e6:>10.2f}{'exact':>14}")
+
+
+if __name__ == "__main__":
+    main()
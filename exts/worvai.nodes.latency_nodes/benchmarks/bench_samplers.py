@@ -0,0 +1,253 @@
+"""
+Microbenchmark: per-sample cost of the distribution samplers,
+one draw per tick vs. the block buffer (latency_core.SampleBlock).
+
+Runs without Isaac Sim:
+    python benchmarks/bench_samplers.py
+
+"per tick" reproduces what the sampler nodes did on every compute: a
+sample_distribution(**kwargs) call drawing a single value and clamping it
+with clamp_min_max. "block" is what they do now: SampleBlock.next with the
+node's draw_block function. The "trunc" rows sample the
+distribution truncated to [min, max] (boundsMode 'truncate') instead. The
+Markov-modulated "per tick" row is the graph it replaces: one regime
+transition and one sampler call per tick, and the Ornstein-Uhlenbeck
+"per tick" row a Python AR(1) step per tick, where the block runs the
+recursion vectorized (latency_core.ar1_filter). The per-tick GEV row needs scipy
+(the block sampler does not), so the GEV comparison is skipped without it.
+
+The batch rows compare, per tick, N sampler nodes (N SampleBlock.next and
+N StreamingStatistics.update calls) with one batch sampler node
+(BatchSampleBlock.next and BatchStatistics.update for all N environments).
+"""
+import os
+import random
+import sys
+import timeit
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(
+    os.path.dirname(os.path.abspath(__file__)),
+    os.pardir, "worvai", "nodes", "latency_nodes"
+))
+
+from latency_core import (  # noqa: E402
+    AR1Process,
+    BatchSampleBlock,
+    BatchStatistics,
+    MarkovModulatedDistribution,
+    SampleBlock,
+    StreamingStatistics,
+    gev_sample,
+    sample_family,
+    truncated_gev_sample,
+    truncated_normal_sample
+)
+
+try:
+    import scipy.stats as stats
+except ImportError:
+    stats = None
+
+
+N_SAMPLES = 100_000
+N_TICKS = 2_000
+MIN, MAX = 0.0, float('inf')
+
+
+def clamp_min_max(value, min_val, max_val, name=None, verbose=False):
+    """BaseLatencySampler.clamp_min_max, without logging"""
+    clamped_val = value
+    if clamped_val < min_val:
+        clamped_val = min_val
+    if clamped_val > max_val:
+        clamped_val = max_val
+    return clamped_val
+
+
+# === Original per-tick sample_distribution implementations ===
+def normal_per_tick(**kwargs):
+    sample = random.gauss(kwargs['average'], kwargs['std_dev'])
+    return clamp_min_max(
+        sample,
+        min_val=kwargs.get('min', 0.0),
+        max_val=kwargs.get('max', float('inf')),
+        name="Normal distribution sampled latency value",
+        verbose=kwargs.get('verbose', False)
+    )
+
+
+def gev_per_tick(**kwargs):
+    sample = stats.genextreme.rvs(
+        c=kwargs['shape'],
+        loc=kwargs['location'],
+        scale=kwargs['scale']
+    )
+    return clamp_min_max(
+        sample,
+        min_val=kwargs.get('min', 0.0),
+        max_val=kwargs.get('max', float('inf')),
+        name="GEV distribution sampled latency value",
+        verbose=kwargs.get('verbose', False)
+    )
+
+
+def exponential_per_tick(**kwargs):
+    return max(0.0, kwargs.get('shift', 0.0) + random.expovariate(kwargs['rate']))
+
+
+# Gilbert-Elliott model: good N(20 ms, 5 ms), congested 20 ms + lognormal(100 ms, 0.8)
+GILBERT_ELLIOTT = ([[0.99, 0.01], [0.1, 0.9]], ("normal", "lognormal"), (0.02, 0.02), (0.005, 0.1), (0.0, 0.8))
+
+
+def markov_per_tick(**kwargs):
+    # A switch between two sampler nodes, driven by a per-tick transition
+    regime = kwargs['regime']
+    if random.random() >= kwargs['matrix'][regime[0]][regime[0]]:
+        regime[0] = 1 - regime[0]
+    if regime[0] == 0:
+        sample = random.gauss(0.02, 0.005)
+    else:
+        sample = 0.02 + random.lognormvariate(np.log(0.1), 0.8)
+    return clamp_min_max(sample, kwargs.get('min', 0.0), kwargs.get('max', float('inf')))
+
+
+# Ornstein-Uhlenbeck: N(50 ms, 10 ms), correlation time 0.5 s at 60 Hz
+ORNSTEIN_UHLENBECK = (0.05, 0.01, 0.5, 1 / 60)
+
+
+def ou_per_tick(**kwargs):
+    # x[t] = mean + phi * (x[t - 1] - mean) + innovation, one step per tick
+    process = kwargs['process']
+    process.value = process.mean + process.phi * (process.value - process.mean) + random.gauss(0.0, kwargs['noise'])
+    return clamp_min_max(process.value, kwargs.get('min', 0.0), kwargs.get('max', float('inf')))
+
+
+# === Block draw functions, as in the nodes' draw_block ===
+def normal_block(rng, size, average, std_dev):
+    return rng.normal(average, std_dev, size)
+
+
+def gev_block(rng, size, location, scale, shape):
+    return gev_sample(rng, size, location, scale, shape)
+
+
+# boundsMode 'truncate': the distribution truncated to [min, max] by inverse CDF
+def normal_truncated_block(rng, size, average, std_dev, low, high):
+    return truncated_normal_sample(rng, size, average, std_dev, low, high)
+
+
+def gev_truncated_block(rng, size, location, scale, shape, low, high):
+    return truncated_gev_sample(rng, size, location, scale, shape, low, high)
+
+
+def exponential_block(rng, size, rate, shift):
+    samples = rng.exponential(1.0 / rate, size)
+    if shift:
+        samples += shift
+    return samples
+
+
+def markov_block(rng, size, model):
+    return model.sample(rng, size)
+
+
+def ou_block(rng, size, process):
+    return process.sample(rng, size)
+
+
+def per_sample_us(function, n_samples):
+    return min(timeit.repeat(function, number=1, repeat=3)) / n_samples * 1e6
+
+
+def bench(name, per_tick, per_tick_kwargs, draw, params):
+    # scipy's per-call overhead makes the per-tick GEV run slow, use fewer samples
+    n_per_tick = N_SAMPLES // 20 if per_tick is gev_per_tick else N_SAMPLES
+
+    def run_per_tick():
+        for _ in range(n_per_tick):
+            per_tick(**per_tick_kwargs)
+
+    def run_block():
+        block = SampleBlock(rng=np.random.default_rng(0))
+        next_sample = block.next
+        for _ in range(N_SAMPLES):
+            next_sample(draw, params, MIN, MAX)
+
+    before = per_sample_us(run_per_tick, n_per_tick)
+    after = per_sample_us(run_block, N_SAMPLES)
+    print(f"{name:<14}{before:>14.3f}{after:>14.3f}{before / after:>10.1f}x")
+
+
+def bench_batch(count):
+    params = ("normal", 0.4, 0.1, 0.0)
+
+    def run_per_node():
+        blocks = [SampleBlock(rng=np.random.default_rng(i)) for i in range(count)]
+        statistics = [StreamingStatistics() for _ in range(count)]
+        for _ in range(N_TICKS):
+            for block, node_statistics in zip(blocks, statistics):
+                node_statistics.update(block.next(sample_family, params, MIN, MAX))
+
+    def run_batch():
+        block = BatchSampleBlock(count, rng=np.random.default_rng(0))
+        statistics = BatchStatistics(count, history_size=100)
+        for _ in range(N_TICKS):
+            statistics.update(block.next(sample_family, params, MIN, MAX))
+
+    before = per_sample_us(run_per_node, N_TICKS)
+    after = per_sample_us(run_batch, N_TICKS)
+    print(f"{count:<14}{before:>14.1f}{after:>14.1f}{before / after:>10.1f}x")
+
+
+def main():
+    print(f"{'sampler':<14}{'per tick':>14}{'block':>14}{'speedup':>11}   (us/sample)")
+    bench(
+        "normal", normal_per_tick,
+        dict(average=0.4, std_dev=0.1, min=MIN, max=MAX, verbose=False),
+        normal_block, (0.4, 0.1)
+    )
+    bench(
+        "normal trunc", normal_per_tick,
+        dict(average=0.4, std_dev=0.1, min=MIN, max=MAX, verbose=False),
+        normal_truncated_block, (0.4, 0.1, 0.3, MAX)
+    )
+    if stats is not None:
+        bench(
+            "gev", gev_per_tick,
+            dict(location=0.4, scale=0.1, shape=-0.2, min=MIN, max=MAX, verbose=False),
+            gev_block, (0.4, 0.1, -0.2)
+        )
+        bench(
+            "gev trunc", gev_per_tick,
+            dict(location=0.4, scale=0.1, shape=-0.2, min=MIN, max=MAX, verbose=False),
+            gev_truncated_block, (0.4, 0.1, -0.2, 0.3, 0.8)
+        )
+    else:
+        print(f"{'gev':<14}{'skipped (scipy not installed)':>39}")
+    bench(
+        "exponential", exponential_per_tick,
+        dict(rate=25.0, shift=0.01),
+        exponential_block, (25.0, 0.01)
+    )
+    bench(
+        "markov", markov_per_tick,
+        dict(matrix=GILBERT_ELLIOTT[0], regime=[0], min=MIN, max=MAX),
+        markov_block, (MarkovModulatedDistribution(*GILBERT_ELLIOTT),)
+    )
+    process = AR1Process.from_correlation_time(*ORNSTEIN_UHLENBECK, value=ORNSTEIN_UHLENBECK[0])
+    bench(
+        "ou / ar(1)", ou_per_tick,
+        dict(process=process, noise=process.std * (1 - process.phi ** 2) ** 0.5, min=MIN, max=MAX),
+        ou_block, (AR1Process.from_correlation_time(*ORNSTEIN_UHLENBECK),)
+    )
+
+    print()
+    print(f"{'environments':<14}{'N nodes':>14}{'batch node':>14}{'speedup':>11}   (us/tick, with statistics)")
+    for count in (64, 512):
+        bench_batch(count)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,332 @@
+"""
+Validation of the NumPy samplers in latency_core against scipy.stats.
+
+Runs without Isaac Sim, needs scipy:
+    python benchmarks/validate_samplers.py
+
+Draws a large sample from each sampler and runs a Kolmogorov-Smirnov test
+against the scipy distribution with the same parameters (truncated with
+scipy.stats.truncnorm, or by renormalizing the GEV CDF, for the truncated
+samplers), or, for the
+empirical sampler, a two-sample test against the trace it was built from.
+The empirical constant-trace rows check that the KDE-smoothed histogram
+of a constant trace, whose kernel is wider than the histogram, lines up
+with its bins and samples around the constant.
+The Markov-modulated rows test the regime transitions counted in a long
+run against the transition matrix (chi-square per row, Bonferroni
+corrected; the statistic column is the largest error of the estimated
+matrix), and the samples drawn in each regime against its distribution.
+The "range changes" rows repeat the transition test through a SampleBlock,
+as the node draws, switching the clamp range every MARKOV_RANGE_PERIOD
+samples: the discarded blocks must not skip steps of the chain.
+The Ornstein-Uhlenbeck rows test the lag-1 autocorrelation of a long run,
+drawn in blocks, against exp(-time_step / correlation_time) (z-test; the
+statistic column is the error), and samples thinned until they are nearly
+independent against the stationary normal distribution.
+The quantile-table rows report the KS distance of the tabulated sampler
+from the exact scipy distribution it was built from.
+The extension itself does not need scipy; it is only imported here.
+"""
+import os
+import sys
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(
+    os.path.dirname(os.path.abspath(__file__)),
+    os.pardir, "worvai", "nodes", "latency_nodes"
+))
+
+from latency_core import (  # noqa: E402
+    AR1Process,
+    EmpiricalDistribution,
+    MarkovModulatedDistribution,
+    SampleBlock,
+    TailMode,
+    gev_sample,
+    scipy_quantile_table,
+    truncated_gev_sample,
+    truncated_normal_sample
+)
+
+
+N_SAMPLES = 200_000
+# A fit is rejected below this KS p-value
+ALPHA = 1e-3
+
+# (location, scale, c) with scipy's c = -ξ, including the Gumbel limit
+GEV_PARAMS = (
+    (0.4, 0.1, -0.5),
+    (0.4, 0.1, -0.2),
+    (0.4, 0.1, -1e-9),
+    (0.4, 0.1, 0.0),
+    (0.4, 0.1, 1e-9),
+    (0.4, 0.1, 0.2),
+    (0.4, 0.1, 0.5),
+    (0.05, 0.02, 1.0),
+)
+
+# (mean, std, low, high) of the truncated normal sampler, including ranges far in the tails
+TRUNCATED_NORMAL_PARAMS = (
+    (0.02, 0.05, 0.0, np.inf),
+    (0.4, 0.1, 0.3, 0.45),
+    (0.0, 1.0, 3.0, 5.0),
+    (0.0, 1.0, 8.0, np.inf),
+    (0.0, 1.0, -np.inf, -6.0),
+)
+
+# (location, scale, c, low, high) of the truncated GEV sampler
+TRUNCATED_GEV_PARAMS = (
+    (0.4, 0.1, -0.2, 0.0, 0.6),
+    (0.4, 0.1, 0.0, 0.3, 0.5),
+    (0.4, 0.1, 0.2, 0.45, np.inf),
+    (0.05, 0.02, -0.5, 0.0, 0.1),
+)
+
+# (name, shapes, loc, scale) of scipy.stats distributions for the quantile-table sampler
+QUANTILE_TABLE_PARAMS = (
+    ("lognorm", (0.5,), 0.0, 0.04),
+    ("weibull_min", (1.5,), 0.0, 0.05),
+    ("pareto", (2.5,), -0.01, 0.01),
+    ("gamma", (2.0,), 0.0, 0.02),
+)
+
+# (bins, KDE bandwidth) of the empirical sampler, built from a lognormal trace
+EMPIRICAL_PARAMS = (
+    (0, 0.0),
+    (1024, 0.0),
+    (1024, 0.002),
+)
+# Bins of the empirical sampler built from a constant trace with a KDE
+# bandwidth, whose kernel is then wider than the histogram
+EMPIRICAL_CONSTANT_BINS = (3, 7, 8, 9, 10, 1024)
+EMPIRICAL_CONSTANT_BANDWIDTH = 0.1
+
+# (transition matrix, families, locations, scales, shapes) of the Markov-modulated sampler
+MARKOV_PARAMS = (
+    ([[0.99, 0.01], [0.1, 0.9]], ("normal", "lognormal"), (0.02, 0.02), (0.005, 0.1), (0.0, 0.8)),
+    ([[0.2, 0.8], [0.7, 0.3]], ("exponential", "gev"), (0.01, 0.1), (0.02, 0.02), (0.0, -0.2)),
+    (
+        [[0.5, 0.3, 0.2], [0.1, 0.8, 0.1], [0.0, 0.05, 0.95]],
+        ("normal", "exponential", "gev"), (0.02, 0.01, 0.1), (0.005, 0.05, 0.02), (0.0, 0.0, 0.2)
+    ),
+)
+# Samples between two changes of the clamp range, each discarding the block
+MARKOV_RANGE_PERIOD = 100
+# Clamp ranges alternated by the range change rows
+MARKOV_RANGES = ((0.0, 1.0), (0.0, 2.0))
+
+# (mean, std, correlation time, time step) of the Ornstein-Uhlenbeck sampler
+OU_PARAMS = (
+    (0.05, 0.01, 0.5, 1 / 60),
+    (0.02, 0.005, 0.05, 1 / 60),
+    (0.05, 0.01, 2.0, 1 / 120),
+    (0.1, 0.02, 0.0, 1 / 60),
+)
+# Samples are thinned until their correlation is below this for the KS test
+OU_THINNED_CORRELATION = 0.01
+
+
+def regime_distribution(stats, family, location, scale, shape):
+    """scipy.stats equivalent of a DistributionFamily"""
+    if family == "normal":
+        return stats.norm(loc=location, scale=scale)
+    if family == "exponential":
+        return stats.expon(loc=location, scale=scale)
+    if family == "lognormal":
+        return stats.lognorm(shape, loc=location, scale=scale)
+    return stats.genextreme(shape, loc=location, scale=scale)
+
+
+def transition_test(stats, regimes, transition_matrix):
+    """(largest error, Bonferroni corrected chi-square p-value) of the
+    transitions counted in a regime sequence against the matrix"""
+    n = len(transition_matrix)
+    counts = np.zeros((n, n))
+    np.add.at(counts, (regimes[:-1], regimes[1:]), 1)
+    expected = counts.sum(axis=1, keepdims=True) * transition_matrix
+    pvalue = 1.0
+    for i in range(n):
+        possible = expected[i] > 0
+        impossible = counts[i][~possible].sum()
+        if impossible:
+            pvalue = 0.0
+        elif possible.sum() > 1:
+            pvalue = min(pvalue, n * stats.chisquare(counts[i][possible], expected[i][possible]).pvalue)
+    error = np.abs(counts / counts.sum(axis=1, keepdims=True) - transition_matrix).max()
+    return error, min(pvalue, 1.0)
+
+
+def markov_regimes_with_range_changes(model, rng):
+    """Regimes of N_SAMPLES samples drawn as the node does, through a
+    SampleBlock whose clamp range changes every MARKOV_RANGE_PERIOD samples"""
+    def draw_block(rng, size, model):
+        return model.sample(rng, size)
+
+    block = SampleBlock(rng=rng)
+    regimes = np.empty(N_SAMPLES, dtype=np.intp)
+    for k in range(N_SAMPLES):
+        min_value, max_value = MARKOV_RANGES[k // MARKOV_RANGE_PERIOD % len(MARKOV_RANGES)]
+        block.next(draw_block, (model,), min_value, max_value)
+        model.continue_from(block.last_index)
+        regimes[k] = model.regime
+    return regimes
+
+
+def main() -> int:
+    try:
+        import scipy.stats as stats
+    except ImportError:
+        print("scipy is required for validation: pip install scipy")
+        return 1
+
+    rng = np.random.default_rng(0)
+    failures = 0
+
+    print(f"{'distribution':<40}{'KS statistic':>14}{'p-value':>12}")
+    for location, scale, c in GEV_PARAMS:
+        samples = gev_sample(rng, N_SAMPLES, location, scale, c)
+        result = stats.kstest(samples, stats.genextreme(c, loc=location, scale=scale).cdf)
+        ok = result.pvalue >= ALPHA and np.isfinite(samples).all()
+        failures += not ok
+
+        name = f"gev(loc={location}, scale={scale}, c={c})"
+        print(f"{name:<40}{result.statistic:>14.5f}{result.pvalue:>12.4f}"
+              f"{'' if ok else '   FAILED'}")
+
+    for mean, std, low, high in TRUNCATED_NORMAL_PARAMS:
+        samples = truncated_normal_sample(rng, N_SAMPLES, mean, std, low, high)
+        exact = stats.truncnorm((low - mean) / std, (high - mean) / std, loc=mean, scale=std)
+        result = stats.kstest(samples, exact.cdf)
+        ok = result.pvalue >= ALPHA and low <= samples.min() and samples.max() <= high
+        failures += not ok
+
+        name = f"truncnorm({mean}, {std}, [{low}, {high}])"
+        print(f"{name:<40}{result.statistic:>14.5f}{result.pvalue:>12.4f}"
+              f"{'' if ok else '   FAILED'}")
+
+    for location, scale, c, low, high in TRUNCATED_GEV_PARAMS:
+        samples = truncated_gev_sample(rng, N_SAMPLES, location, scale, c, low, high)
+        full = stats.genextreme(c, loc=location, scale=scale)
+        cdf_low, cdf_high = full.cdf(low), full.cdf(high)
+        result = stats.kstest(samples, lambda x: (full.cdf(x) - cdf_low) / (cdf_high - cdf_low))
+        ok = result.pvalue >= ALPHA and low <= samples.min() and samples.max() <= high
+        failures += not ok
+
+        name = f"truncgev(c={c}, [{low}, {high}])"
+        print(f"{name:<40}{result.statistic:>14.5f}{result.pvalue:>12.4f}"
+              f"{'' if ok else '   FAILED'}")
+
+    for name, shapes, loc, scale in QUANTILE_TABLE_PARAMS:
+        exact = getattr(stats, name)(*shapes, loc=loc, scale=scale)
+        for tail in TailMode.ALL:
+            table = scipy_quantile_table(name, shapes, loc, scale, tail=tail)
+            samples = table.sample(rng, N_SAMPLES)
+            result = stats.kstest(samples, exact.cdf)
+            ok = result.pvalue >= ALPHA and np.isfinite(samples).all()
+            failures += not ok
+
+            label = f"table {name}{shapes} ({tail})"
+            print(f"{label:<40}{result.statistic:>14.5f}{result.pvalue:>12.4f}"
+                  f"{'' if ok else '   FAILED'}")
+
+    trace = rng.lognormal(np.log(0.04), 0.5, N_SAMPLES)
+    for bins, bandwidth in EMPIRICAL_PARAMS:
+        samples = EmpiricalDistribution(trace, bins, bandwidth).sample(rng, N_SAMPLES)
+        result = stats.ks_2samp(samples, trace)
+        ok = result.pvalue >= ALPHA
+        failures += not ok
+
+        name = f"empirical(bins={bins}, bandwidth={bandwidth})"
+        print(f"{name:<40}{result.statistic:>14.5f}{result.pvalue:>12.4f}"
+              f"{'' if ok else '   FAILED'}")
+
+    # Regression: the smoothed weights must line up with the bin edges.
+    # The statistic column is the error of the mean, allowed up to half a
+    # bin (the constant falls on a bin edge for even bins) plus 5 standard
+    # errors
+    constant = 0.05
+    for bins in EMPIRICAL_CONSTANT_BINS:
+        distribution = EmpiricalDistribution(np.full(1000, constant), bins, EMPIRICAL_CONSTANT_BANDWIDTH)
+        samples = distribution.sample(rng, N_SAMPLES)
+        edges = distribution.edges
+        error = abs(samples.mean() - constant)
+        tolerance = (edges[1] - edges[0]) / 2 + 5 * samples.std() / np.sqrt(N_SAMPLES)
+        ok = (
+            len(distribution.weights) == bins == len(edges) - 1
+            and edges[0] <= samples.min() <= samples.max() <= edges[-1]
+            and error <= tolerance
+        )
+        failures += not ok
+
+        name = f"empirical constant trace (bins={bins})"
+        print(f"{name:<40}{error:>14.5f}{'':>12}"
+              f"{'' if ok else '   FAILED'}")
+
+    for matrix, families, locations, scales, shapes in MARKOV_PARAMS:
+        model = MarkovModulatedDistribution(matrix, families, locations, scales, shapes)
+        # Several blocks, so the chain is also tested across block boundaries
+        blocks = [(model.sample(rng, 4096), model.regime_block) for _ in range(N_SAMPLES // 4096)]
+        samples = np.concatenate([block for block, _ in blocks])
+        regimes = np.concatenate([regime_block for _, regime_block in blocks])
+
+        n = model.n_regimes
+        error, pvalue = transition_test(stats, regimes, model.transition_matrix)
+        ok = pvalue >= ALPHA
+        failures += not ok
+
+        name = f"markov transitions ({n} regimes)"
+        print(f"{name:<40}{error:>14.5f}{pvalue:>12.4f}"
+              f"{'' if ok else '   FAILED'}")
+
+        for i, regime in enumerate(model.regimes):
+            result = stats.kstest(samples[regimes == i], regime_distribution(stats, *regime).cdf)
+            ok = result.pvalue >= ALPHA
+            failures += not ok
+
+            name = f"  regime {i}: {regime[0]}"
+            print(f"{name:<40}{result.statistic:>14.5f}{result.pvalue:>12.4f}"
+                  f"{'' if ok else '   FAILED'}")
+
+        model = MarkovModulatedDistribution(matrix, families, locations, scales, shapes)
+        regimes = markov_regimes_with_range_changes(model, rng)
+        error, pvalue = transition_test(stats, regimes, model.transition_matrix)
+        ok = pvalue >= ALPHA
+        failures += not ok
+
+        name = "  range changes"
+        print(f"{name:<40}{error:>14.5f}{pvalue:>12.4f}"
+              f"{'' if ok else '   FAILED'}")
+
+    for mean, std, correlation_time, time_step in OU_PARAMS:
+        process = AR1Process.from_correlation_time(mean, std, correlation_time, time_step)
+        # Several blocks, so the recursion is also tested across block boundaries
+        samples = np.concatenate([process.sample(rng, 4096) for _ in range(N_SAMPLES // 4096)])
+        phi = process.phi
+
+        deviations = samples - samples.mean()
+        correlation = np.dot(deviations[:-1], deviations[1:]) / np.dot(deviations, deviations)
+        error = correlation - phi
+        # Standard error of the lag-1 autocorrelation of an AR(1) process
+        pvalue = 2 * stats.norm.sf(abs(error) / np.sqrt((1 - phi ** 2) / len(samples)))
+        ok = pvalue >= ALPHA
+        failures += not ok
+
+        name = f"ou autocorrelation (phi={phi:.4f})"
+        print(f"{name:<40}{abs(error):>14.5f}{pvalue:>12.4f}"
+              f"{'' if ok else '   FAILED'}")
+
+        lag = 1 if phi == 0 else max(1, int(np.ceil(np.log(OU_THINNED_CORRELATION) / np.log(phi))))
+        result = stats.kstest(samples[::lag], stats.norm(loc=mean, scale=std).cdf)
+        ok = result.pvalue >= ALPHA
+        failures += not ok
+
+        name = f"  ou stationary N({mean}, {std}) 1/{lag}"
+        print(f"{name:<40}{result.statistic:>14.5f}{result.pvalue:>12.4f}"
+              f"{'' if ok else '   FAILED'}")
+
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -7,6 +7,8 @@ import random
 import numpy as np
 import torch
 
+# Latency samplers do not use the global random state:
+# each node draws from its own stream, seeded by its 'seed' input and prim path
 SEED = 777
 os.environ["PYTHONHASHSEED"] = str(SEED)
 random.seed(SEED)
@@ -85,7 +87,8 @@ print("")
 spawner.create_latency_graph(
     prim_path="/World/controller_graph",
     latency_average=0,
-    latency_std=0
+    latency_std=0,
+    seed=SEED
 )
 
 spawner.spawn_background_objects(world, num=100)
@@ -111,7 +114,8 @@ spawner.create_camera_data_capture_latency_graph(
     latency_std=0.2,
     camera_prim="/World/spot/body/front_camera",
     topic_name="rgb_latency",
-    data_type="rgb"
+    data_type="rgb",
+    seed=SEED
 )
 
 
@@ -58,7 +58,7 @@ def create_nolatency_graph(prim_path):
         },
     )
 
-def create_latency_graph(prim_path, latency_average, latency_std):
+def create_latency_graph(prim_path, latency_average, latency_std, seed=-1):
     keys = og.Controller.Keys
 
     graph, nodes, _, _ = og.Controller.edit(
@@ -80,6 +80,7 @@ def create_latency_graph(prim_path, latency_average, latency_std):
             keys.SET_VALUES: [
                 ("NormDistLatency.inputs:_average", latency_average),
                 ("NormDistLatency.inputs:_standardDeviation", latency_std),
+                ("NormDistLatency.inputs:seed", seed),
             ],
             keys.CONNECT: [
                 ("OnPlaybackTick.outputs:tick", "ROS1SubscribeTwist.inputs:execIn"),
@@ -102,7 +103,7 @@ def create_latency_graph(prim_path, latency_average, latency_std):
         },
     )
 
-def create_camera_latency_graph(prim_path, latency_average, latency_std):
+def create_camera_latency_graph(prim_path, latency_average, latency_std, seed=-1):
     keys = og.Controller.Keys
 
     graph, nodes, _, _ = og.Controller.edit(
@@ -126,6 +127,7 @@ def create_camera_latency_graph(prim_path, latency_average, latency_std):
 
                 ("NormDistLatency.inputs:_average", latency_average),
                 ("NormDistLatency.inputs:_standardDeviation", latency_std),
+                ("NormDistLatency.inputs:seed", seed),
 
                 ("ROS1CameraPublisher.inputs:topicName", "rgb_front_latency"),
             ],
@@ -183,7 +185,8 @@ def create_camera_data_capture_latency_graph(
     latency_std,
     camera_prim="/World/spot/body/front_camera",
     topic_name="rgb_latency",
-    data_type="rgb"
+    data_type="rgb",
+    seed=-1
 ):
     keys = og.Controller.Keys
 
@@ -214,6 +217,7 @@ def create_camera_data_capture_latency_graph(
                 # Latency settings
                 ("NormDistLatency.inputs:_average", latency_average),
                 ("NormDistLatency.inputs:_standardDeviation", latency_std),
+                ("NormDistLatency.inputs:seed", seed),
 
                 # ROS publisher settings
                 ("ROS1PublishRenderedImage.inputs:topicName", topic_name),
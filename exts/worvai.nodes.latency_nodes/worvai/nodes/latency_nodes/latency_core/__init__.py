@@ -0,0 +1,107 @@
+"""
+Pure-Python core of the latency nodes.
+
+Nothing in this package imports carb or omni, so the queueing, frame
+buffering, sampling and statistics logic can be used and benchmarked without Isaac Sim.
+"""
+from .annotator_cache import AnnotatorCache
+from .autoregressive import AR1Process, ar1_filter
+from .coalescing import CaptureAction, emission_time, plan_capture
+from .depth_encoding import DEPTH_DTYPES, DEPTH_IMAGE_ENCODINGS, DepthEncoder, DepthEncoding
+from .distributions import (
+    DistributionFamily,
+    exponential_sample,
+    gev_sample,
+    normal_ppf,
+    sample_family,
+    truncated_gev_sample,
+    truncated_normal_sample
+)
+from .empirical import (
+    AliasTable,
+    EmpiricalDistribution,
+    load_empirical_distribution,
+    load_trace
+)
+from .event_counter import EventCounter
+from .frame_pool import FramePool, pack_frame
+from .latency_queue import (
+    EvictionPolicy,
+    LatencyQueue,
+    LatencyQueuePolicy,
+    estimate_nbytes
+)
+from .markov import MarkovModulatedDistribution
+from .multi_channel_queue import MultiChannelLatencyQueue
+from .normal_encoding import (
+    NORMAL_DTYPES,
+    NORMAL_IMAGE_ENCODINGS,
+    NormalEncoder,
+    NormalEncoding,
+    octahedral_decode,
+    octahedral_encode
+)
+from .quantile_table import QuantileTable, TailMode, scipy_quantile_table
+from .sample_block import DEFAULT_BLOCK_SIZE, BatchSampleBlock, SampleBlock
+from .seeding import node_rng, node_seed_sequence
+from .segmentation_encoding import SEGMENTATION_DTYPES, SegmentationEncoder, SegmentationEncoding
+from .statistics import BatchStatistics, P2Quantile, RingBuffer, StreamingStatistics
+from .throttle import UpdateThrottle
+from .timing_wheel import TimingWheel, shared_timing_wheel
+
+__all__ = [
+    "AR1Process",
+    "AliasTable",
+    "AnnotatorCache",
+    "BatchSampleBlock",
+    "BatchStatistics",
+    "CaptureAction",
+    "DEFAULT_BLOCK_SIZE",
+    "DEPTH_DTYPES",
+    "DEPTH_IMAGE_ENCODINGS",
+    "DepthEncoder",
+    "DepthEncoding",
+    "DistributionFamily",
+    "EmpiricalDistribution",
+    "EventCounter",
+    "EvictionPolicy",
+    "FramePool",
+    "LatencyQueue",
+    "LatencyQueuePolicy",
+    "MarkovModulatedDistribution",
+    "MultiChannelLatencyQueue",
+    "NORMAL_DTYPES",
+    "NORMAL_IMAGE_ENCODINGS",
+    "NormalEncoder",
+    "NormalEncoding",
+    "P2Quantile",
+    "QuantileTable",
+    "RingBuffer",
+    "SEGMENTATION_DTYPES",
+    "SampleBlock",
+    "SegmentationEncoder",
+    "SegmentationEncoding",
+    "StreamingStatistics",
+    "TailMode",
+    "TimingWheel",
+    "UpdateThrottle",
+    "ar1_filter",
+    "emission_time",
+    "estimate_nbytes",
+    "exponential_sample",
+    "gev_sample",
+    "load_empirical_distribution",
+    "load_trace",
+    "node_rng",
+    "node_seed_sequence",
+    "normal_ppf",
+    "octahedral_decode",
+    "octahedral_encode",
+    "pack_frame",
+    "plan_capture",
+    "sample_family",
+    "scipy_quantile_table",
+    "shared_timing_wheel",
+    "truncated_gev_sample",
+    "truncated_normal_sample"
+]
@@ -0,0 +1,112 @@
+"""
+Reference-counted cache of annotators shared by the camera nodes.
+"""
+from typing import Any, Callable, Dict, Hashable, Tuple
+
+# (render product path, annotator name)
+AnnotatorKey = Tuple[str, str]
+
+
+class _Entry:
+    __slots__ = ("annotator", "users", "frame", "data")
+
+    def __init__(self, annotator):
+        self.annotator = annotator
+        self.users = 0
+        # Frame the cached data was read on
+        self.frame = None
+        self.data = None
+
+
+class AnnotatorCache:
+    """Annotators shared by every node reading the same render product
+
+    Nodes that each attach their own annotator to a render product read the
+    same frame back once per node. With the cache, the first acquire() of a
+    (render product, annotator name) pair creates and attaches the
+    annotator, later ones only count a user, and the annotator is detached
+    when the last user calls release().
+
+    get_data() reads the annotator at most once per frame, as told by
+    frame_clock (e.g. the application's update number); every user gets the
+    same result within a frame, so it must be treated as read-only.
+    """
+
+    def __init__(self, create: Callable[[str, str], Any], frame_clock: Callable[[], Hashable]):
+        """Create an empty cache
+
+        Args:
+            create: create(render_product_path, annotator_name) returns an
+                annotator attached to the render product, with get_data()
+                and detach()
+            frame_clock: returns the current frame, cached data is reused
+                while it does not change
+        """
+        self.create = create
+        self.frame_clock = frame_clock
+        self._entries: Dict[AnnotatorKey, _Entry] = {}
+
+    def __len__(self) -> int:
+        """Number of attached annotators"""
+        return len(self._entries)
+
+    def __contains__(self, key: AnnotatorKey) -> bool:
+        return key in self._entries
+
+    def users(self, render_product_path: str, annotator_name: str) -> int:
+        """Number of users of an annotator, 0 if it is not attached"""
+        entry = self._entries.get((render_product_path, annotator_name))
+        return entry.users if entry is not None else 0
+
+    def acquire(self, render_product_path: str, annotator_name: str) -> AnnotatorKey:
+        """Count a user of the annotator, creating and attaching it for the first one
+
+        Returns:
+            AnnotatorKey: key to pass to get_data() and release()
+        """
+        key = (render_product_path, annotator_name)
+        entry = self._entries.get(key)
+        if entry is None:
+            # Nothing is registered if create() fails
+            entry = _Entry(self.create(render_product_path, annotator_name))
+            self._entries[key] = entry
+        entry.users += 1
+        return key
+
+    def release(self, render_product_path: str, annotator_name: str):
+        """Drop a user of the annotator, detaching it when it was the last one
+
+        Releasing an annotator that is not attached is ignored.
+        """
+        key = (render_product_path, annotator_name)
+        entry = self._entries.get(key)
+        if entry is None:
+            return
+
+        entry.users -= 1
+        if entry.users > 0:
+            return
+
+        del self._entries[key]
+        entry.data = None
+        entry.annotator.detach()
+
+    def get_data(self, render_product_path: str, annotator_name: str):
+        """Data of the annotator for the current frame, read once per frame
+
+        Raises:
+            KeyError: if the annotator has not been acquired
+        """
+        entry = self._entries[(render_product_path, annotator_name)]
+        frame = self.frame_clock()
+        if entry.frame != frame or entry.data is None:
+            entry.data = entry.annotator.get_data()
+            entry.frame = frame
+        return entry.data
+
+    def clear(self):
+        """Detach every annotator, whatever its number of users"""
+        entries = list(self._entries.values())
+        self._entries.clear()
+        for entry in entries:
+            entry.annotator.detach()
@@ -0,0 +1,116 @@
+"""
+Time-correlated latencies: AR(1) / Ornstein-Uhlenbeck processes generated in blocks.
+"""
+import math
+from typing import Optional
+
+import numpy as np
+
+# Largest weight phi**-(k + 1) within one chunk of ar1_filter, well below overflow
+_MAX_CHUNK_GROWTH = 1e150
+
+
+def ar1_filter(innovations: np.ndarray, phi: float, x0: float = 0.0) -> np.ndarray:
+    """Run the recursion x[t] = phi * x[t - 1] + innovations[t] from x[-1] = x0
+
+    Vectorized with the cumulative form
+
+        x[t] = phi**(t + 1) * (x0 + sum_{k <= t} phi**-(k + 1) * innovations[k])
+
+    i.e. one np.cumsum instead of a Python step per sample. The weights grow
+    geometrically, so the block is processed in chunks short enough for
+    them to stay finite; rounding errors stay relative to the size of x.
+    This is the same filter as scipy.signal.lfilter([1], [1, -phi], ...).
+
+    Args:
+        innovations: noise added at every step
+        phi: autoregressive coefficient, 0 <= phi < 1
+        x0: value before the first step
+    """
+    if not 0.0 <= phi < 1.0:
+        raise ValueError(f"phi must be in [0, 1), got {phi}")
+
+    innovations = np.asarray(innovations, dtype=np.float64)
+    if phi == 0.0:
+        return innovations.copy()
+
+    n = innovations.size
+    chunk = max(1, min(n, int(math.log(_MAX_CHUNK_GROWTH) / -math.log(phi))))
+    powers = phi ** np.arange(1, chunk + 1)
+
+    out = np.empty(n)
+    value = x0
+    for start in range(0, n, chunk):
+        stop = min(start + chunk, n)
+        growth = powers[:stop - start]
+        path = np.cumsum(innovations[start:stop] / growth)
+        path += value
+        path *= growth
+        out[start:stop] = path
+        value = path[-1]
+    return out
+
+
+class AR1Process:
+    """Stationary Gaussian AR(1) process, the exact discretization of an OU process
+
+        x[t] = mean + phi * (x[t - 1] - mean) + std * sqrt(1 - phi**2) * N(0, 1)
+
+    Every sample is N(mean, std) and the correlation between samples k
+    steps apart is phi**k. Blocks are generated with ar1_filter, and the
+    process continues from its last value across blocks.
+    """
+
+    def __init__(self, mean: float, std: float, phi: float, value: Optional[float] = None):
+        """Create the process
+
+        Args:
+            mean: stationary mean
+            std: stationary standard deviation
+            phi: lag-1 correlation, 0 <= phi < 1
+            value: value the process continues from; drawn from the
+                stationary distribution on the first block if None
+        """
+        if std < 0:
+            raise ValueError(f"std must be non-negative, got {std}")
+        if not 0.0 <= phi < 1.0:
+            raise ValueError(f"phi must be in [0, 1), got {phi}")
+        self.mean = float(mean)
+        self.std = float(std)
+        self.phi = float(phi)
+        self.value = value
+
+    @classmethod
+    def from_correlation_time(
+        cls,
+        mean: float,
+        std: float,
+        correlation_time: float,
+        time_step: float,
+        value: Optional[float] = None
+    ) -> "AR1Process":
+        """Ornstein-Uhlenbeck process with the given correlation time, sampled every time_step
+
+        phi = exp(-time_step / correlation_time); a correlation time of 0
+        gives independent samples.
+        """
+        if correlation_time < 0:
+            raise ValueError(f"correlation_time must be non-negative, got {correlation_time}")
+        if not time_step > 0:
+            raise ValueError(f"time_step must be positive, got {time_step}")
+        phi = math.exp(-time_step / correlation_time) if correlation_time > 0 else 0.0
+        return cls(mean, std, phi, value)
+
+    def sample(self, rng: np.random.Generator, size: int) -> np.ndarray:
+        """Draw the next 'size' values of the process"""
+        if self.value is None:
+            deviation = self.std * rng.standard_normal()
+        else:
+            deviation = self.value - self.mean
+
+        innovations = rng.normal(0.0, self.std * math.sqrt(1.0 - self.phi ** 2), size)
+        samples = ar1_filter(innovations, self.phi, deviation)
+        samples += self.mean
+        if size:
+            self.value = float(samples[-1])
+        return samples
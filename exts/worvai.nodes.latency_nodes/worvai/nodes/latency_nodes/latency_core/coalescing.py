@@ -0,0 +1,64 @@
+"""
+Capture-on-demand for latency controllers that emit one element per tick.
+"""
+import math
+
+from .latency_queue import LatencyQueue
+
+# Relative tolerance on tick times; ambiguous cases are not coalesced
+_TICK_TOLERANCE = 1e-6
+
+
+class CaptureAction:
+    """What to do with the data of the current tick, see plan_capture"""
+
+    # The queue would drop it: do not capture at all.
+    SKIP = "skip"
+    # It supersedes the last queued element: capture into that element.
+    REPLACE = "replace"
+    # Capture and push it as a new element.
+    PUSH = "push"
+
+    ALL = (SKIP, REPLACE, PUSH)
+
+
+def emission_time(release_time: float, current_time: float, tick_period: float) -> float:
+    """First tick at or after release_time, on the grid current_time + k * tick_period
+
+    Times within a small tolerance after a tick are taken as that tick, so
+    an element is never assumed to be emitted later than it can be.
+    """
+    if release_time <= current_time:
+        return current_time
+    ticks = math.ceil((release_time - current_time) / tick_period - _TICK_TOLERANCE)
+    return current_time + ticks * tick_period
+
+
+def plan_capture(queue: LatencyQueue, current_time: float, latency: float, tick_period: float) -> str:
+    """Decide whether the data of this tick has to be captured, for a node emitting the newest ready element
+
+    A node that pops every ready element on a tick but emits only the
+    newest one never emits an element followed, before that tick, by a
+    newer one. Knowing the tick period, this is predicted at capture time:
+
+    - SKIP: the queue's out-of-order policy would drop the data (counted
+      as dropped here), so capturing it is wasted.
+    - REPLACE: the data would be released no later than the tick emitting
+      the last queued element, which therefore would never be emitted;
+      the data replaces it (see LatencyQueue.replace_last).
+    - PUSH: anything else, including an unknown (non-positive) tick period.
+
+    The prediction is exact for a fixed tick period; with a jittery one,
+    an element may be replaced that would have been emitted on an early tick.
+    """
+    if queue.skip_if_dropped(current_time, latency):
+        return CaptureAction.SKIP
+    if not queue or not tick_period > 0:
+        return CaptureAction.PUSH
+
+    release_time = current_time + latency
+    last_time = queue.peek_last_time()
+    superseded_at = emission_time(last_time, current_time, tick_period)
+    if last_time < release_time <= superseded_at - _TICK_TOLERANCE * tick_period:
+        return CaptureAction.REPLACE
+    return CaptureAction.PUSH
@@ -0,0 +1,152 @@
+"""
+Fixed-range depth encodings, written in place into preallocated frames.
+"""
+from typing import Optional
+
+import numpy as np
+
+
+class DepthEncoding:
+    """Encodings of float32 depth (DistanceToImagePlane, in meters)"""
+
+    # 8-bit, [depth_min, depth_max] mapped linearly to 0..255
+    MONO8 = "mono8"
+    # 16-bit unsigned millimetres (ROS 16UC1), saturating at 65.535 m
+    MILLIMETERS_16 = "16UC1"
+    # Half float meters, about 3 significant digits (depths under 61 um are 0)
+    FLOAT16 = "float16"
+    # The raw float32 meters (ROS 32FC1)
+    FLOAT32 = "32FC1"
+
+    ALL = (MONO8, MILLIMETERS_16, FLOAT16, FLOAT32)
+
+
+DEPTH_DTYPES = {
+    DepthEncoding.MONO8: np.dtype(np.uint8),
+    DepthEncoding.MILLIMETERS_16: np.dtype(np.uint16),
+    DepthEncoding.FLOAT16: np.dtype(np.float16),
+    DepthEncoding.FLOAT32: np.dtype(np.float32),
+}
+
+# Image encoding of the encoded frame; ROS has no half float encoding
+DEPTH_IMAGE_ENCODINGS = {
+    DepthEncoding.MONO8: "mono8",
+    DepthEncoding.MILLIMETERS_16: "16UC1",
+    DepthEncoding.FLOAT16: "16FC1",
+    DepthEncoding.FLOAT32: "32FC1",
+}
+
+# Largest depth in millimetres a 16UC1 frame can hold
+_MAX_MILLIMETERS = np.iinfo(np.uint16).max
+# Largest finite float16
+_MAX_FLOAT16 = float(np.finfo(np.float16).max)
+# float32 bits >> 13 of the smallest normal float16 (2**-14), whose float16
+# bits are 0x0400: the exponent bias moves from 127 to 15
+_FLOAT16_REBIAS = (127 - 15) << 10
+
+
+class DepthEncoder:
+    """Encodes depth frames with a fixed range, without per-frame reductions
+
+    Normalizing every frame by its own min / max costs two full-array
+    reductions, loses precision, and is undefined on flat frames. The
+    encoder instead maps a fixed, configurable [depth_min, depth_max] range,
+    with a few in-place ufunc passes through one reused float32 scratch
+    buffer, into a frame of the encoding's dtype (e.g. a view of a pooled
+    uint8 slab). Depths outside the range (including inf, no hit) are
+    saturated to its bounds; FLOAT32 is copied unchanged.
+    """
+
+    def __init__(self, encoding: str = DepthEncoding.FLOAT32, depth_min: float = 0.0, depth_max: float = 10.0):
+        """Create an encoder, see configure()"""
+        self._scratch = None
+        self.configure(encoding, depth_min, depth_max)
+
+    def configure(self, encoding: str, depth_min: float, depth_max: float):
+        """Change the encoding and the depth range, in meters"""
+        if encoding not in DepthEncoding.ALL:
+            raise ValueError(
+                f"Unknown depth encoding '{encoding}', "
+                f"expected one of {DepthEncoding.ALL}"
+            )
+        if not 0.0 <= depth_min < depth_max:
+            raise ValueError(f"Depth range must satisfy 0 <= min < max, got [{depth_min}, {depth_max}]")
+        self.encoding = encoding
+        self.depth_min = float(depth_min)
+        self.depth_max = float(depth_max)
+
+    @property
+    def dtype(self) -> np.dtype:
+        """dtype of the encoded frame"""
+        return DEPTH_DTYPES[self.encoding]
+
+    @property
+    def image_encoding(self) -> str:
+        """Image encoding of the encoded frame (ROS name where there is one)"""
+        return DEPTH_IMAGE_ENCODINGS[self.encoding]
+
+    def frame_shape(self, depth: np.ndarray) -> tuple:
+        """Shape of the encoded frame of depth"""
+        return depth.shape
+
+    def nbytes(self, depth: np.ndarray) -> int:
+        """Size in bytes of the encoded frame of depth"""
+        return depth.size * self.dtype.itemsize
+
+    def _scratch_for(self, depth: np.ndarray) -> np.ndarray:
+        if self._scratch is None or self._scratch.shape != depth.shape:
+            self._scratch = np.empty(depth.shape, dtype=np.float32)
+        return self._scratch
+
+    def encode(self, depth: np.ndarray, out: Optional[np.ndarray] = None) -> np.ndarray:
+        """Encode a depth frame into out, an array of self.dtype with depth's shape
+
+        A new array is allocated if out is None.
+        """
+        if out is None:
+            out = np.empty(depth.shape, dtype=self.dtype)
+        elif out.dtype != self.dtype or out.shape != depth.shape:
+            raise ValueError(
+                f"Output must be {self.dtype} of shape {depth.shape}, got {out.dtype} of shape {out.shape}"
+            )
+
+        if self.encoding == DepthEncoding.FLOAT32:
+            np.copyto(out, depth, casting='same_kind')
+            return out
+
+        scratch = self._scratch_for(depth)
+        if self.encoding == DepthEncoding.FLOAT16:
+            self._encode_float16(depth, scratch, out)
+            return out
+
+        if self.encoding == DepthEncoding.MILLIMETERS_16:
+            low = self.depth_min * 1000.0
+            high = min(self.depth_max * 1000.0, _MAX_MILLIMETERS)
+            offset, scale = 0.0, 1000.0
+        else:
+            low, high = 0.0, 255.0
+            offset, scale = self.depth_min, 255.0 / (self.depth_max - self.depth_min)
+
+        # (depth - offset) * scale, rounded to the nearest integer and
+        # saturated to [low, high] by the clip into the integer frame
+        if offset:
+            np.subtract(depth, offset, out=scratch)
+            np.multiply(scratch, scale, out=scratch)
+        else:
+            np.multiply(depth, scale, out=scratch)
+        np.add(scratch, 0.5, out=scratch)
+        np.clip(scratch, low + 0.5, high + 0.5, out=out, casting='unsafe')
+        return out
+
+    def _encode_float16(self, depth: np.ndarray, scratch: np.ndarray, out: np.ndarray):
+        # NumPy's float32 -> float16 cast is several times slower than the
+        # other passes; for clipped, non-negative depth the float16 bits are
+        # the float32 bits rounded to 10 mantissa bits and rebiased, with
+        # the subnormal range flushed to 0
+        np.clip(depth, self.depth_min, min(self.depth_max, _MAX_FLOAT16), out=scratch)
+        bits = scratch.view(np.uint32)
+        # Round half up on the 13 dropped bits, carrying into the exponent
+        np.add(bits, 1 << 12, out=bits)
+        np.right_shift(bits, 13, out=bits)
+        np.maximum(bits, _FLOAT16_REBIAS, out=bits)
+        np.subtract(bits, _FLOAT16_REBIAS, out=out.view(np.uint16), casting='unsafe')
@@ -0,0 +1,223 @@
+"""
+Empirical latency distributions built from recorded traces.
+"""
+import os
+from functools import lru_cache
+from typing import Optional
+
+import numpy as np
+
+# Values read at a time when building a histogram, so a memory-mapped
+# trace is never copied whole
+CHUNK_SIZE = 1 << 20
+
+
+def _read_trace(path: str, column: int = 0) -> np.ndarray:
+    """Raw 1-D values of a trace: a memory map for .npy files"""
+    if path.endswith(".npy"):
+        values = np.load(path, mmap_mode="r")
+        if values.ndim == 2:
+            values = values[:, column]
+        return values.reshape(-1)
+    return np.genfromtxt(path, delimiter=",", usecols=column, dtype=np.float64).reshape(-1)
+
+
+def _finite_chunks(values: np.ndarray, scale: float = 1.0):
+    """Yield the finite values, scaled, CHUNK_SIZE raw values at a time"""
+    for start in range(0, values.size, CHUNK_SIZE):
+        chunk = np.asarray(values[start:start + CHUNK_SIZE], dtype=np.float64)
+        chunk = chunk[np.isfinite(chunk)]
+        if scale != 1.0:
+            chunk = chunk * scale
+        yield chunk
+
+
+def load_trace(path: str, column: int = 0, scale: float = 1.0) -> np.ndarray:
+    """Load recorded latencies from a .npy or CSV file
+
+    .npy files are memory-mapped instead of parsed, which is the fast path
+    for traces of millions of samples, but the returned array is a copy:
+    EmpiricalDistribution builds its histogram from the memory map itself,
+    see load_empirical_distribution. CSV files are read with
+    np.genfromtxt; header lines and other non-numeric entries become NaN
+    and are dropped with every other non-finite value.
+
+    Args:
+        path: trace file (.npy, otherwise read as CSV)
+        column: CSV column, or .npy column for a 2-D array
+        scale: factor applied to every value (e.g. 1e-3 for milliseconds)
+
+    Returns:
+        np.ndarray: 1-D float64 array of the finite, scaled latencies
+    """
+    values = np.concatenate([np.empty(0), *_finite_chunks(_read_trace(path, column), scale)])
+    if values.size == 0:
+        raise ValueError(f"No finite latency values in trace '{path}'")
+    return values
+
+
+class AliasTable:
+    """Walker / Vose alias table for O(1) sampling of a discrete distribution
+
+    Every index i in [0, n) is kept with probability prob[i] and otherwise
+    replaced by alias[i], so each sample costs one uniform index, one uniform
+    number and one comparison, whatever the number of outcomes.
+    """
+
+    def __init__(self, weights: np.ndarray):
+        """Build the table from non-negative weights (normalized here)"""
+        weights = np.asarray(weights, dtype=np.float64)
+        total = weights.sum()
+        if weights.ndim != 1 or weights.size == 0 or not total > 0 or (weights < 0).any():
+            raise ValueError("weights must be a non-empty 1-D array of non-negative values with a positive sum")
+
+        n = weights.size
+        scaled = (weights * (n / total)).tolist()
+        prob = [1.0] * n
+        alias = list(range(n))
+
+        small = [i for i, p in enumerate(scaled) if p < 1.0]
+        large = [i for i, p in enumerate(scaled) if p >= 1.0]
+        while small and large:
+            s = small.pop()
+            g = large[-1]
+            prob[s] = scaled[s]
+            alias[s] = g
+            scaled[g] -= 1.0 - scaled[s]
+            if scaled[g] < 1.0:
+                small.append(large.pop())
+        # Whatever is left has probability 1 up to rounding errors
+
+        self.prob = np.asarray(prob)
+        self.alias = np.asarray(alias, dtype=np.intp)
+
+    def __len__(self) -> int:
+        return len(self.prob)
+
+    def sample(self, rng: np.random.Generator, size: int) -> np.ndarray:
+        """Draw 'size' indices"""
+        index = rng.integers(len(self.prob), size=size)
+        keep = rng.random(size) < self.prob[index]
+        return np.where(keep, index, self.alias[index])
+
+
+class EmpiricalDistribution:
+    """Distribution of recorded latencies, sampled in O(1) per value
+
+    With bins > 0, the trace is reduced to a histogram once, optionally
+    smoothed with a Gaussian kernel (a binned KDE, also computed once), and
+    sampled with an alias table over the bins and a uniform offset within
+    the bin. With bins == 0, samples are drawn from the recorded values
+    themselves (bootstrap resampling).
+
+    Non-finite values are dropped. The histogram is built CHUNK_SIZE values
+    at a time and only the tables are kept, so a memory-mapped trace is
+    never copied; only bootstrap resampling keeps a copy of the values.
+    """
+
+    def __init__(self, values: np.ndarray, bins: int = 1024, bandwidth: float = 0.0, scale: float = 1.0):
+        """Build the sampling tables
+
+        Args:
+            values: recorded latencies, e.g. a memory-mapped trace
+            bins: number of histogram bins, 0 to resample the values directly
+            bandwidth: standard deviation of the Gaussian KDE kernel,
+                in the unit of the scaled values; 0 disables smoothing
+            scale: factor applied to every value (e.g. 1e-3 for milliseconds)
+        """
+        values = np.asarray(values).reshape(-1)
+        self.bins = max(0, int(bins))
+        self.bandwidth = max(0.0, float(bandwidth))
+
+        # Recorded values, only kept for bootstrap resampling
+        self.values: Optional[np.ndarray] = None
+        self.edges: Optional[np.ndarray] = None
+        self.weights: Optional[np.ndarray] = None
+        self.alias_table: Optional[AliasTable] = None
+        if self.bins:
+            self.n_values = self._build_histogram(values, scale)
+        else:
+            self.values = np.concatenate([np.empty(0), *_finite_chunks(values, scale)])
+            self.n_values = self.values.size
+            if self.n_values == 0:
+                raise ValueError("values must contain finite values")
+
+    def _build_histogram(self, values: np.ndarray, scale: float) -> int:
+        """Build the histogram tables in two passes over the chunks
+
+        Returns:
+            int: number of finite values
+        """
+        n_values = 0
+        low = np.inf
+        high = -np.inf
+        for chunk in _finite_chunks(values, scale):
+            if chunk.size:
+                n_values += chunk.size
+                low = min(low, float(chunk.min()))
+                high = max(high, float(chunk.max()))
+        if n_values == 0:
+            raise ValueError("values must contain finite values")
+        if self.bandwidth:
+            # Room for the kernel tails
+            low -= 4.0 * self.bandwidth
+            high += 4.0 * self.bandwidth
+        if high <= low:
+            # Constant trace
+            high = low + max(abs(low), 1.0) * 1e-9
+
+        # Same bins for every chunk, so the counts add up
+        weights = np.zeros(self.bins)
+        edges = np.histogram_bin_edges(np.empty(0), bins=self.bins, range=(low, high))
+        for chunk in _finite_chunks(values, scale):
+            weights += np.histogram(chunk, bins=self.bins, range=(low, high))[0]
+
+        if self.bandwidth:
+            width = edges[1] - edges[0]
+            sigma = self.bandwidth / width
+            radius = int(np.ceil(4.0 * sigma))
+            offsets = np.arange(-radius, radius + 1)
+            kernel = np.exp(-0.5 * (offsets / sigma) ** 2) if sigma > 0 else np.ones(1)
+            # The kernel can be wider than the histogram (e.g. a constant
+            # trace), so take the full convolution and slice the bins back
+            # out: mode="same" returns max(bins, kernel size) values
+            weights = np.convolve(weights, kernel / kernel.sum())[radius:radius + self.bins]
+
+        self.edges = edges
+        self.weights = weights / weights.sum()
+        self.alias_table = AliasTable(self.weights)
+        return n_values
+
+    def sample(self, rng: np.random.Generator, size: int) -> np.ndarray:
+        """Draw 'size' latencies"""
+        if self.alias_table is None:
+            return self.values[rng.integers(self.values.size, size=size)]
+
+        index = self.alias_table.sample(rng, size)
+        low = self.edges[index]
+        return low + rng.random(size) * (self.edges[index + 1] - low)
+
+
+@lru_cache(maxsize=8)
+def _load_empirical_distribution(path, mtime, column, scale, bins, bandwidth):
+    return EmpiricalDistribution(_read_trace(path, column), bins, bandwidth, scale)
+
+
+def load_empirical_distribution(
+    path: str,
+    column: int = 0,
+    scale: float = 1.0,
+    bins: int = 1024,
+    bandwidth: float = 0.0
+) -> EmpiricalDistribution:
+    """Load a trace and build its EmpiricalDistribution, once per file
+
+    Distributions are cached by file (and modification time) and settings,
+    so nodes sampling the same trace, e.g. in cloned environments, share
+    its tables. With bins > 0 the cache holds only the histogram tables,
+    not the trace, and a .npy trace is read through its memory map.
+    """
+    path = os.path.abspath(os.path.expanduser(path))
+    return _load_empirical_distribution(
+        path, os.path.getmtime(path), int(column), float(scale), int(bins), float(bandwidth)
+    )
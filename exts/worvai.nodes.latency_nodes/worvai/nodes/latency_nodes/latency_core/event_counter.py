@@ -0,0 +1,61 @@
+"""
+Counting of frequent events for rate-limited log summaries.
+"""
+import time
+from typing import Callable, Dict, Optional, Tuple
+
+
+class EventCounter:
+    """Counts events and hands them out in windows of at least 'interval' seconds
+
+    Events that would otherwise be logged one by one (e.g. a clamped sample
+    on every tick) are only counted with add(), which costs a dictionary
+    update and no string formatting. collect() returns the counts once per
+    window, so the caller logs at most one summary per interval.
+    """
+
+    def __init__(self, interval: float = 5.0, clock: Callable[[], float] = time.monotonic):
+        """Create an empty counter
+
+        Args:
+            interval: minimum seconds between two summaries
+            clock: time source, in seconds
+        """
+        if interval < 0:
+            raise ValueError(f"interval must be non-negative, got {interval}")
+        self.interval = float(interval)
+        self.clock = clock
+        self._counts: Dict[str, int] = {}
+        self._window_start = clock()
+
+    def __len__(self) -> int:
+        """Number of events counted in the current window"""
+        return sum(self._counts.values())
+
+    def add(self, event: str, n: int = 1):
+        """Count n occurrences of event"""
+        if n:
+            self._counts[event] = self._counts.get(event, 0) + n
+
+    def collect(self) -> Optional[Tuple[Dict[str, int], float]]:
+        """Counts of the window and its length in seconds, once it is 'interval' long
+
+        Returns None while the window is shorter than the interval or has
+        no events; otherwise starts a new window.
+        """
+        if not self._counts:
+            return None
+        now = self.clock()
+        elapsed = now - self._window_start
+        if elapsed < self.interval:
+            return None
+
+        counts = self._counts
+        self._counts = {}
+        self._window_start = now
+        return counts, elapsed
+
+    def reset(self):
+        """Drop the counts and start a new window"""
+        self._counts = {}
+        self._window_start = self.clock()
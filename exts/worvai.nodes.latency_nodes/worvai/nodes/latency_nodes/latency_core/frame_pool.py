@@ -0,0 +1,129 @@
+"""
+Pool of preallocated, fixed-shape frames for delayed camera data.
+"""
+from typing import Optional, Tuple
+
+import numpy as np
+
+
+class FramePool:
+    """Ring of preallocated numpy slabs with a fixed shape and dtype
+
+    Capture writes into a slab from acquire() (e.g. with np.copyto),
+    and the slab goes back to the pool with release() once the frame has
+    been emitted or dropped, so no frame memory is allocated per tick.
+
+    If every slab is in use, acquire() allocates a new one. The pool keeps
+    it while it owns fewer than max_capacity slabs, so it grows to the
+    number of frames held in flight up to that bound (e.g. the frames a
+    queue budget allows); past it, the new frame is a plain array that
+    release() leaves to the garbage collector.
+    """
+
+    def __init__(
+        self,
+        shape: Tuple[int, ...],
+        dtype=np.uint8,
+        capacity: int = 4,
+        max_capacity: Optional[int] = None
+    ):
+        """Preallocate 'capacity' slabs of the given shape and dtype
+
+        Args:
+            max_capacity: most slabs the pool owns, at least 'capacity';
+                None keeps it at 'capacity'
+        """
+        self.shape = tuple(shape)
+        self.dtype = np.dtype(dtype)
+
+        self._free = [self._allocate() for _ in range(capacity)]
+        # Every slab owned by the pool by id(); keeping the references
+        # makes the ids stable, so foreign arrays can be told apart
+        self._slabs = {id(frame): frame for frame in self._free}
+        self._in_use = set()
+        self.max_capacity = max(capacity, max_capacity or 0)
+
+    def _allocate(self) -> np.ndarray:
+        return np.empty(self.shape, dtype=self.dtype)
+
+    @property
+    def capacity(self) -> int:
+        """Number of slabs owned by the pool"""
+        return len(self._slabs)
+
+    @property
+    def max_capacity(self) -> int:
+        """Most slabs the pool owns"""
+        return self._max_capacity
+
+    @max_capacity.setter
+    def max_capacity(self, value: int):
+        # Free slabs past a lower bound are dropped now, slabs in use
+        # when they are released
+        self._max_capacity = max(1, int(value))
+        while len(self._slabs) > self._max_capacity and self._free:
+            del self._slabs[id(self._free.pop())]
+
+    @property
+    def free_count(self) -> int:
+        """Number of slabs ready to be acquired"""
+        return len(self._free)
+
+    def matches(self, shape: Tuple[int, ...], dtype) -> bool:
+        """Whether the pool holds slabs of the given shape and dtype"""
+        return self.shape == tuple(shape) and self.dtype == np.dtype(dtype)
+
+    def acquire(self) -> np.ndarray:
+        """Take a free slab, allocating a new one if the pool is exhausted
+
+        Past max_capacity, the new frame is not owned by the pool.
+        """
+        if self._free:
+            frame = self._free.pop()
+        else:
+            frame = self._allocate()
+            if len(self._slabs) >= self._max_capacity:
+                return frame
+            self._slabs[id(frame)] = frame
+        self._in_use.add(id(frame))
+        return frame
+
+    def release(self, frame: np.ndarray):
+        """Return a slab to the pool
+
+        Arrays not owned by the pool and slabs already released are ignored.
+        """
+        if frame is None or id(frame) not in self._in_use:
+            return
+        self._in_use.discard(id(frame))
+        if len(self._slabs) > self._max_capacity:
+            del self._slabs[id(frame)]
+            return
+        self._free.append(frame)
+
+
+def pack_frame(frame: np.ndarray, out: Optional[np.ndarray] = None) -> np.ndarray:
+    """Flatten a frame, copying it at most once
+
+    With 'out', a preallocated flat buffer of frame.size elements (e.g. a
+    node's output array), the frame is copied straight into it with one
+    strided copy, so views such as an alpha-stripped frame[:, :, :3] are
+    packed without an intermediate copy. Values are cast to out's dtype.
+
+    Without 'out', a contiguous frame is returned as a flat view, with no
+    copy at all; only a non-contiguous frame is copied.
+    """
+    if out is None:
+        return frame.reshape(-1)
+
+    if out.size != frame.size:
+        raise ValueError(f"Output holds {out.size} elements, the frame has {frame.size}")
+    packed = out.reshape(frame.shape)
+    if frame.ndim == 3 and not frame.flags.c_contiguous:
+        # One copy per channel: long strided rows instead of a 3- or
+        # 4-element inner loop per pixel, about 3x faster for RGBA -> RGB
+        for channel in range(frame.shape[2]):
+            np.copyto(packed[:, :, channel], frame[:, :, channel], casting='unsafe')
+    else:
+        np.copyto(packed, frame, casting='unsafe')
+    return out
@@ -0,0 +1,380 @@
+"""
+Heap-backed latency queue shared by the latency nodes.
+"""
+import heapq
+import sys
+from itertools import count
+from typing import Any, Callable, List, Optional, Tuple
+
+from .timing_wheel import TimingWheel
+
+
+class LatencyQueuePolicy:
+    """Policies for samples that arrive 'out of order'
+
+    A sample is out of order when its release time (current time + latency)
+    is not later than the release time of the previously accepted sample.
+    """
+
+    # Release samples by their own release time, even if it reorders them.
+    REORDER = "reorder"
+    # Keep arrival (FIFO) order by holding the sample back
+    # until the previous sample has been released.
+    HOLD = "hold"
+    # Drop the sample (the original deque behaviour).
+    DROP = "drop"
+
+    ALL = (REORDER, HOLD, DROP)
+
+
+class EvictionPolicy:
+    """Policies applied when the queue exceeds its item or byte budget"""
+
+    # Evict the queued item that would be released first.
+    DROP_OLDEST = "drop_oldest"
+    # Reject the incoming item.
+    DROP_NEWEST = "drop_newest"
+    # Thin the queue to every Nth item (newest kept), then drop oldest if needed.
+    KEEP_EVERY_NTH = "keep_every_nth"
+
+    ALL = (DROP_OLDEST, DROP_NEWEST, KEEP_EVERY_NTH)
+
+
+def estimate_nbytes(data: Any) -> int:
+    """Estimate the payload size of data in bytes
+
+    Uses 'nbytes' for numpy (and numpy-like) data, the length for byte
+    buffers and strings, the sum of the items for lists and tuples,
+    and sys.getsizeof for anything else.
+    """
+    nbytes = getattr(data, 'nbytes', None)
+    if nbytes is not None:
+        return int(nbytes)
+    if isinstance(data, (bytes, bytearray, str)):
+        return len(data)
+    if isinstance(data, (list, tuple)):
+        return sum(estimate_nbytes(item) for item in data)
+    return sys.getsizeof(data)
+
+
+class LatencyQueue:
+    """Priority queue of (release time, data) with O(log n) insertion
+
+    Items are stored in a binary heap keyed by (release time, arrival order),
+    so ties are always released in arrival order.
+
+    The queue can be bounded by item count and/or payload bytes
+    (0 means unbounded); the eviction policy decides what is dropped.
+    Payload sizes are taken from push(nbytes=...), or estimated from the
+    data while a byte budget is set.
+    on_evict, if given, is called with the data of every queued item
+    evicted that way (e.g. to return a pooled frame).
+
+    With a scheduler (a TimingWheel, usually the shared one), the queue
+    schedules its next release time on the wheel, and pop_ready only scans
+    the queue when the wheel reports it as due.
+    """
+
+    def __init__(
+        self,
+        policy: str = LatencyQueuePolicy.DROP,
+        max_items: int = 0,
+        max_bytes: int = 0,
+        eviction: str = EvictionPolicy.DROP_OLDEST,
+        keep_every_nth: int = 2,
+        on_evict: Optional[Callable[[Any], None]] = None,
+        scheduler: Optional[TimingWheel] = None
+    ):
+        """Create an empty queue using the given out-of-order policy and budget"""
+        # [release time, arrival order, data, payload bytes or None if not
+        # estimated]; lists, so the last entry can be replaced in place
+        self._heap = []
+        # The entry released last (the heap's largest) while the queue is
+        # not empty. Only the last entry can be popped or evicted last
+        # (keep_every_nth keeps it), so it stays valid until then
+        self._last = None
+        self._counter = count()
+        # Release time of the last accepted sample
+        self._last_release_time = float('-inf')
+
+        self.policy = policy
+        self.eviction = eviction
+        self.max_items = max_items
+        self.max_bytes = max_bytes
+        self.keep_every_nth = keep_every_nth
+        self.on_evict = on_evict
+
+        self._scheduler = None
+        self._scheduler_key = None
+        # Release time the queue is currently scheduled at on the wheel
+        self._scheduled_time = float('inf')
+        self.set_scheduler(scheduler)
+
+        self.nbytes = 0
+        # Samples dropped by the out-of-order policy
+        self.dropped_count = 0
+        # Samples dropped to stay within the budget
+        self.evicted_count = 0
+
+    @property
+    def policy(self) -> str:
+        return self._policy
+
+    @policy.setter
+    def policy(self, value: str):
+        if value not in LatencyQueuePolicy.ALL:
+            raise ValueError(
+                f"Unknown latency queue policy '{value}', "
+                f"expected one of {LatencyQueuePolicy.ALL}"
+            )
+        self._policy = value
+
+    @property
+    def eviction(self) -> str:
+        return self._eviction
+
+    @eviction.setter
+    def eviction(self, value: str):
+        if value not in EvictionPolicy.ALL:
+            raise ValueError(
+                f"Unknown eviction policy '{value}', "
+                f"expected one of {EvictionPolicy.ALL}"
+            )
+        self._eviction = value
+
+    def __len__(self) -> int:
+        return len(self._heap)
+
+    def __bool__(self) -> bool:
+        return bool(self._heap)
+
+    def set_scheduler(self, scheduler: Optional[TimingWheel]):
+        """Attach the queue to a timing wheel, or detach it with None"""
+        if scheduler is self._scheduler:
+            return
+        self.close()
+        if scheduler is not None:
+            self._scheduler = scheduler
+            self._scheduler_key = scheduler.register()
+            self._schedule_next()
+
+    def set_budget(self, max_items: int, max_bytes: int, eviction: str, keep_every_nth: int = 2):
+        """Update the budget; it is enforced on the next push"""
+        max_bytes = max(0, int(max_bytes))
+        if max_bytes and not self.max_bytes:
+            # Payload sizes are only estimated under a byte budget
+            for item in self._heap:
+                if item[3] is None:
+                    item[3] = estimate_nbytes(item[2])
+            self.nbytes = sum(item[3] for item in self._heap)
+
+        self.max_items = max(0, int(max_items))
+        self.max_bytes = max_bytes
+        self.keep_every_nth = max(2, int(keep_every_nth))
+        if eviction and eviction != self._eviction:
+            self.eviction = eviction
+
+    def push(
+        self,
+        current_time: float,
+        latency: float,
+        data: Any,
+        nbytes: Optional[int] = None
+    ) -> bool:
+        """Add data released at current_time + latency
+
+        Args:
+            nbytes: payload size; if not given, it is estimated from data
+                when the queue has a byte budget
+
+        Returns:
+            bool: False if the data was dropped (by the out-of-order policy
+                or the budget), True otherwise. Data evicted by its own
+                push (e.g. the oldest one under drop_oldest) also returns
+                False, after on_evict was called with it
+        """
+        release_time = current_time + latency
+
+        if self._heap and release_time <= self._last_release_time:
+            if self._policy == LatencyQueuePolicy.DROP:
+                self.dropped_count += 1
+                return False
+            if self._policy == LatencyQueuePolicy.HOLD:
+                release_time = self._last_release_time
+
+        bounded = self.max_items or self.max_bytes
+        if nbytes is None and self.max_bytes:
+            nbytes = estimate_nbytes(data)
+
+        if (bounded and self._eviction == EvictionPolicy.DROP_NEWEST
+                and not self._fits(1, nbytes or 0)):
+            self.evicted_count += 1
+            return False
+
+        order = next(self._counter)
+        entry = [release_time, order, data, nbytes]
+        if not self._heap or release_time >= self._last[0]:
+            self._last = entry
+        heapq.heappush(self._heap, entry)
+        if nbytes:
+            self.nbytes += nbytes
+        if release_time > self._last_release_time:
+            self._last_release_time = release_time
+
+        evicted = bounded and not self._fits(0, 0) and self._evict(order)
+        if self._scheduler is not None:
+            self._schedule_next()
+        return not evicted
+
+    def skip_if_dropped(self, current_time: float, latency: float) -> bool:
+        """Count a sample the out-of-order policy would drop, before its data exists
+
+        Lets the caller skip producing data (e.g. a frame readback) that
+        push() would only drop.
+
+        Returns:
+            bool: True if the sample was counted as dropped
+        """
+        if (self._policy == LatencyQueuePolicy.DROP and self._heap
+                and current_time + latency <= self._last_release_time):
+            self.dropped_count += 1
+            return True
+        return False
+
+    def peek_last_time(self) -> float:
+        """Release time of the item released last, or -inf if the queue is empty"""
+        if not self._heap:
+            return float('-inf')
+        return self._last[0]
+
+    def replace_last(
+        self,
+        current_time: float,
+        latency: float,
+        data: Any,
+        nbytes: Optional[int] = None
+    ) -> Any:
+        """Replace the queued item released last with data released at current_time + latency
+
+        For data that supersedes the last queued item, e.g. a frame that
+        would be released on the same tick, so only the newer one would be
+        emitted. The release time never moves earlier.
+
+        Returns:
+            the replaced data
+        """
+        if not self._heap:
+            raise IndexError("replace_last on an empty queue")
+
+        last = self._last
+        _, _, replaced, replaced_nbytes = last
+        release_time = max(last[0], current_time + latency)
+
+        if nbytes is None and self.max_bytes:
+            nbytes = estimate_nbytes(data)
+        self.nbytes += (nbytes or 0) - (replaced_nbytes or 0)
+
+        # The largest entry of a heap has no children, so moving its
+        # release time later keeps the heap valid
+        last[0], last[2], last[3] = release_time, data, nbytes
+        if release_time > self._last_release_time:
+            self._last_release_time = release_time
+        return replaced
+
+    def _schedule_next(self):
+        """Schedule the next release time on the wheel if it moved earlier"""
+        if self._scheduler is None or not self._heap:
+            return
+        next_time = self._heap[0][0]
+        if next_time < self._scheduled_time:
+            self._scheduler.schedule(self._scheduler_key, next_time)
+            self._scheduled_time = next_time
+
+    def _fits(self, extra_items: int, extra_bytes: int) -> bool:
+        """Whether the queue stays within budget with the extra items / bytes"""
+        if self.max_items and len(self._heap) + extra_items > self.max_items:
+            return False
+        if self.max_bytes and self.nbytes + extra_bytes > self.max_bytes:
+            return False
+        return True
+
+    def _evict(self, order: Optional[int] = None) -> bool:
+        """Drop queued items until the queue is back within budget
+
+        Returns:
+            bool: whether the item of the given arrival order was evicted
+        """
+        evicted = False
+        if self._eviction == EvictionPolicy.KEEP_EVERY_NTH and len(self._heap) > 1:
+            # Keep the newest item and every Nth one before it (by release order).
+            # A sorted list is a valid heap, so no heapify is needed.
+            items = sorted(self._heap)
+            kept_from = (len(items) - 1) % self.keep_every_nth
+            kept = items[kept_from::self.keep_every_nth]
+            for i, item in enumerate(items):
+                if (i - kept_from) % self.keep_every_nth:
+                    evicted = evicted or item[1] == order
+                    if self.on_evict is not None:
+                        self.on_evict(item[2])
+            self.evicted_count += len(items) - len(kept)
+            self.nbytes = sum(item[3] or 0 for item in kept)
+            self._heap[:] = kept
+
+        while self._heap and not self._fits(0, 0):
+            _, evicted_order, data, nbytes = heapq.heappop(self._heap)
+            if nbytes:
+                self.nbytes -= nbytes
+            self.evicted_count += 1
+            evicted = evicted or evicted_order == order
+            if self.on_evict is not None:
+                self.on_evict(data)
+        return evicted
+
+    def peek_time(self) -> float:
+        """Release time of the next item, or inf if the queue is empty"""
+        if not self._heap:
+            return float('inf')
+        return self._heap[0][0]
+
+    def pop_ready(self, current_time: float) -> List[Tuple[float, Any]]:
+        """Pop all items whose release time is not later than current_time
+
+        Returns:
+            list: (release time, data) tuples in release order
+        """
+        scheduler = self._scheduler
+        if scheduler is not None:
+            scheduler.advance(current_time)
+            if not scheduler.take_due(self._scheduler_key):
+                return []
+            self._scheduled_time = float('inf')
+
+        heap = self._heap
+        ready = []
+        while heap and heap[0][0] <= current_time:
+            release_time, _, data, nbytes = heapq.heappop(heap)
+            if nbytes:
+                self.nbytes -= nbytes
+            ready.append((release_time, data))
+
+        if scheduler is not None:
+            self._schedule_next()
+        return ready
+
+    def clear(self):
+        """Remove every queued item and reset the counters"""
+        self._heap.clear()
+        self._last = None
+        self._last_release_time = float('-inf')
+        self.nbytes = 0
+        self.dropped_count = 0
+        self.evicted_count = 0
+        self._scheduled_time = float('inf')
+
+    def close(self):
+        """Unregister the queue from its scheduler"""
+        if self._scheduler is not None:
+            self._scheduler.unregister(self._scheduler_key)
+            self._scheduler = None
+            self._scheduler_key = None
+        self._scheduled_time = float('inf')
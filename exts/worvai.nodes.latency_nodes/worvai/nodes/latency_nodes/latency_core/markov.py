@@ -0,0 +1,171 @@
+"""
+Markov-modulated (Gilbert-Elliott style) latency distributions.
+"""
+from bisect import bisect_right
+from typing import Sequence
+
+import numpy as np
+
+from .distributions import DistributionFamily, sample_family
+
+
+class MarkovModulatedDistribution:
+    """Latency distribution switching between regimes with a Markov chain
+
+    The regime follows a discrete-time Markov chain with one step per
+    sample, and each regime draws from its own distribution. With two
+    regimes (a good and a congested one) this is the Gilbert-Elliott model
+    of bursty channels.
+
+    Blocks are generated without a Python step per sample: the time spent
+    in regime i is geometric with success probability 1 - P[i, i], so the
+    regime sequence is built from the sequence of visited regimes and
+    their sojourn lengths with np.repeat, and then every regime draws all
+    of its samples in one vectorized call. Only the visited regimes are
+    walked one by one, and with two regimes they simply alternate.
+
+    The chain state carries over from one block to the next, so
+    consecutive blocks form one continuous chain. A block that is only
+    partly used (e.g. discarded when the clamp range changes) is rewound
+    with continue_from, so the chain does not skip its unused steps.
+    """
+
+    def __init__(
+        self,
+        transition_matrix: Sequence[Sequence[float]],
+        families: Sequence[str],
+        locations: Sequence[float],
+        scales: Sequence[float],
+        shapes: Sequence[float],
+        initial_regime: int = 0
+    ):
+        """Validate the model and start the chain in initial_regime
+
+        Args:
+            transition_matrix: n x n row-stochastic matrix, P[i, j] is the
+                probability to go from regime i to regime j in one sample
+            families: DistributionFamily of each regime
+            locations, scales, shapes: parameters of each regime's distribution
+            initial_regime: regime of the chain before the first sample
+        """
+        matrix = np.asarray(transition_matrix, dtype=np.float64)
+        n = len(families)
+        if n < 1:
+            raise ValueError("At least one regime is required")
+        if matrix.shape != (n, n):
+            raise ValueError(f"transition_matrix must be {n} x {n} for {n} regimes, got shape {matrix.shape}")
+        if (matrix < 0).any() or not np.allclose(matrix.sum(axis=1), 1.0):
+            raise ValueError("Every row of transition_matrix must be non-negative and sum to 1")
+        if not len(locations) == len(scales) == len(shapes) == n:
+            raise ValueError(f"locations, scales and shapes must have one value per regime ({n})")
+        for family in families:
+            if family not in DistributionFamily.ALL:
+                raise ValueError(f"Unknown regime distribution '{family}', expected one of {DistributionFamily.ALL}")
+        if not 0 <= initial_regime < n:
+            raise ValueError(f"initial_regime must be in [0, {n}), got {initial_regime}")
+
+        self.transition_matrix = matrix / matrix.sum(axis=1, keepdims=True)
+        self.regimes = tuple(
+            (str(family), float(location), float(scale), float(shape))
+            for family, location, scale, shape in zip(families, locations, scales, shapes)
+        )
+
+        # Probability to leave each regime, and the cumulative probabilities
+        # of the next regime given that the chain leaves
+        stay = np.diag(self.transition_matrix)
+        self._leave = 1.0 - stay
+        self._absorbing = self._leave <= 0.0
+        self._jump_cdf = []
+        for i in range(n):
+            row = self.transition_matrix[i].copy()
+            row[i] = 0.0
+            total = row.sum()
+            self._jump_cdf.append((np.cumsum(row) / total).tolist() if total > 0 else None)
+
+        # Regime the next block continues from, and regimes of the last block
+        self.regime = int(initial_regime)
+        self.regime_block = np.empty(0, dtype=np.intp)
+
+    @property
+    def n_regimes(self) -> int:
+        return len(self.regimes)
+
+    def stationary_distribution(self) -> np.ndarray:
+        """Long-run fraction of samples in each regime"""
+        # Left eigenvector of P for eigenvalue 1
+        eigenvalues, eigenvectors = np.linalg.eig(self.transition_matrix.T)
+        vector = np.real(eigenvectors[:, np.argmin(np.abs(eigenvalues - 1.0))])
+        return vector / vector.sum()
+
+    def _jump(self, regime: int, uniform: float) -> int:
+        cdf = self._jump_cdf[regime]
+        return min(bisect_right(cdf, uniform), len(cdf) - 1)
+
+    def _visited_regimes(self, rng: np.random.Generator, first: int, count: int) -> np.ndarray:
+        # Sequence of 'count' visited regimes (the embedded jump chain), from 'first'
+        if self.n_regimes == 2:
+            return (first + np.arange(count)) % 2
+
+        visited = np.empty(count, dtype=np.intp)
+        regime = first
+        uniforms = rng.random(count).tolist()
+        for k in range(count):
+            visited[k] = regime
+            if self._absorbing[regime]:
+                visited[k:] = regime
+                break
+            regime = self._jump(regime, uniforms[k])
+        return visited
+
+    def sample_regimes(self, rng: np.random.Generator, size: int) -> np.ndarray:
+        """Advance the chain by 'size' steps and return the regime of every step"""
+        chunks = []
+        filled = 0
+        regime = self.regime
+        # The first run continues the regime of the last sample: by
+        # memorylessness its remaining length is geometric again, minus
+        # the step that sample already took
+        offset = 1
+        # Runs per round: enough for the block on average
+        mean_run = 1.0 / max(float(self._leave.mean()), 1.0 / size)
+        while filled < size:
+            count = int(min(size, (size - filled) / mean_run * 1.5 + 16))
+            visited = self._visited_regimes(rng, regime, count)
+
+            absorbing = self._absorbing[visited]
+            lengths = rng.geometric(np.where(absorbing, 1.0, self._leave[visited]))
+            lengths[absorbing] = size
+            lengths[0] -= offset
+            offset = 0
+
+            chunk = np.repeat(visited, lengths)[:size - filled]
+            chunks.append(chunk)
+            filled += chunk.size
+
+            # Not truncated, so the next round jumps from the last visited regime
+            last = int(visited[-1])
+            regime = last if absorbing[-1] else self._jump(last, rng.random())
+
+        regimes = np.concatenate(chunks) if len(chunks) > 1 else chunks[0]
+        self.regime = int(regimes[-1])
+        self.regime_block = regimes
+        return regimes
+
+    def continue_from(self, index: int):
+        """Continue the chain after step 'index' of the last block
+
+        The steps of the block after 'index' are discarded: the next block
+        starts from the regime of that step instead of the end of the block.
+        """
+        self.regime = int(self.regime_block[index])
+
+    def sample(self, rng: np.random.Generator, size: int) -> np.ndarray:
+        """Draw 'size' latencies, advancing the chain by 'size' steps"""
+        regimes = self.sample_regimes(rng, size)
+        samples = np.empty(size, dtype=np.float64)
+        for i, (family, location, scale, shape) in enumerate(self.regimes):
+            mask = regimes == i
+            count = int(np.count_nonzero(mask))
+            if count:
+                samples[mask] = sample_family(rng, count, family, location, scale, shape)
+        return samples
@@ -0,0 +1,97 @@
+"""
+Keyed latency queues for delaying many independent channels in one node.
+"""
+from typing import Any, Dict, Hashable, Iterable, List, Optional, Tuple
+
+from .latency_queue import LatencyQueue, LatencyQueuePolicy
+
+
+class MultiChannelLatencyQueue:
+    """One LatencyQueue per channel id, released together
+
+    Channels are created on first push and share the out-of-order policy.
+    """
+
+    def __init__(self, policy: str = LatencyQueuePolicy.DROP):
+        """Create an empty set of channels using the given out-of-order policy"""
+        self._queues: Dict[Hashable, LatencyQueue] = {}
+        self._policy = policy
+
+    @property
+    def policy(self) -> str:
+        return self._policy
+
+    @policy.setter
+    def policy(self, value: str):
+        if value not in LatencyQueuePolicy.ALL:
+            raise ValueError(
+                f"Unknown latency queue policy '{value}', "
+                f"expected one of {LatencyQueuePolicy.ALL}"
+            )
+        for queue in self._queues.values():
+            queue.policy = value
+        self._policy = value
+
+    @property
+    def channels(self) -> List[Hashable]:
+        """Ids of every channel created so far"""
+        return list(self._queues)
+
+    def __len__(self) -> int:
+        """Total number of queued items over all channels"""
+        return sum(len(queue) for queue in self._queues.values())
+
+    def channel(self, channel_id: Hashable) -> LatencyQueue:
+        """Queue of a channel, created if it does not exist yet"""
+        queue = self._queues.get(channel_id)
+        if queue is None:
+            queue = LatencyQueue(policy=self._policy)
+            self._queues[channel_id] = queue
+        return queue
+
+    def push(
+        self,
+        channel_id: Hashable,
+        current_time: float,
+        latency: float,
+        data: Any,
+        nbytes: Optional[int] = None
+    ) -> bool:
+        """Add data to a channel, released at current_time + latency"""
+        return self.channel(channel_id).push(current_time, latency, data, nbytes)
+
+    def push_many(
+        self,
+        current_time: float,
+        items: Iterable[Tuple[Hashable, float, Any]]
+    ) -> int:
+        """Add (channel id, latency, data) items at the same time
+
+        Returns:
+            int: number of items accepted
+        """
+        accepted = 0
+        for channel_id, latency, data in items:
+            accepted += self.channel(channel_id).push(current_time, latency, data)
+        return accepted
+
+    def pop_ready(self, current_time: float) -> Dict[Hashable, List[Tuple[float, Any]]]:
+        """Pop the ready items of every channel
+
+        Returns:
+            dict: channel id -> (release time, data) tuples in release order,
+                only for channels with ready items
+        """
+        ready = {}
+        for channel_id, queue in self._queues.items():
+            if queue.peek_time() <= current_time:
+                ready[channel_id] = queue.pop_ready(current_time)
+        return ready
+
+    def remove_channel(self, channel_id: Hashable):
+        """Drop a channel and everything queued on it"""
+        self._queues.pop(channel_id, None)
+
+    def clear(self):
+        """Drop every channel"""
+        self._queues.clear()
@@ -0,0 +1,195 @@
+"""
+Octahedral encoding of normals into two 8- or 16-bit channels.
+"""
+from typing import Optional
+
+import numpy as np
+
+
+class NormalEncoding:
+    """Encodings of float32 normals (the Normals annotator, xyz + unused w)"""
+
+    # The raw float32 xyzw, 16 bytes per pixel (ROS 32FC4)
+    FLOAT32 = "32FC4"
+    # Octahedral, two 8-bit channels (8UC2), about 1 degree of error
+    OCTAHEDRAL_8 = "octahedral8"
+    # Octahedral, two 16-bit channels (16UC2), under 0.01 degree of error
+    OCTAHEDRAL_16 = "octahedral16"
+
+    ALL = (FLOAT32, OCTAHEDRAL_8, OCTAHEDRAL_16)
+
+
+NORMAL_DTYPES = {
+    NormalEncoding.FLOAT32: np.dtype(np.float32),
+    NormalEncoding.OCTAHEDRAL_8: np.dtype(np.uint8),
+    NormalEncoding.OCTAHEDRAL_16: np.dtype(np.uint16),
+}
+
+NORMAL_IMAGE_ENCODINGS = {
+    NormalEncoding.FLOAT32: "32FC4",
+    NormalEncoding.OCTAHEDRAL_8: "8UC2",
+    NormalEncoding.OCTAHEDRAL_16: "16UC2",
+}
+
+
+# Pixels encoded per block, so the scratch planes stay in cache
+OCTAHEDRAL_BLOCK_SIZE = 16384
+
+# Both channels of a pixel as one little-endian word: channel 0 in the low bits
+_PACKED_DTYPES = {
+    np.dtype(np.uint8): np.dtype('<u2'),
+    np.dtype(np.uint16): np.dtype('<u4'),
+}
+
+_SIGN_BIT = np.uint32(0x80000000)
+
+
+def octahedral_scratch(block_size: int = OCTAHEDRAL_BLOCK_SIZE) -> np.ndarray:
+    """Scratch buffer for octahedral_encode"""
+    return np.empty((5, block_size), dtype=np.float32)
+
+
+def _encode_block(normals: np.ndarray, packed: np.ndarray, scratch: np.ndarray, max_value: int):
+    x, y, z, norm, tmp = scratch
+    # Planar copy of xyz: every later pass is contiguous
+    np.copyto(scratch[:3], normals[:, :3].T)
+
+    # L1 norm, kept away from 0 so zero normals map to the center
+    np.abs(x, out=norm)
+    np.abs(y, out=tmp)
+    np.add(norm, tmp, out=norm)
+    np.abs(z, out=tmp)
+    np.add(norm, tmp, out=norm)
+    np.maximum(norm, np.finfo(np.float32).tiny, out=norm)
+    np.divide(1.0, norm, out=norm)
+    np.multiply(x, norm, out=x)
+    np.multiply(y, norm, out=y)
+    np.multiply(z, norm, out=z)
+
+    # Folding the lower hemisphere, u -> (1 - |v|) sign(u), is u + t sign(u)
+    # with t = max(-z, 0) since |u| + |v| + |z| = 1; the signs are copied
+    # with bit operations, cheaper than np.copysign
+    np.minimum(z, 0.0, out=z)
+    np.negative(z, out=z)
+    z_bits, tmp_bits = z.view(np.uint32), tmp.view(np.uint32)
+    for coordinate in (x, y):
+        np.bitwise_and(coordinate.view(np.uint32), _SIGN_BIT, out=tmp_bits)
+        np.bitwise_or(tmp_bits, z_bits, out=tmp_bits)
+        np.add(coordinate, tmp, out=coordinate)
+
+    # [-1, 1] -> [0, max_value], rounded by the truncating cast
+    half = 0.5 * max_value
+    uv = scratch[:2]
+    np.multiply(uv, half, out=uv)
+    np.add(uv, half + 0.5, out=uv)
+    np.clip(uv, 0.0, max_value, out=uv)
+    u_bits, v_bits = norm.view(np.uint32), tmp.view(np.uint32)
+    np.copyto(u_bits, x, casting='unsafe')
+    np.copyto(v_bits, y, casting='unsafe')
+
+    # Interleave by packing (u, v) into one word per pixel, as a strided
+    # write to each channel is several times slower
+    np.left_shift(v_bits, 8 * packed.itemsize // 2, out=v_bits)
+    np.bitwise_or(u_bits, v_bits, out=packed, casting='unsafe')
+
+
+def octahedral_encode(normals: np.ndarray, out: np.ndarray, scratch: Optional[np.ndarray] = None) -> np.ndarray:
+    """Encode normals (..., 3 or more; xyz first) into out (..., 2), uint8 or uint16
+
+    The normal is projected onto the octahedron |x| + |y| + |z| = 1, whose
+    lower half is folded over the upper one, and the two coordinates in
+    [-1, 1] are quantized to the full range of out's dtype. Normals need
+    not be unit length; zero normals (e.g. background) encode as (0, 0, 1).
+    Both arrays must be C-contiguous; they are processed in blocks of
+    pixels, through a small scratch buffer that stays in cache.
+
+    Args:
+        scratch: from octahedral_scratch(), reused across frames;
+            allocated if None
+    """
+    if not out.flags.c_contiguous:
+        raise ValueError("Output of octahedral_encode must be C-contiguous")
+    max_value = np.iinfo(out.dtype).max
+    if scratch is None:
+        scratch = octahedral_scratch()
+    pixels = normals.reshape(-1, normals.shape[-1])
+    packed = out.reshape(-1, 2).view(_PACKED_DTYPES[out.dtype]).reshape(-1)
+    block_size = scratch.shape[1]
+    for start in range(0, len(pixels), block_size):
+        stop = min(start + block_size, len(pixels))
+        _encode_block(pixels[start:stop], packed[start:stop], scratch[:, :stop - start], max_value)
+    return out
+
+
+def octahedral_decode(encoded: np.ndarray) -> np.ndarray:
+    """Unit normals (..., 3) as float32 from octahedral encoded (..., 2) uint8 or uint16"""
+    max_value = np.iinfo(encoded.dtype).max
+    u = encoded[..., 0] * np.float32(2.0 / max_value) - np.float32(1.0)
+    v = encoded[..., 1] * np.float32(2.0 / max_value) - np.float32(1.0)
+    z = 1.0 - np.abs(u) - np.abs(v)
+    # Unfold the lower hemisphere
+    t = np.maximum(-z, 0.0)
+    u -= np.copysign(t, u)
+    v -= np.copysign(t, v)
+    normals = np.stack((u, v, z), axis=-1)
+    normals /= np.linalg.norm(normals, axis=-1, keepdims=True)
+    return normals
+
+
+class NormalEncoder:
+    """Encodes normal frames, reusing its scratch buffers across frames"""
+
+    def __init__(self, encoding: str = NormalEncoding.FLOAT32):
+        """Create an encoder, see configure()"""
+        self._scratch = None
+        self.configure(encoding)
+
+    def configure(self, encoding: str):
+        """Change the encoding"""
+        if encoding not in NormalEncoding.ALL:
+            raise ValueError(
+                f"Unknown normal encoding '{encoding}', "
+                f"expected one of {NormalEncoding.ALL}"
+            )
+        self.encoding = encoding
+
+    @property
+    def dtype(self) -> np.dtype:
+        """dtype of the encoded frame"""
+        return NORMAL_DTYPES[self.encoding]
+
+    @property
+    def image_encoding(self) -> str:
+        """Image encoding of the encoded frame"""
+        return NORMAL_IMAGE_ENCODINGS[self.encoding]
+
+    def frame_shape(self, normals: np.ndarray) -> tuple:
+        """Shape of the encoded frame of normals"""
+        if self.encoding == NormalEncoding.FLOAT32:
+            return normals.shape
+        return normals.shape[:-1] + (2,)
+
+    def nbytes(self, normals: np.ndarray) -> int:
+        """Size in bytes of the encoded frame of normals"""
+        return int(np.prod(self.frame_shape(normals))) * self.dtype.itemsize
+
+    def encode(self, normals: np.ndarray, out: Optional[np.ndarray] = None) -> np.ndarray:
+        """Encode a normal frame into out, an array of self.dtype and self.frame_shape(normals)
+
+        A new array is allocated if out is None.
+        """
+        shape = self.frame_shape(normals)
+        if out is None:
+            out = np.empty(shape, dtype=self.dtype)
+        elif out.dtype != self.dtype or out.shape != shape:
+            raise ValueError(
+                f"Output must be {self.dtype} of shape {shape}, got {out.dtype} of shape {out.shape}"
+            )
+
+        if self.encoding == NormalEncoding.FLOAT32:
+            np.copyto(out, normals, casting='same_kind')
+            return out
+
+        if self._scratch is None:
+            self._scratch = octahedral_scratch()
+        return octahedral_encode(np.ascontiguousarray(normals), out, self._scratch)
@@ -0,0 +1,147 @@
+"""
+Inverse-CDF lookup tables for sampling arbitrary distributions with NumPy.
+"""
+from functools import lru_cache
+from typing import Callable, Sequence
+
+import numpy as np
+
+
+class TailMode:
+    """How a QuantileTable samples beyond its outermost knots"""
+
+    # Clamp to the outermost knots.
+    CLIP = "clip"
+    # Extend each tail exponentially, with the slope of its last table segment.
+    EXPONENTIAL = "exponential"
+
+    ALL = (CLIP, EXPONENTIAL)
+
+
+# Smallest uniform value used in the lower tail, so log(u) stays finite
+_MIN_UNIFORM = 2.0 ** -54
+
+
+class QuantileTable:
+    """Dense inverse-CDF table of a continuous distribution
+
+    The quantile function (ppf) is evaluated once, at construction, on
+    'size' knots between tail_probability and 1 - tail_probability. The
+    knots are spaced uniformly in logit(u), so they get denser towards
+    both tails. Sampling is then np.interp over uniform draws, without
+    calling the ppf again.
+
+    Draws beyond the outermost knots (a mass of 2 * tail_probability)
+    follow the tail mode: CLIP clamps them to the outermost knots, and
+    EXPONENTIAL extrapolates each tail as an exponential tail.
+    """
+
+    def __init__(
+        self,
+        ppf: Callable[[np.ndarray], np.ndarray],
+        size: int = 4096,
+        tail_probability: float = 1e-6,
+        tail: str = TailMode.CLIP
+    ):
+        """Tabulate ppf
+
+        Args:
+            ppf: vectorized quantile function of the distribution
+            size: number of knots (table resolution)
+            tail_probability: probability left out of the table in each tail
+            tail: TailMode for draws beyond the table
+        """
+        if size < 2:
+            raise ValueError(f"size must be at least 2, got {size}")
+        if not 0.0 < tail_probability < 0.5:
+            raise ValueError(f"tail_probability must be in (0, 0.5), got {tail_probability}")
+        if tail not in TailMode.ALL:
+            raise ValueError(f"Unknown tail mode '{tail}', expected one of {TailMode.ALL}")
+
+        self.size = int(size)
+        self.tail_probability = float(tail_probability)
+        self.tail = tail
+
+        edge = np.log(tail_probability / (1.0 - tail_probability))
+        logits = np.linspace(edge, -edge, self.size)
+        self.u = 1.0 / (1.0 + np.exp(-logits))
+        self.x = np.asarray(ppf(self.u), dtype=np.float64)
+
+        if not np.isfinite(self.x).all():
+            raise ValueError("The quantile function is not finite on the table; increase tail_probability")
+        # Guard against round-off in the ppf
+        self.x = np.maximum.accumulate(self.x)
+
+        # Slopes of the exponential tails, from the outermost segments
+        u, x = self.u, self.x
+        self._lower_slope = (x[1] - x[0]) / np.log(u[1] / u[0])
+        self._upper_slope = (x[-1] - x[-2]) / np.log((1.0 - u[-2]) / (1.0 - u[-1]))
+
+    def __len__(self) -> int:
+        return self.size
+
+    def sample(self, rng: np.random.Generator, size: int) -> np.ndarray:
+        """Draw 'size' samples"""
+        uniform = rng.random(size)
+        samples = np.interp(uniform, self.u, self.x)
+
+        if self.tail == TailMode.EXPONENTIAL:
+            u, x = self.u, self.x
+            lower = uniform < u[0]
+            if lower.any():
+                tail_u = np.maximum(uniform[lower], _MIN_UNIFORM)
+                samples[lower] = x[0] - self._lower_slope * np.log(u[0] / tail_u)
+            upper = uniform > u[-1]
+            if upper.any():
+                tail_u = uniform[upper]
+                samples[upper] = x[-1] + self._upper_slope * np.log((1.0 - u[-1]) / (1.0 - tail_u))
+
+        return samples
+
+
+@lru_cache(maxsize=32)
+def _scipy_quantile_table(name, shapes, loc, scale, size, tail_probability, tail):
+    # scipy is optional: it is only imported here, when a table is built
+    try:
+        import scipy.stats as stats
+    except ImportError as e:
+        raise ImportError("scipy is required to build quantile tables of scipy.stats distributions") from e
+
+    distribution = getattr(stats, name, None)
+    if not isinstance(distribution, stats.rv_continuous):
+        raise ValueError(f"'{name}' is not a continuous scipy.stats distribution")
+
+    frozen = distribution(*shapes, loc=loc, scale=scale)
+    return QuantileTable(frozen.ppf, size, tail_probability, tail)
+
+
+def scipy_quantile_table(
+    name: str,
+    shapes: Sequence[float] = (),
+    loc: float = 0.0,
+    scale: float = 1.0,
+    size: int = 4096,
+    tail_probability: float = 1e-6,
+    tail: str = TailMode.CLIP
+) -> QuantileTable:
+    """QuantileTable of a scipy.stats continuous distribution, e.g. 'lognorm'
+
+    scipy is imported lazily and only runs while the table is built.
+    Tables are cached by their arguments, so nodes with the same settings
+    share one table.
+
+    Args:
+        name: name of the distribution in scipy.stats (lognorm, weibull_min, pareto, gamma, ...)
+        shapes: shape parameters, in scipy's order for that distribution
+        loc: location parameter
+        scale: scale parameter
+    """
+    return _scipy_quantile_table(
+        name,
+        tuple(float(shape) for shape in shapes),
+        float(loc),
+        float(scale),
+        int(size),
+        float(tail_probability),
+        tail
+    )
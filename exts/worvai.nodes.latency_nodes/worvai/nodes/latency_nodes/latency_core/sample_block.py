@@ -0,0 +1,152 @@
+"""
+Block buffer of pre-drawn latency samples for the sampler nodes.
+"""
+from typing import Callable, Optional, Tuple
+
+import numpy as np
+
+DEFAULT_BLOCK_SIZE = 4096
+
+# draw(rng, size, *params) -> array of 'size' unclamped samples
+DrawFunction = Callable[..., np.ndarray]
+
+
+class SampleBlock:
+    """Per-node buffer of samples drawn and clamped in blocks
+
+    Drawing one value at a time costs a Python call (and for scipy
+    distributions, tens of microseconds of argument handling) per tick.
+    Instead, a whole block is drawn with one vectorized call, clamped with
+    np.clip, and handed out one sample per call to next().
+
+    The block is tied to the draw function, the distribution parameters and
+    the clamp range it was drawn with; changing any of them discards the
+    rest of the block, so a new value takes effect on the very next sample.
+    """
+
+    def __init__(self, block_size: int = DEFAULT_BLOCK_SIZE, rng: Optional[np.random.Generator] = None):
+        """Create an empty buffer drawing from rng (a fresh default_rng if None)"""
+        if block_size < 1:
+            raise ValueError(f"block_size must be positive, got {block_size}")
+
+        self.block_size = block_size
+        self.rng = np.random.default_rng() if rng is None else rng
+
+        # (draw, params, min, max) the current block was drawn with
+        self._key = None
+        # Clamped samples as Python floats, so indexing them is cheap
+        self._samples = []
+        # Unclamped samples of the current block
+        self._raw = np.empty(0)
+        self._index = 0
+
+    def __len__(self) -> int:
+        """Number of samples left in the current block"""
+        return len(self._samples) - self._index
+
+    @property
+    def last_unclamped(self) -> float:
+        """Unclamped value of the sample last returned by next()"""
+        return float(self._raw[self._index - 1])
+
+    @property
+    def last_index(self) -> int:
+        """Index in the current block of the sample last returned by next()"""
+        return self._index - 1
+
+    def invalidate(self):
+        """Discard the rest of the current block"""
+        self._key = None
+        self._samples = []
+        self._raw = np.empty(0)
+        self._index = 0
+
+    def _fill(self, draw: DrawFunction, params: Tuple, min_value: float, max_value: float):
+        raw = np.asarray(draw(self.rng, self.block_size, *params), dtype=np.float64)
+        self._raw = raw
+        self._samples = np.clip(raw, min_value, max_value).tolist()
+        self._index = 0
+
+    def next(self, draw: DrawFunction, params: Tuple, min_value: float, max_value: float) -> float:
+        """Next sample of draw(rng, size, *params), clamped to [min_value, max_value]"""
+        key = (draw, params, min_value, max_value)
+        if self._index >= len(self._samples) or key != self._key:
+            self._fill(draw, params, min_value, max_value)
+            self._key = key
+
+        value = self._samples[self._index]
+        self._index += 1
+        return value
+
+
+class BatchSampleBlock:
+    """Per-node buffer of sample rows for 'count' environments
+
+    The batch counterpart of SampleBlock: a (rows, count) block is drawn
+    with one vectorized call and clamped with np.clip, and next() hands
+    out one row, one latency per environment, per call. The number of rows
+    is chosen so that a block holds about block_size samples.
+    """
+
+    def __init__(self, count: int, block_size: int = DEFAULT_BLOCK_SIZE, rng: Optional[np.random.Generator] = None):
+        """Create an empty buffer of rows of 'count' samples"""
+        if count < 1:
+            raise ValueError(f"count must be positive, got {count}")
+        if block_size < 1:
+            raise ValueError(f"block_size must be positive, got {block_size}")
+
+        self.count = count
+        self.rows = max(1, block_size // count)
+        self.rng = np.random.default_rng() if rng is None else rng
+
+        # (draw, params, min, max) the current block was drawn with
+        self._key = None
+        self._block = np.empty((0, count))
+        # Number of samples of each row that were clamped to min / to max
+        self._clamped_min = np.empty(0, dtype=np.intp)
+        self._clamped_max = np.empty(0, dtype=np.intp)
+        self._index = 0
+
+    def __len__(self) -> int:
+        """Number of rows left in the current block"""
+        return len(self._block) - self._index
+
+    @property
+    def last_clamped_min(self) -> int:
+        """Number of samples of the row last returned by next() clamped to min"""
+        return int(self._clamped_min[self._index - 1])
+
+    @property
+    def last_clamped_max(self) -> int:
+        """Number of samples of the row last returned by next() clamped to max"""
+        return int(self._clamped_max[self._index - 1])
+
+    def invalidate(self):
+        """Discard the rest of the current block"""
+        self._key = None
+        self._block = np.empty((0, self.count))
+        self._clamped_min = np.empty(0, dtype=np.intp)
+        self._clamped_max = np.empty(0, dtype=np.intp)
+        self._index = 0
+
+    def _fill(self, draw: DrawFunction, params: Tuple, min_value: float, max_value: float):
+        raw = np.asarray(draw(self.rng, (self.rows, self.count), *params), dtype=np.float64)
+        self._block = np.clip(raw, min_value, max_value)
+        self._clamped_min = np.count_nonzero(raw < min_value, axis=1)
+        self._clamped_max = np.count_nonzero(raw > max_value, axis=1)
+        self._index = 0
+
+    def next(self, draw: DrawFunction, params: Tuple, min_value: float, max_value: float) -> np.ndarray:
+        """Next row of 'count' samples of draw(rng, (rows, count), *params), clamped
+
+        The row is a read-only view into the block; copy it to keep it.
+        """
+        key = (draw, params, min_value, max_value)
+        if self._index >= len(self._block) or key != self._key:
+            self._fill(draw, params, min_value, max_value)
+            self._block.flags.writeable = False
+            self._key = key
+
+        row = self._block[self._index]
+        self._index += 1
+        return row
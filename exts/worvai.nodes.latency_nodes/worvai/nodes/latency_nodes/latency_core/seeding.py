@@ -0,0 +1,32 @@
+"""
+Per-node random streams, independent of the global random state.
+"""
+import hashlib
+
+import numpy as np
+
+
+def _key_words(key: str):
+    """Stable 128-bit digest of key as four uint32 words (unlike hash(), not salted)"""
+    digest = hashlib.blake2b(key.encode("utf-8"), digest_size=16).digest()
+    return tuple(int.from_bytes(digest[i:i + 4], "little") for i in range(0, 16, 4))
+
+
+def node_seed_sequence(seed: int, key: str) -> np.random.SeedSequence:
+    """SeedSequence of the stream identified by (seed, key)
+
+    The key (usually the node's prim path) becomes the spawn key, so nodes
+    sharing a seed, e.g. in cloned environments, still get independent
+    streams, and each stream only depends on its own seed and key: adding
+    or removing other nodes does not shift it.
+
+    A negative seed gives a non-reproducible stream seeded from OS entropy.
+    """
+    if seed < 0:
+        return np.random.SeedSequence()
+    return np.random.SeedSequence(entropy=seed, spawn_key=_key_words(key))
+
+
+def node_rng(seed: int, key: str) -> np.random.Generator:
+    """Generator of the stream identified by (seed, key), see node_seed_sequence"""
+    return np.random.default_rng(node_seed_sequence(seed, key))
@@ -0,0 +1,162 @@
+"""
+Compact 8- or 16-bit segmentation IDs through a lookup table cached between frames.
+"""
+from typing import Optional
+
+import numpy as np
+
+
+class SegmentationEncoding:
+    """Encodings of segmentation ID frames (uint32 IDs)"""
+
+    # The raw 32-bit IDs (ROS 32SC1)
+    INT32 = "32SC1"
+    # IDs remapped to 0..254, 255 marks IDs past the table
+    UINT8 = "8UC1"
+    # IDs remapped to 0..65534, 65535 marks IDs past the table
+    UINT16 = "16UC1"
+
+    ALL = (INT32, UINT8, UINT16)
+
+
+SEGMENTATION_DTYPES = {
+    SegmentationEncoding.INT32: np.dtype(np.int32),
+    SegmentationEncoding.UINT8: np.dtype(np.uint8),
+    SegmentationEncoding.UINT16: np.dtype(np.uint16),
+}
+
+# Largest ID the lookup table is indexed by (a 32 MB uint16 table)
+DEFAULT_MAX_SEGMENTATION_ID = (1 << 24) - 1
+
+# Pixels looked up per np.take call: its index conversion stays in cache,
+# about twice as fast at 4K as one call over the frame
+LOOKUP_BLOCK_SIZE = 65536
+
+
+class SegmentationEncoder:
+    """Remaps segmentation IDs to compact 8- or 16-bit values
+
+    A dense lookup table indexed by ID maps every ID seen so far to a
+    compact value, so a frame is encoded with np.take into the output.
+    The table is kept between frames and only ever extended (with the new
+    IDs of a frame, in ascending order), never reordered, so frames
+    encoded earlier (e.g. still in a latency queue) stay valid against the
+    current ids. ID 0 (background / unlabelled) is always 0.
+
+    Once the compact range is full, IDs not in the table are encoded as
+    the sentinel (the dtype's maximum); overflow_count counts the IDs
+    that did not fit when it filled up.
+    """
+
+    def __init__(self, encoding: str = SegmentationEncoding.INT32, max_id: int = DEFAULT_MAX_SEGMENTATION_ID):
+        """Create an encoder, see configure()
+
+        Args:
+            max_id: largest ID accepted by the compact encodings
+        """
+        self.max_id = max_id
+        self.encoding = None
+        self.configure(encoding)
+
+    def configure(self, encoding: str):
+        """Change the encoding, resetting the table if it changes"""
+        if encoding not in SegmentationEncoding.ALL:
+            raise ValueError(
+                f"Unknown segmentation encoding '{encoding}', "
+                f"expected one of {SegmentationEncoding.ALL}"
+            )
+        if encoding != self.encoding:
+            self.encoding = encoding
+            self.reset()
+
+    def reset(self):
+        """Forget every ID but 0"""
+        self.overflow_count = 0
+        self._ids = np.zeros(1, dtype=np.uint32)
+        if self.encoding == SegmentationEncoding.INT32:
+            self._lut = None
+            return
+        self._sentinel = np.iinfo(self.dtype).max
+        # One entry past the largest known ID holds the sentinel, which
+        # np.take(mode='clip') returns for every larger ID
+        self._lut = np.array([0, self._sentinel], dtype=self.dtype)
+
+    @property
+    def dtype(self) -> np.dtype:
+        """dtype of the encoded frame"""
+        return SEGMENTATION_DTYPES[self.encoding]
+
+    @property
+    def image_encoding(self) -> str:
+        """Image encoding of the encoded frame"""
+        return self.encoding
+
+    @property
+    def ids(self) -> np.ndarray:
+        """Original ID of every compact value, indexed by compact value (read-only)"""
+        ids = self._ids.view()
+        ids.flags.writeable = False
+        return ids
+
+    def frame_shape(self, ids: np.ndarray) -> tuple:
+        """Shape of the encoded frame of ids"""
+        return ids.shape
+
+    def nbytes(self, ids: np.ndarray) -> int:
+        """Size in bytes of the encoded frame of ids"""
+        return ids.size * self.dtype.itemsize
+
+    def _extend(self, ids: np.ndarray):
+        """Add the IDs of a frame missing from the table"""
+        unique = np.unique(ids)
+        if unique[-1] > self.max_id:
+            raise ValueError(
+                f"Segmentation ID {unique[-1]} exceeds the lookup table limit {self.max_id}, "
+                f"use the {SegmentationEncoding.INT32} encoding"
+            )
+        if unique[-1] + 2 > len(self._lut):
+            # Grow geometrically, new entries start as the sentinel
+            size = min(max(int(unique[-1]) + 2, 2 * len(self._lut)), self.max_id + 2)
+            lut = np.full(size, self._sentinel, dtype=self.dtype)
+            lut[:len(self._lut) - 1] = self._lut[:-1]
+            self._lut = lut
+
+        new = unique[self._lut[unique] == self._sentinel]
+        free = self._sentinel - len(self._ids)
+        if len(new) > free:
+            self.overflow_count += len(new) - free
+            new = new[:free]
+        self._lut[new] = np.arange(len(self._ids), len(self._ids) + len(new), dtype=self.dtype)
+        self._ids = np.concatenate((self._ids, new.astype(np.uint32)))
+
+    def encode(self, ids: np.ndarray, out: Optional[np.ndarray] = None) -> np.ndarray:
+        """Encode an ID frame into out, an array of self.dtype with ids' shape
+
+        A new array is allocated if out is None.
+        """
+        if out is None:
+            out = np.empty(ids.shape, dtype=self.dtype)
+        elif out.dtype != self.dtype or out.shape != ids.shape:
+            raise ValueError(
+                f"Output must be {self.dtype} of shape {ids.shape}, got {out.dtype} of shape {out.shape}"
+            )
+
+        if self.encoding == SegmentationEncoding.INT32:
+            np.copyto(out, ids, casting='unsafe')
+            return out
+
+        if not out.flags.c_contiguous:
+            raise ValueError("Output of SegmentationEncoder.encode must be C-contiguous")
+        self._lookup(ids, out)
+        # The sentinel only shows up for IDs not in the table (or past its
+        # capacity), so the table is rarely extended after the first frames
+        if out.max() == self._sentinel and len(self._ids) < self._sentinel:
+            self._extend(ids)
+            self._lookup(ids, out)
+        return out
+
+    def _lookup(self, ids: np.ndarray, out: np.ndarray):
+        flat_ids, flat_out = ids.reshape(-1), out.reshape(-1)
+        for start in range(0, flat_ids.size, LOOKUP_BLOCK_SIZE):
+            stop = start + LOOKUP_BLOCK_SIZE
+            np.take(self._lut, flat_ids[start:stop], out=flat_out[start:stop], mode='clip')
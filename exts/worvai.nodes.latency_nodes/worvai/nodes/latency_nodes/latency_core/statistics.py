@@ -0,0 +1,329 @@
+"""
+Streaming statistics of sampled latencies, O(1) per sample.
+"""
+import math
+from typing import Dict, Optional, Sequence
+
+import numpy as np
+
+
+class RingBuffer:
+    """Fixed-capacity circular buffer of floats backed by a numpy array
+
+    append() overwrites the oldest value once the buffer is full, so keeping
+    a rolling history costs O(1) per value instead of list.pop(0).
+    """
+
+    def __init__(self, capacity: int):
+        """Create an empty buffer holding at most 'capacity' values"""
+        if capacity < 1:
+            raise ValueError(f"capacity must be positive, got {capacity}")
+        self._data = np.zeros(capacity, dtype=np.float64)
+        # Index the next value is written to
+        self._head = 0
+        self._size = 0
+
+    @property
+    def capacity(self) -> int:
+        return len(self._data)
+
+    def __len__(self) -> int:
+        return self._size
+
+    def append(self, value: float):
+        """Add a value, overwriting the oldest one if the buffer is full"""
+        self._data[self._head] = value
+        self._head += 1
+        if self._head == len(self._data):
+            self._head = 0
+        if self._size < len(self._data):
+            self._size += 1
+
+    def latest(self, n: int) -> np.ndarray:
+        """Copy of the last n values (fewer if not filled yet), oldest first"""
+        n = min(n, self._size)
+        start = self._head - n
+        if start >= 0:
+            return self._data[start:self._head].copy()
+        return np.concatenate((self._data[start:], self._data[:self._head]))
+
+    def to_array(self) -> np.ndarray:
+        """Copy of every value in the buffer, oldest first"""
+        return self.latest(self._size)
+
+    def clear(self):
+        self._head = 0
+        self._size = 0
+
+
+class P2Quantile:
+    """P² streaming estimator of a single quantile (Jain & Chlamtac, 1985)
+
+    Tracks five markers whose heights approximate the minimum, p/2, p,
+    (1 + p)/2 quantiles and the maximum, adjusting them with piecewise
+    parabolic interpolation; O(1) time and memory per observation.
+    """
+
+    def __init__(self, p: float):
+        """Create an estimator of the p-quantile, 0 < p < 1"""
+        if not 0.0 < p < 1.0:
+            raise ValueError(f"p must be in (0, 1), got {p}")
+        self.p = p
+        self.reset()
+
+    def reset(self):
+        # Marker heights; the first five observations until they are sorted
+        self._heights = []
+        # Actual positions of the five markers (0-based)
+        self._positions = [0, 1, 2, 3, 4]
+        # Desired positions of the three middle markers, and their increments
+        self._desired = [2 * self.p, 4 * self.p, 2 + 2 * self.p]
+        self._increments = (self.p / 2, self.p, (1 + self.p) / 2)
+
+    def update(self, x: float):
+        """Add an observation"""
+        q = self._heights
+        if len(q) < 5:
+            q.append(x)
+            if len(q) == 5:
+                q.sort()
+            return
+
+        n = self._positions
+
+        # Find the cell of x, extending the extreme markers if needed,
+        # and shift the markers above it
+        if x < q[1]:
+            if x < q[0]:
+                q[0] = x
+            n[1] += 1
+            n[2] += 1
+            n[3] += 1
+        elif x < q[2]:
+            n[2] += 1
+            n[3] += 1
+        elif x < q[3]:
+            n[3] += 1
+        elif x > q[4]:
+            q[4] = x
+        n[4] += 1
+
+        desired = self._desired
+        increments = self._increments
+        desired[0] += increments[0]
+        desired[1] += increments[1]
+        desired[2] += increments[2]
+
+        # Move the three middle markers towards their desired positions
+        for i in (1, 2, 3):
+            d = desired[i - 1] - n[i]
+            if (d >= 1 and n[i + 1] - n[i] > 1) or (d <= -1 and n[i - 1] - n[i] < -1):
+                d = 1 if d > 0 else -1
+                height = q[i] + d / (n[i + 1] - n[i - 1]) * (
+                    (n[i] - n[i - 1] + d) * (q[i + 1] - q[i]) / (n[i + 1] - n[i])
+                    + (n[i + 1] - n[i] - d) * (q[i] - q[i - 1]) / (n[i] - n[i - 1])
+                )
+                if not q[i - 1] < height < q[i + 1]:
+                    # Parabolic prediction out of order, fall back to linear
+                    height = q[i] + d * (q[i + d] - q[i]) / (n[i + d] - n[i])
+                q[i] = height
+                n[i] += d
+
+    @property
+    def value(self) -> float:
+        """Current estimate of the quantile, NaN without observations"""
+        q = self._heights
+        if len(q) == 5:
+            return q[2]
+        if not q:
+            return math.nan
+        # Fewer than five observations: exact (nearest-rank) quantile
+        ordered = sorted(q)
+        return ordered[min(len(ordered) - 1, int(self.p * len(ordered)))]
+
+
+class StreamingStatistics:
+    """Running statistics of a stream of latencies, all O(1) per sample
+
+    - count, min, max
+    - mean and variance (Welford's algorithm)
+    - exponentially weighted moving average
+    - streaming quantiles (P² estimators)
+    - a rolling history of the last 'history_size' samples (RingBuffer)
+    """
+
+    def __init__(
+        self,
+        history_size: int = 1000,
+        ewma_alpha: float = 0.1,
+        quantiles: Sequence[float] = (0.5, 0.95, 0.99)
+    ):
+        """Create empty statistics
+
+        Args:
+            history_size: number of latest samples kept in the history
+            ewma_alpha: weight of the newest sample in the moving average
+            quantiles: probabilities of the quantiles to estimate
+        """
+        if not 0.0 < ewma_alpha <= 1.0:
+            raise ValueError(f"ewma_alpha must be in (0, 1], got {ewma_alpha}")
+        self.ewma_alpha = ewma_alpha
+        self.history = RingBuffer(history_size)
+        self._quantiles = {p: P2Quantile(p) for p in quantiles}
+        self.reset()
+
+    def reset(self):
+        """Forget every sample"""
+        self.count = 0
+        self.min = math.inf
+        self.max = -math.inf
+        self.mean = 0.0
+        # Sum of squared differences from the mean (Welford)
+        self._m2 = 0.0
+        self.ewma = math.nan
+        self.history.clear()
+        for estimator in self._quantiles.values():
+            estimator.reset()
+
+    def update(self, value: float):
+        """Add a sample"""
+        self.count += 1
+        if value < self.min:
+            self.min = value
+        if value > self.max:
+            self.max = value
+
+        delta = value - self.mean
+        self.mean += delta / self.count
+        self._m2 += delta * (value - self.mean)
+
+        if self.count == 1:
+            self.ewma = value
+        else:
+            self.ewma += self.ewma_alpha * (value - self.ewma)
+
+        self.history.append(value)
+        for estimator in self._quantiles.values():
+            estimator.update(value)
+
+    @property
+    def variance(self) -> float:
+        """Sample variance, 0 with fewer than two samples"""
+        if self.count < 2:
+            return 0.0
+        return self._m2 / (self.count - 1)
+
+    @property
+    def std(self) -> float:
+        """Sample standard deviation"""
+        return math.sqrt(self.variance)
+
+    def quantile(self, p: float) -> float:
+        """Streaming estimate of the p-quantile; p must be one of 'quantiles'"""
+        return self._quantiles[p].value
+
+    @property
+    def quantiles(self) -> Dict[float, float]:
+        """Estimate of every tracked quantile, by probability"""
+        return {p: estimator.value for p, estimator in self._quantiles.items()}
+
+
+class BatchStatistics:
+    """Running statistics of 'count' latency streams sampled together
+
+    Every update adds one sample to each stream, so the statistics of all
+    streams are kept in numpy arrays and updated with a few vectorized
+    operations, instead of one StreamingStatistics per stream:
+
+    - count (shared by all streams), min, max
+    - mean and variance (Welford's algorithm)
+    - exponentially weighted moving average
+    - a 2-D rolling history of the last 'history_size' rows
+
+    Quantiles are computed on demand from the history window (the P²
+    estimators of StreamingStatistics are inherently per stream), so they
+    describe the last 'history_size' samples rather than the whole stream.
+    """
+
+    def __init__(self, count: int, history_size: int = 1000, ewma_alpha: float = 0.1):
+        """Create empty statistics of 'count' streams"""
+        if count < 1:
+            raise ValueError(f"count must be positive, got {count}")
+        if history_size < 1:
+            raise ValueError(f"history_size must be positive, got {history_size}")
+        if not 0.0 < ewma_alpha <= 1.0:
+            raise ValueError(f"ewma_alpha must be in (0, 1], got {ewma_alpha}")
+        self.n_streams = count
+        self.ewma_alpha = ewma_alpha
+
+        self.min = np.empty(count)
+        self.max = np.empty(count)
+        self.mean = np.empty(count)
+        self.ewma = np.empty(count)
+        self._m2 = np.empty(count)
+        self._delta = np.empty(count)
+        # history_size x count ring buffer, one row per update
+        self._history = np.zeros((history_size, count))
+        self.reset()
+
+    def reset(self):
+        """Forget every sample"""
+        self.count = 0
+        self.min.fill(math.inf)
+        self.max.fill(-math.inf)
+        self.mean.fill(0.0)
+        self.ewma.fill(math.nan)
+        self._m2.fill(0.0)
+        self._head = 0
+        self._size = 0
+
+    def update(self, values: np.ndarray):
+        """Add one sample to every stream"""
+        self.count += 1
+        np.minimum(self.min, values, out=self.min)
+        np.maximum(self.max, values, out=self.max)
+
+        # Welford, in place
+        delta = np.subtract(values, self.mean, out=self._delta)
+        self.mean += delta / self.count
+        delta *= values - self.mean
+        self._m2 += delta
+
+        if self.count == 1:
+            self.ewma[:] = values
+        else:
+            self.ewma += self.ewma_alpha * (values - self.ewma)
+
+        self._history[self._head] = values
+        self._head += 1
+        if self._head == len(self._history):
+            self._head = 0
+        if self._size < len(self._history):
+            self._size += 1
+
+    @property
+    def variance(self) -> np.ndarray:
+        """Sample variance of every stream, 0 with fewer than two samples"""
+        if self.count < 2:
+            return np.zeros(self.n_streams)
+        return self._m2 / (self.count - 1)
+
+    @property
+    def std(self) -> np.ndarray:
+        """Sample standard deviation of every stream"""
+        return np.sqrt(self.variance)
+
+    def history(self, n: Optional[int] = None) -> np.ndarray:
+        """Copy of the last n rows (all kept rows if None), oldest first, shape (n, count)"""
+        n = self._size if n is None else min(n, self._size)
+        start = self._head - n
+        if start >= 0:
+            return self._history[start:self._head].copy()
+        return np.concatenate((self._history[start:], self._history[:self._head]))
+
+    def quantiles(self, ps: Sequence[float]) -> np.ndarray:
+        """p-quantiles of every stream over the history window, shape (len(ps), count)"""
+        if not self._size:
+            return np.full((len(ps), self.n_streams), math.nan)
+        window = self._history[:self._size]
+        return np.quantile(window, ps, axis=0)
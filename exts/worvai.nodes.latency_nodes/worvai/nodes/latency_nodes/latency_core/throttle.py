@@ -0,0 +1,61 @@
+"""
+Throttling of periodic work, such as publishing sampler statistics.
+"""
+import time
+from typing import Callable
+
+
+class UpdateThrottle:
+    """Decides when a periodic update is due, every N calls and/or every T seconds
+
+    An update is due when at least 'interval' calls have been made since
+    the last one, and, if a period is set, at least 'period' seconds have
+    passed since the last one. An interval of 0 disables updates entirely.
+    The first call is always due (unless updates are disabled).
+    """
+
+    def __init__(self, interval: int = 1, period: float = 0.0, clock: Callable[[], float] = time.monotonic):
+        """Create a throttle
+
+        Args:
+            interval: calls between updates, 1 for every call, 0 for never
+            period: minimum seconds between updates, 0 for no time limit
+            clock: time source, in seconds
+        """
+        self.clock = clock
+        self.reset()
+        self.configure(interval, period)
+
+    def configure(self, interval: int, period: float):
+        """Change the interval and the period, keeping the time of the last update"""
+        if interval < 0:
+            raise ValueError(f"interval must be non-negative, got {interval}")
+        if period < 0:
+            raise ValueError(f"period must be non-negative, got {period}")
+        self.interval = int(interval)
+        self.period = float(period)
+
+    def reset(self):
+        """Make the next call due"""
+        self._calls = 0
+        self._last_time = 0.0
+        self._started = False
+
+    def due(self) -> bool:
+        """Count a call and return whether an update is due on it"""
+        if not self.interval:
+            return False
+
+        self._calls += 1
+        if self._started and self._calls < self.interval:
+            return False
+        if self.period:
+            # The clock is only read when a period is set
+            now = self.clock()
+            if self._started and now - self._last_time < self.period:
+                return False
+            self._last_time = now
+
+        self._started = True
+        self._calls = 0
+        return True
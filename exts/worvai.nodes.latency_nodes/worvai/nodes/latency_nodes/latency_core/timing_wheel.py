@@ -0,0 +1,167 @@
+"""
+Hierarchical timing wheel shared by the latency queues of every node.
+"""
+import math
+from itertools import count
+from typing import Hashable, List, Set, Tuple
+
+
+class TimingWheel:
+    """Hierarchical timing wheel of keys bucketed by tick
+
+    Every registered key (one per latency queue) is scheduled at the release
+    time of its next item. Scheduling is O(1), and advancing by one tick only
+    touches the slot of that tick, so on each tick only the keys that
+    actually have due items are reported, and idle queues skip their scan.
+
+    Level 0 has one slot per tick; each higher level covers 'slots' times the
+    span of the level below, and its entries cascade down as time advances.
+    Entries beyond the top level wait in an overflow list.
+
+    A key may fire up to one tick early, or more than once for the same item
+    (stale entries are not removed), so owners must still check the release
+    time of their items; the wheel only tells them when to look.
+    """
+
+    def __init__(self, tick: float = 1.0 / 60.0, slots: int = 64, levels: int = 4):
+        """Create a wheel with the given tick resolution (seconds) and size"""
+        if slots < 2 or slots & (slots - 1):
+            raise ValueError(f"slots must be a power of two, got {slots}")
+
+        self.tick = tick
+        self._bits = slots.bit_length() - 1
+        self._slots = slots
+        self._mask = slots - 1
+        self._levels = levels
+
+        # [level][slot] -> [(due tick, key), ...]
+        self._wheels = [[[] for _ in range(slots)] for _ in range(levels)]
+        self._overflow: List[Tuple[int, Hashable]] = []
+        self._count = 0
+        self._current_tick = 0
+        # Start time of the next tick, to return early from advance()
+        self._next_tick_time = self.tick
+
+        self._handles = count()
+        self._registered: Set[Hashable] = set()
+        self._due: Set[Hashable] = set()
+
+    def __len__(self) -> int:
+        """Number of scheduled entries, including stale ones"""
+        return self._count
+
+    def register(self) -> int:
+        """Get a new key to schedule with"""
+        key = next(self._handles)
+        self._registered.add(key)
+        return key
+
+    def unregister(self, key: Hashable):
+        """Forget a key; its remaining entries are ignored when they fire"""
+        self._registered.discard(key)
+        self._due.discard(key)
+
+    def _to_tick(self, time: float) -> int:
+        return math.floor(time / self.tick)
+
+    def schedule(self, key: Hashable, due_time: float):
+        """Report key as due once the wheel reaches due_time (O(1))"""
+        self._insert(self._to_tick(due_time), key)
+
+    def _insert(self, due_tick: int, key: Hashable):
+        delta = due_tick - self._current_tick
+        if delta <= 0:
+            if key in self._registered:
+                self._due.add(key)
+            return
+
+        for level in range(self._levels):
+            if delta < 1 << (self._bits * (level + 1)):
+                slot = (due_tick >> (self._bits * level)) & self._mask
+                self._wheels[level][slot].append((due_tick, key))
+                self._count += 1
+                return
+
+        self._overflow.append((due_tick, key))
+        self._count += 1
+
+    def _take_slot(self, level: int, slot: int) -> List[Tuple[int, Hashable]]:
+        entries = self._wheels[level][slot]
+        if entries:
+            self._wheels[level][slot] = []
+            self._count -= len(entries)
+        return entries
+
+    def advance(self, current_time: float):
+        """Move the wheel forward to current_time, firing every due key
+
+        Calls with a time at or before the current tick return immediately,
+        so every node can advance the shared wheel with its own timestamp.
+        """
+        if current_time < self._next_tick_time:
+            return
+
+        target_tick = self._to_tick(current_time)
+        if target_tick <= self._current_tick:
+            return
+        self._next_tick_time = (target_tick + 1) * self.tick
+
+        if self._count == 0:
+            self._current_tick = target_tick
+            return
+
+        # Jumping far ahead: re-insert everything instead of stepping
+        if target_tick - self._current_tick > self._slots:
+            entries = self._overflow
+            self._overflow = []
+            for level in range(self._levels):
+                for slot in range(self._slots):
+                    entries.extend(self._take_slot(level, slot))
+            self._count = 0
+            self._current_tick = target_tick
+            for due_tick, key in entries:
+                self._insert(due_tick, key)
+            return
+
+        while self._current_tick < target_tick:
+            self._current_tick += 1
+            tick = self._current_tick
+
+            # Entries past the top level come back once it wraps around
+            if self._overflow and not tick & ((1 << (self._bits * self._levels)) - 1):
+                entries, self._overflow = self._overflow, []
+                self._count -= len(entries)
+                for due_tick, key in entries:
+                    self._insert(due_tick, key)
+
+            # Cascade higher levels at their boundaries, top level first
+            for level in range(self._levels - 1, 0, -1):
+                shift = self._bits * level
+                if not tick & ((1 << shift) - 1):
+                    slot = (tick >> shift) & self._mask
+                    for due_tick, key in self._take_slot(level, slot):
+                        self._insert(due_tick, key)
+
+            # Entries of a level 0 slot are all due at this tick
+            for _, key in self._take_slot(0, tick & self._mask):
+                if key in self._registered:
+                    self._due.add(key)
+
+    def take_due(self, key: Hashable) -> bool:
+        """Whether key fired since the last call, clearing the flag"""
+        due = self._due
+        if key in due:
+            due.remove(key)
+            return True
+        return False
+
+
+_shared_timing_wheel = None
+
+
+def shared_timing_wheel() -> TimingWheel:
+    """The process-wide timing wheel all latency controllers register with"""
+    global _shared_timing_wheel
+    if _shared_timing_wheel is None:
+        _shared_timing_wheel = TimingWheel()
+    return _shared_timing_wheel
@@ -0,0 +1,217 @@
+import numpy as np
+import omni.graph.core as og
+
+from worvai.nodes.latency_nodes.latency_core import (
+	BatchSampleBlock,
+	BatchStatistics,
+	sample_family
+)
+
+from .base.base_sampler import (
+	BaseLatencySampler,
+	LatencySamplerInternalState
+)
+
+# Rows of per-environment history; the percentiles are computed over them,
+# at most once every BATCH_HISTORY_SIZE computes
+BATCH_HISTORY_SIZE = 100
+
+
+class OgnBatchLatencyInternalState(LatencySamplerInternalState):
+	"""Internal state for Batch Latency sampler"""
+
+	def __init__(self):
+		"""Instantiate the per-node state information"""
+		super().__init__()
+
+		# Statistics and block buffer of every environment, built by set_count
+		self.count = 0
+		self.statistics = None
+		self.sample_block = BatchSampleBlock(1)
+		# Sample count of the last percentile refresh
+		self.quantiles_count = 0
+
+	def set_count(self, count: int):
+		"""Size the block buffer and statistics for 'count' environments
+
+		Changing the count restarts the statistics; the node keeps its
+		random stream.
+		"""
+		if count == self.count:
+			return
+		if count < 1:
+			raise ValueError(f"Count must be positive, got {count}")
+
+		self.count = count
+		self.statistics = BatchStatistics(count, history_size=BATCH_HISTORY_SIZE)
+		self.quantiles_count = 0
+		self.sample_block = BatchSampleBlock(count, rng=self.sample_block.rng)
+
+	def update_statistics(self, latency_values: np.ndarray):
+		"""Update internal statistics with one latency per environment"""
+		self.statistics.update(latency_values)
+
+
+class OgnBatchLatencySampler(BaseLatencySampler):
+	"""Batch Latency Sampler node"""
+
+	@staticmethod
+	def initialize(graph_context: og.GraphContext, node: og.Node):
+		"""Initialize any static resources or configurations"""
+		try:
+			# Base attributes
+			min_attr = node.get_attribute("inputs:min")
+			max_attr = node.get_attribute("inputs:max")
+			verbose_attr = node.get_attribute("inputs:verbose")
+
+			# Distribution attributes
+			scale_attr = node.get_attribute("inputs:_scaleParameter")
+
+			# === Set default values ===
+			min_attr.set(0.0)
+			max_attr.set(float('inf'))
+
+			# === Register callbacks for value changes ===
+			# This is mainly for ensuring non-negative values.
+			# "location" and "shape" can be any real number.
+			for attr in (min_attr, max_attr, scale_attr):
+				attr.register_value_changed_callback(
+					OgnBatchLatencySampler.on_value_changed_callback
+				)
+
+			# This is for verbose mode.
+			# The callback function is defined in the BaseLatencySampler.
+			verbose_attr.register_value_changed_callback(
+				OgnBatchLatencySampler.on_value_changed_callback_verbose
+			)
+		except Exception as e:
+			prim_path = node.get_prim_path()
+			node_name = prim_path.split('/')[-1]
+			print(f"[{node_name}] Error in initialize: {e}")
+
+	@staticmethod
+	def on_value_changed_callback(attr: og.Attribute) -> None:
+		"""Callback for when input values change"""
+		try:
+			node = attr.get_node()
+			is_verbose = node.get_attribute("inputs:verbose").get()
+
+			value = attr.get()
+
+			# Early stop if value is already valid
+			if value >= 0:
+				return
+
+			# Clamp negative values to zero.
+			# This method is for clamping + logging.
+			clamped_value = OgnBatchLatencySampler.clamp_non_negative(
+				value=value,
+				name=attr.get_name(),
+				verbose=is_verbose
+			)
+			attr.set(clamped_value)
+		except Exception as e:
+			prim_path = attr.get_node().get_prim_path()
+			node_name = prim_path.split('/')[-1]
+			print(f"[{node_name}] Error in on_value_changed_callback: {e}")
+
+	@staticmethod
+	def internal_state() -> OgnBatchLatencyInternalState:
+		"""Returns an object that contains per-node state information"""
+		return OgnBatchLatencyInternalState()
+
+	@staticmethod
+	def draw_block(
+		rng: np.random.Generator,
+		size,
+		distribution: str,
+		location: float,
+		scale: float,
+		shape: float
+	) -> np.ndarray:
+		"""Draw an array of shape 'size' of unclamped samples"""
+		return sample_family(rng, size, distribution, location, scale, shape)
+
+	@staticmethod
+	def _update_batch_state_outputs(db, state: OgnBatchLatencyInternalState):
+		"""Write the per-environment statistics to the state attributes, when stats_due"""
+		if not BaseLatencySampler.stats_due(db, state):
+			return
+
+		statistics = state.statistics
+
+		db.state.latencyCount = statistics.count
+		db.state.min = statistics.min
+		db.state.max = statistics.max
+		db.state.latencyMean = statistics.mean
+		db.state.latencyStdDev = statistics.std
+		db.state.latencyEwma = statistics.ewma
+
+		# Percentiles of the history window, at most once per window
+		if statistics.count - state.quantiles_count >= BATCH_HISTORY_SIZE:
+			state.quantiles_count = statistics.count
+			p50, p95, p99 = statistics.quantiles((0.5, 0.95, 0.99))
+			db.state.latencyP50 = p50
+			db.state.latencyP95 = p95
+			db.state.latencyP99 = p99
+
+	@staticmethod
+	def compute(db) -> bool:
+		"""Compute the output based on inputs and internal state"""
+		# === Check execution state ===
+		exec_in = db.inputs.execIn
+		if exec_in == og.ExecutionAttributeState.DISABLED:
+			return False
+
+		# === Get internal state for 'this' node ===
+		# The internal state is used for per-node.
+		state = db.per_instance_state
+
+		try:
+			# === Extract distribution parameters ===
+			distribution = db.inputs._distribution
+			location = db.inputs._locationParameter
+			scale = db.inputs._scaleParameter
+			shape = db.inputs._shapeParameter
+			min = db.inputs.min
+			max = db.inputs.max
+			verbose = db.inputs.verbose
+
+			# === Size the buffers (only when the count changes) ===
+			state.set_count(db.inputs.count)
+
+			# === Per-node random stream, keyed by seed and prim path ===
+			OgnBatchLatencySampler.seed_state(db, state)
+
+			# === Sample every environment ===
+			# Rows of a (rows, count) block, refilled when the parameters change
+			block = state.sample_block
+			latency_values = block.next(
+				OgnBatchLatencySampler.draw_block,
+				(distribution, location, scale, shape),
+				min,
+				max
+			)
+			if verbose:
+				# Counted per compute, logged as one summary per interval
+				state.clamp_counter.add("min", block.last_clamped_min)
+				state.clamp_counter.add("max", block.last_clamped_max)
+				BaseLatencySampler.log_clamp_summary(state, "Batch sampled latency values")
+
+			# === Update internal statistics ===
+			state.update_statistics(latency_values)
+			OgnBatchLatencySampler._update_batch_state_outputs(db, state)
+
+			# === Write outputs ===
+			db.outputs.latencies = latency_values
+			db.outputs.execOut = og.ExecutionAttributeState.ENABLED
+
+			return True
+
+		except Exception as e:
+			# Log error and disable output
+			prim_path = db.abi_node.get_prim_path()
+			node_name = prim_path.split('/')[-1]
+			print(f"[{node_name}] Error in compute: {e}")
+			db.outputs.execOut = og.ExecutionAttributeState.DISABLED
+			return False
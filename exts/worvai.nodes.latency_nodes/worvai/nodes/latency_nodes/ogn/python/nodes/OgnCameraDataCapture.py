@@ -5,40 +5,51 @@ import carb
 import numpy as np
 import omni
 import omni.graph.core as og
-import omni.replicator.core as rep
 import omni.syntheticdata._syntheticdata as sd
 from omni.syntheticdata import SyntheticData
 
+from worvai.nodes.latency_nodes.latency_core import (
+    DepthEncoder,
+    DepthEncoding,
+    NormalEncoder,
+    NormalEncoding,
+    SegmentationEncoder,
+    SegmentationEncoding,
+    pack_frame
+)
+
+from .base.annotator_registry import annotator_name, shared_annotators
+
 
 class OgnCameraDataCaptureInternalState:
     """Convenience class for maintaining per-node state information"""
 
     def __init__(self):
         """Instantiate the per-node state information"""
-        self.annotator = None
+        # (render product path, annotator name) acquired from the shared registry
+        self.annotator_key = None
         self.render_product_path = ""
         self.data_type = ""
         self.initialized = False
+        # Number of elements the imageData output array is sized for
+        self.output_size = 0
+        # Encodings of depth, normals and segmentation, configured from the inputs
+        self.depth_encoder = DepthEncoder(DepthEncoding.FLOAT32)
+        self.normal_encoder = NormalEncoder(NormalEncoding.FLOAT32)
+        # Keeps its ID table between frames
+        self.segmentation_encoder = SegmentationEncoder(SegmentationEncoding.INT32)
 
     def initialize_annotator(self, render_product_path: str, data_type: str):
         """Initialize the annotator for the given render product and data type"""
         try:
-            if data_type == "rgb":
-                self.annotator = rep.AnnotatorRegistry.get_annotator("LdrColor")
-            elif data_type == "depth":
-                self.annotator = rep.AnnotatorRegistry.get_annotator("DistanceToImagePlane")
-            elif data_type == "normals":
-                self.annotator = rep.AnnotatorRegistry.get_annotator("Normals")
-            elif data_type == "semantic_segmentation":
-                self.annotator = rep.AnnotatorRegistry.get_annotator("SemanticSegmentation")
-            elif data_type == "instance_segmentation":
-                self.annotator = rep.AnnotatorRegistry.get_annotator("InstanceSegmentation")
-            else:
+            name = annotator_name(data_type)
+            if name is None:
                 carb.log_error(f"Unsupported data type: {data_type}")
                 return False
 
-            # Attach the annotator to the render product
-            self.annotator.attach([render_product_path])
+            # Attach the annotator to the render product, or share the one
+            # another camera node already attached
+            self.annotator_key = shared_annotators().acquire(render_product_path, name)
             self.render_product_path = render_product_path
             self.data_type = data_type
             self.initialized = True
@@ -58,11 +69,11 @@ class OgnCameraDataCaptureInternalState:
             else:
                 return "mono8"
         elif data_type == "depth":
-            return "32FC1"  # 32-bit float, 1 channel
+            return self.depth_encoder.image_encoding  # 32FC1 unless re-encoded
         elif data_type in ["semantic_segmentation", "instance_segmentation"]:
-            return "32SC1"  # 32-bit signed int, 1 channel (or could be 32UC1 for unsigned)
+            return self.segmentation_encoder.image_encoding  # 32SC1 unless remapped
         elif data_type == "normals":
-            return "32FC4"  # 32-bit float, 4 channels
+            return self.normal_encoder.image_encoding  # 32FC4 unless octahedral
         else:
             # Default to 8-bit formats
             if channels == 1:
@@ -74,20 +85,58 @@ class OgnCameraDataCaptureInternalState:
             else:
                 return "mono8"
 
+    def payload_encoder(self):
+        """Encoder of the data type, None if frames are copied as they are"""
+        if self.data_type == "depth":
+            return self.depth_encoder
+        if self.data_type == "normals":
+            return self.normal_encoder
+        if self.data_type in ["semantic_segmentation", "instance_segmentation"]:
+            return self.segmentation_encoder
+        return None
+
+    def write_image_data(self, db, data: np.ndarray):
+        """Copy a frame from get_data into the imageData output array
+
+        The output array is only resized when the resolution or the data
+        type changes, and the frame is copied straight into it with one
+        strided copy, which also packs an alpha-stripped RGB view. Depth,
+        normals and segmentation are written as the bytes of their
+        encoding, encoded in place.
+        """
+        encoder = self.payload_encoder()
+        size = encoder.nbytes(data) if encoder is not None else data.size
+        if self.output_size != size:
+            db.outputs.imageData_size = size
+            self.output_size = size
+        if encoder is not None:
+            frame = db.outputs.imageData.view(encoder.dtype).reshape(encoder.frame_shape(data))
+            encoder.encode(data, frame)
+        else:
+            pack_frame(data, db.outputs.imageData)
+
     def get_data(self):
-        """Get the current data from the annotator"""
-        if not self.initialized or not self.annotator:
+        """Get the current data from the annotator
+
+        The frame is returned as a view of the annotator data, not copied;
+        write_image_data copies it once into the output.
+        """
+        if not self.initialized or not self.annotator_key:
             return None, 0, 0, 0, "", ""
 
         try:
-            data = self.annotator.get_data()
+            # Read back once per frame, whichever camera node asks first
+            data = shared_annotators().get_data(*self.annotator_key)
+
+            # Segmentation annotators return their ID -> label info along with the IDs
+            if isinstance(data, dict):
+                data = data["data"]
 
             if data is None or data.size == 0:
                 return None, 0, 0, 0, "", ""
 
-            # Convert to numpy array if needed
-            if not isinstance(data, np.ndarray):
-                data = np.array(data)
+            # Convert to numpy array if needed (no copy for numpy data)
+            data = np.asarray(data)
 
             height, width = data.shape[:2]
             channels = data.shape[2] if len(data.shape) > 2 else 1
@@ -100,24 +149,25 @@ class OgnCameraDataCaptureInternalState:
             if self.data_type == "rgb":
                 # LdrColor returns RGBA uint8, convert to RGB if needed
                 if channels == 4:
-                    data = data[:, :, :3]  # Remove alpha channel
+                    data = data[:, :, :3]  # Remove alpha channel (view, packed by write_image_data)
                     channels = 3
                     encoding = "rgb8"
-                flattened_data = data.flatten()
 
             elif self.data_type == "depth":
-                # DistanceToImagePlane returns float32, keep as is for ROS
-                # ROS encoding: 32FC1 (32-bit float, 1 channel)
-                flattened_data = data.flatten()
+                # DistanceToImagePlane returns float32 meters, encoded by
+                # write_image_data (32FC1 keeps them as is)
+                pass
 
             elif self.data_type in ["semantic_segmentation", "instance_segmentation"]:
-                # These return uint32, keep as is for ROS
-                # ROS encoding: 32SC1 (32-bit signed int, 1 channel) or TYPE_32UC1
-                flattened_data = data.flatten()
+                # These return uint32 IDs, written as 32SC1 or remapped to
+                # 8 / 16 bits by write_image_data
+                pass
 
             elif self.data_type == "normals":
-                # Normals return float32, keep as is
-                flattened_data = data.flatten()
+                # Normals return float32 xyzw, written as 32FC4 or
+                # octahedral encoded to 2 channels by write_image_data
+                if self.normal_encoder.encoding != NormalEncoding.FLOAT32:
+                    channels = 2
 
             else:
                 # Default: convert to uint8
@@ -127,23 +177,24 @@ class OgnCameraDataCaptureInternalState:
                         data = ((data - data.min()) / (data.max() - data.min()) * 255).astype(np.uint8)
                     else:
                         data = data.astype(np.uint8)
-                flattened_data = data.flatten()
 
-            return flattened_data, width, height, channels, encoding, original_dtype
+            return data, width, height, channels, encoding, original_dtype
 
         except Exception as e:
             carb.log_error(f"Failed to get data from annotator: {e}")
             return None, 0, 0, 0, "", ""
 
     def cleanup(self):
-        """Clean up the annotator"""
-        if self.annotator:
+        """Release the annotator, detached once no camera node uses it"""
+        if self.annotator_key:
             try:
-                self.annotator.detach()
-            except:
-                pass
-            self.annotator = None
+                shared_annotators().release(*self.annotator_key)
+            except Exception as e:
+                carb.log_warn(f"Error releasing the Camera Data Capture annotator: {e}")
+            self.annotator_key = None
         self.initialized = False
+        self.output_size = 0
+        self.segmentation_encoder.reset()
 
 
 class OgnCameraDataCapture:
@@ -168,6 +219,19 @@ class OgnCameraDataCapture:
         if exec_in == og.ExecutionAttributeState.DISABLED:
             return False
 
+        try:
+            state.depth_encoder.configure(
+                db.inputs.depthEncoding,
+                db.inputs.depthMin,
+                db.inputs.depthMax
+            )
+            state.normal_encoder.configure(db.inputs.normalEncoding)
+            state.segmentation_encoder.configure(db.inputs.segmentationEncoding)
+        except ValueError as e:
+            carb.log_error(f"Invalid encoding settings: {e}")
+            db.outputs.execOut = og.ExecutionAttributeState.DISABLED
+            return False
+
         # Check if we need to reinitialize
         if (not state.initialized or 
             state.render_product_path != render_product_path or 
@@ -190,12 +254,15 @@ class OgnCameraDataCapture:
             return False
 
         # Set outputs
-        db.outputs.imageData = image_data
+        # One copy from the annotator data into the output array
+        state.write_image_data(db, image_data)
         db.outputs.width = width
         db.outputs.height = height
         db.outputs.channels = channels
         db.outputs.encoding = encoding
         db.outputs.dataType = data_type_str
+        if state.payload_encoder() is state.segmentation_encoder:
+            db.outputs.segmentationIds = state.segmentation_encoder.ids
         db.outputs.timestampOut = timestamp_in
         db.outputs.execOut = og.ExecutionAttributeState.ENABLED
 
@@ -210,5 +277,5 @@ class OgnCameraDataCapture:
             state = OgnCameraDataCaptureDatabase.per_instance_state(node)
             if state:
                 state.cleanup()
-        except:
-            pass
+        except Exception as e:
+            carb.log_warn(f"Error releasing OgnCameraDataCapture: {e}")
@@ -0,0 +1,189 @@
+import numpy as np
+import omni.graph.core as og
+
+from worvai.nodes.latency_nodes.latency_core import (
+	EmpiricalDistribution,
+	load_empirical_distribution
+)
+
+from .base.base_sampler import (
+	BaseLatencySampler,
+	LatencySamplerInternalState
+)
+
+
+class OgnEmpiricalDistInternalState(LatencySamplerInternalState):
+	"""Internal state for Empirical Distribution sampler"""
+
+	def __init__(self):
+		"""Instantiate the per-node state information"""
+		super().__init__()
+
+		# (path, column, scale, bins, bandwidth) of the loaded trace
+		self.trace_key = None
+		self.distribution = None
+
+	def set_trace(self, path, column, scale, bins, bandwidth):
+		"""Load the trace and build its sampling tables, once per setting
+
+		A trace that fails to load is not retried until a setting changes.
+
+		Returns:
+			EmpiricalDistribution: the distribution, or None if it failed to load
+		"""
+		trace_key = (path, column, scale, bins, bandwidth)
+		if trace_key == self.trace_key:
+			return self.distribution
+
+		self.trace_key = trace_key
+		self.distribution = None
+		if not path:
+			raise ValueError("No trace path given")
+
+		# Cached by file, so nodes sharing a trace share its tables
+		self.distribution = load_empirical_distribution(
+			path, column=column, scale=scale, bins=bins, bandwidth=bandwidth
+		)
+		return self.distribution
+
+
+class OgnEmpiricalDistSampler(BaseLatencySampler):
+	"""Empirical Distribution Latency Sampler node"""
+
+	@staticmethod
+	def initialize(graph_context: og.GraphContext, node: og.Node):
+		"""Initialize any static resources or configurations"""
+		try:
+			# Base attributes
+			min_attr = node.get_attribute("inputs:min")
+			max_attr = node.get_attribute("inputs:max")
+			verbose_attr = node.get_attribute("inputs:verbose")
+
+			# Trace attributes
+			scale_attr = node.get_attribute("inputs:_traceScale")
+			bin_count_attr = node.get_attribute("inputs:_binCount")
+			bandwidth_attr = node.get_attribute("inputs:_kdeBandwidth")
+
+			# === Set default values ===
+			min_attr.set(0.0)
+			max_attr.set(float('inf'))
+
+			# === Register callbacks for value changes ===
+			# This is mainly for ensuring non-negative values
+			for attr in (min_attr, max_attr, scale_attr, bin_count_attr, bandwidth_attr):
+				attr.register_value_changed_callback(
+					OgnEmpiricalDistSampler.on_value_changed_callback
+				)
+
+			# This is for verbose mode.
+			# The callback function is defined in the BaseLatencySampler.
+			verbose_attr.register_value_changed_callback(
+				OgnEmpiricalDistSampler.on_value_changed_callback_verbose
+			)
+		except Exception as e:
+			prim_path = node.get_prim_path()
+			node_name = prim_path.split('/')[-1]
+			print(f"[{node_name}] Error in initialize: {e}")
+
+	@staticmethod
+	def on_value_changed_callback(attr: og.Attribute) -> None:
+		"""Callback for when input values change"""
+		try:
+			node = attr.get_node()
+			is_verbose = node.get_attribute("inputs:verbose").get()
+
+			value = attr.get()
+
+			# Early stop if value is already valid
+			if value >= 0:
+				return
+
+			# Clamp negative values to zero.
+			# This method is for clamping + logging.
+			clamped_value = OgnEmpiricalDistSampler.clamp_non_negative(
+				value=value,
+				name=attr.get_name(),
+				verbose=is_verbose
+			)
+			attr.set(type(value)(clamped_value))
+		except Exception as e:
+			prim_path = attr.get_node().get_prim_path()
+			node_name = prim_path.split('/')[-1]
+			print(f"[{node_name}] Error in on_value_changed_callback: {e}")
+
+	@staticmethod
+	def internal_state() -> OgnEmpiricalDistInternalState:
+		"""Returns an object that contains per-node state information"""
+		return OgnEmpiricalDistInternalState()
+
+	@staticmethod
+	def draw_block(
+		rng: np.random.Generator,
+		size: int,
+		distribution: EmpiricalDistribution
+	) -> np.ndarray:
+		"""Draw 'size' samples from the recorded trace"""
+		# Alias table over the histogram bins, O(1) per sample
+		return distribution.sample(rng, size)
+
+	@staticmethod
+	def compute(db) -> bool:
+		"""Compute the output based on inputs and internal state"""
+		# === Check execution state ===
+		exec_in = db.inputs.execIn
+		if exec_in == og.ExecutionAttributeState.DISABLED:
+			return False
+
+		# === Get internal state for 'this' node ===
+		# The internal state is used for per-node.
+		state = db.per_instance_state
+
+		try:
+			# === Load the trace (only when a trace setting changes) ===
+			distribution = state.set_trace(
+				db.inputs._tracePath,
+				db.inputs._traceColumn,
+				db.inputs._traceScale,
+				db.inputs._binCount,
+				db.inputs._kdeBandwidth
+			)
+			if distribution is None:
+				db.outputs.execOut = og.ExecutionAttributeState.DISABLED
+				return False
+
+			min = db.inputs.min
+			max = db.inputs.max
+			verbose = db.inputs.verbose
+
+			# === Per-node random stream, keyed by seed and prim path ===
+			OgnEmpiricalDistSampler.seed_state(db, state)
+
+			# === Sample from the trace ===
+			# Drawn in blocks, refilled when the trace or the range changes
+			latency_value = OgnEmpiricalDistSampler.draw_sample(
+				state,
+				(distribution,),
+				min,
+				max,
+				name="Empirical distribution sampled latency value",
+				verbose=verbose
+			)
+
+			# === Update internal statistics ===
+			state.update_statistics(latency_value)
+			if BaseLatencySampler._update_state_outputs(db, state, latency_value):
+				db.state.traceSize = distribution.n_values
+
+			# === Write outputs ===
+			db.outputs.latencyOut = latency_value
+			db.outputs.execOut = og.ExecutionAttributeState.ENABLED
+
+			return True
+
+		except Exception as e:
+			# Log error and disable output
+			prim_path = db.abi_node.get_prim_path()
+			node_name = prim_path.split('/')[-1]
+			print(f"[{node_name}] Error in compute: {e}")
+			db.outputs.execOut = og.ExecutionAttributeState.DISABLED
+			return False
@@ -11,11 +11,15 @@ Collection of OmniGraph code examples in Python:
 Collection of OmniGraph tutorials:
 	https://docs.omniverse.nvidia.com/kit/docs/omni.graph.tutorials/latest/Overview.html
 """
-import random
-
+import numpy as np
 import omni.graph.core as og
 
-from .base.base_sampler import BaseLatencySampler, LatencySamplerInternalState
+from worvai.nodes.latency_nodes.latency_core import exponential_sample
+
+from .base.base_sampler import (
+	BaseLatencySampler,
+	LatencySamplerInternalState
+)
 
 
 class OgnExpDistInternalState(LatencySamplerInternalState):
@@ -29,69 +33,173 @@ class OgnExpDistInternalState(LatencySamplerInternalState):
 class OgnExpDistSampler(BaseLatencySampler):
 	"""Exponential Distribution Latency Sampler node"""
 
+	@staticmethod
+	def initialize(graph_context: og.GraphContext, node: og.Node):
+		"""Initialize any static resources or configurations"""
+		try:
+			# Base attributes
+			min_attr = node.get_attribute("inputs:min")
+			max_attr = node.get_attribute("inputs:max")
+			verbose_attr = node.get_attribute("inputs:verbose")
+
+			# Exponential distribution attributes
+			rate_attr = node.get_attribute("inputs:_rate")
+			shift_attr = node.get_attribute("inputs:_shift")
+
+			# === Set default values ===
+			min_attr.set(0.0)
+			max_attr.set(float('inf'))
+
+			# === Register callbacks for value changes ===
+			# This is mainly for ensuring non-negative values.
+			# A zero rate is rejected in compute().
+			for attr in (min_attr, max_attr, rate_attr, shift_attr):
+				attr.register_value_changed_callback(
+					OgnExpDistSampler.on_value_changed_callback
+				)
+
+			# This is for verbose mode.
+			# The callback function is defined in the BaseLatencySampler.
+			verbose_attr.register_value_changed_callback(
+				OgnExpDistSampler.on_value_changed_callback_verbose
+			)
+		except Exception as e:
+			prim_path = node.get_prim_path()
+			node_name = prim_path.split('/')[-1]
+			print(f"[{node_name}] Error in initialize: {e}")
+
+	@staticmethod
+	def on_value_changed_callback(attr: og.Attribute) -> None:
+		"""Callback for when input values change"""
+		try:
+			node = attr.get_node()
+			is_verbose = node.get_attribute("inputs:verbose").get()
+
+			value = attr.get()
+
+			# Early stop if value is already valid
+			if value >= 0:
+				return
+
+			# Clamp negative values to zero.
+			# This method is for clamping + logging.
+			clamped_value = OgnExpDistSampler.clamp_non_negative(
+				value=value,
+				name=attr.get_name(),
+				verbose=is_verbose
+			)
+			attr.set(clamped_value)
+		except Exception as e:
+			prim_path = attr.get_node().get_prim_path()
+			node_name = prim_path.split('/')[-1]
+			print(f"[{node_name}] Error in on_value_changed_callback: {e}")
+
 	@staticmethod
 	def internal_state() -> OgnExpDistInternalState:
 		"""Returns an object that contains per-node state information"""
 		return OgnExpDistInternalState()
 
+	@staticmethod
+	def draw_block(rng: np.random.Generator, size: int, rate: float, shift: float) -> np.ndarray:
+		"""Draw 'size' unclamped samples from shift + Exp(rate)"""
+		return exponential_sample(rng, size, rate, shift)
+
 	@staticmethod
 	def sample_distribution(**kwargs) -> float:
 		"""
-		Sample a value from exponential distribution.
+		Sample a value from (shifted) exponential distribution.
 		
 		The exponential distribution is useful for modeling waiting times
 		and is commonly used in network latency scenarios where most
 		delays are small but occasionally large delays occur.
+		The shift models a fixed minimum delay, e.g. the propagation delay.
 		
 		Args:
 			rate (float): Rate parameter (λ > 0), also called lambda
+			shift (float): Minimum latency added to every sample (default 0)
 			
 		Returns:
 			float: Sampled latency value from exponential distribution
 		"""
-		rate = kwargs.get('rate', 1.0)
-		
-		# Validate parameters
+		# === Get sampling parameters ===
+		if 'rate' not in kwargs:
+			raise ValueError("Missing parameter(s): rate")
+
+		rate = kwargs['rate']
+		shift = kwargs.get('shift', 0.0)
+
 		OgnExpDistSampler.validate_positive(rate, "rate")
-		
-		# Sample from exponential distribution
-		return random.expovariate(rate)
+
+		# === Get basic parameters ===
+		min = kwargs.get('min', 0.0)
+		max = kwargs.get('max', float('inf'))
+
+		is_verbose = kwargs.get('verbose', False)
+
+		# === Sample from exponential distribution ===
+		# One-off sample; compute() draws from the per-node block buffer
+		sample = float(OgnExpDistSampler.draw_block(
+			BaseLatencySampler._default_rng, 1, rate, shift
+		)[0])
+
+		return OgnExpDistSampler.clamp_min_max(
+			sample,
+			min_val=min,
+			max_val=max,
+			name="Exponential distribution sampled latency value",
+			verbose=is_verbose
+		)
 
 	@staticmethod
 	def compute(db) -> bool:
 		"""Compute the output based on inputs and internal state"""
-		# Check execution state
+		# === Check execution state ===
 		exec_in = db.inputs.execIn
 		if exec_in == og.ExecutionAttributeState.DISABLED:
 			return False
-			
-		# Get internal state
+
+		# === Get internal state for 'this' node ===
+		# The internal state is used for per-node.
 		state = db.per_instance_state
-		
+
 		try:
-			# Extract Exponential distribution parameters
-			rate = db.inputs.rate
-			
-			# Sample from exponential distribution
-			latency_value = OgnExpDistSampler.sample_distribution(rate=rate)
-			
-			# Ensure non-negative latency (should always be for exponential)
-			latency_value = max(0.0, latency_value)
-			
-			# Update internal statistics
+			# === Extract Exponential distribution parameters ===
+			rate = db.inputs._rate
+			shift = db.inputs._shift
+			min = db.inputs.min
+			max = db.inputs.max
+			verbose = db.inputs.verbose
+
+			OgnExpDistSampler.validate_positive(rate, "Rate")
+
+			# === Per-node random stream, keyed by seed and prim path ===
+			OgnExpDistSampler.seed_state(db, state)
+
+			# === Sample from exponential distribution ===
+			# Drawn in blocks, refilled when the parameters change
+			latency_value = OgnExpDistSampler.draw_sample(
+				state,
+				(rate, shift),
+				min,
+				max,
+				name="Exponential distribution sampled latency value",
+				verbose=verbose
+			)
+
+			# === Update internal statistics ===
 			state.update_statistics(latency_value)
-			
-			# Update state outputs if available
 			BaseLatencySampler._update_state_outputs(db, state, latency_value)
-			
-			# Write outputs
+
+			# === Write outputs ===
 			db.outputs.latencyOut = latency_value
 			db.outputs.execOut = og.ExecutionAttributeState.ENABLED
-			
+
 			return True
-			
+
 		except Exception as e:
 			# Log error and disable output
-			print(f"Error in exponential distribution sampler: {e}")
+			prim_path = db.abi_node.get_prim_path()
+			node_name = prim_path.split('/')[-1]
+			print(f"[{node_name}] Error in compute: {e}")
 			db.outputs.execOut = og.ExecutionAttributeState.DISABLED
 			return False
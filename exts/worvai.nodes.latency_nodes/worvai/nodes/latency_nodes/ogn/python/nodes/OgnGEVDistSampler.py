@@ -1,10 +1,9 @@
-import random
-import math
-
-import scipy.stats as stats
 import carb
+import numpy as np
 import omni.graph.core as og
 
+from worvai.nodes.latency_nodes.latency_core import truncated_gev_sample
+
 from .base.base_sampler import (
 	BaseLatencySampler,
 	LatencySamplerInternalState
@@ -117,6 +116,21 @@ class OgnGEVDistSampler(BaseLatencySampler):
 		"""Returns an object that contains per-node state information"""
 		return OgnGEVDistInternalState()
 
+	@staticmethod
+	def draw_block(
+		rng: np.random.Generator,
+		size: int,
+		location: float,
+		scale: float,
+		shape: float,
+		low: float = float('-inf'),
+		high: float = float('inf')
+	) -> np.ndarray:
+		"""Draw 'size' samples from GEV(location, scale, shape) truncated to [low, high]"""
+		# Closed-form inverse CDF in NumPy, no scipy needed.
+		# 'shape' keeps scipy.stats.genextreme's convention (c = -ξ)
+		return truncated_gev_sample(rng, size, location, scale, shape, low, high)
+
 	@staticmethod
 	def sample_distribution(**kwargs) -> float:
 		"""
@@ -129,7 +143,9 @@ class OgnGEVDistSampler(BaseLatencySampler):
 		Args:
 			location (float): Location parameter (μ)
 			scale (float): Scale parameter (σ > 0)
-			shape (float): Shape parameter (ξ)
+			shape (float): Shape parameter, as scipy's c (c = -ξ)
+			truncate (bool): Sample the distribution truncated to [min, max]
+				instead of clamping the sample (default False)
 			
 		Returns:
 			float: Sampled latency value from GEV distribution
@@ -149,14 +165,14 @@ class OgnGEVDistSampler(BaseLatencySampler):
 		max = kwargs.get('max', float('inf'))
 
 		is_verbose = kwargs.get('verbose', False)
+		bounds_mode = "truncate" if kwargs.get('truncate', False) else "clamp"
+		low, high = OgnGEVDistSampler.sampling_bounds(bounds_mode, min, max)
 
 		# === Sample from GEV distribution ===
-		# Used scipy.stats.genextreme to sample from GEV distribution
-		sample = stats.genextreme.rvs(
-			c=shape,
-			loc=location,
-			scale=scale
-		)
+		# One-off sample; compute() draws from the per-node block buffer
+		sample = float(OgnGEVDistSampler.draw_block(
+			BaseLatencySampler._default_rng, 1, location, scale, shape, low, high
+		)[0])
 
 		clamped_sample = OgnGEVDistSampler.clamp_min_max(
 			value=sample,
@@ -189,14 +205,21 @@ class OgnGEVDistSampler(BaseLatencySampler):
 			max = db.inputs.max
 			verbose = db.inputs.verbose
 
+			# === Truncate the distribution to [min, max], or clamp its samples ===
+			low, high = OgnGEVDistSampler.sampling_bounds(db.inputs.boundsMode, min, max)
+
+			# === Per-node random stream, keyed by seed and prim path ===
+			OgnGEVDistSampler.seed_state(db, state)
+
 			# === Sample from GEV distribution ===
-			latency_value = OgnGEVDistSampler.sample_distribution(
-				location=location,
-				scale=scale,
-				shape=shape,
-				min=min,
-				max=max,
-				verbose=verbose,
+			# Drawn in blocks, refilled when the parameters change
+			latency_value = OgnGEVDistSampler.draw_sample(
+				state,
+				(location, scale, shape, low, high),
+				min,
+				max,
+				name="GEV distribution sampled latency value",
+				verbose=verbose
 			)
 
 			# === Update internal statistics ===
@@ -11,47 +11,49 @@ Collection of OmniGraph code examples in Python:
 Collection of OmniGraph tutorials:
   https://docs.omniverse.nvidia.com/kit/docs/omni.graph.tutorials/latest/Overview.html
 """
-from collections import deque
-
 import carb
 import omni.graph.core as og
 from omni.graph.action_core import get_interface
 
+from worvai.nodes.latency_nodes.latency_core import (
+    LatencyQueue,
+    LatencyQueuePolicy,
+    shared_timing_wheel
+)
+
+
+# Values of the "inputs:emitMode" token
+EMIT_MODE_LOOP = "loop"
+EMIT_MODE_BATCH = "batch"
+
 
 class OgnLatencyControllerInternalState:
     """Convenience class for maintaining per-node state information"""
 
     def __init__(self):
         """Instantiate the per-node state information"""
-        # (Current time + latency, data)
-        self.latency_queue = deque()
+        # (Current time + latency, data) ordered by release time
+        self.latency_queue = LatencyQueue(policy=LatencyQueuePolicy.DROP)
         # State for outputting elements one by one
         self.current_ready_elements = []
         self.element_index = 0  # Current element being processed
 
-    def add_to_queue(self, current_time, latency, data):
-        """Add data to the latency queue with the current time + latency"""
-        delayed_time = current_time + latency
-
-        # If the queue is empty, append the new data
-        if not self.latency_queue:
-            self.latency_queue.append((delayed_time, data))
-            return
+    def set_queue_policy(self, policy):
+        """Set how the queue handles samples that arrive out of order"""
+        if policy and policy != self.latency_queue.policy:
+            self.latency_queue.policy = policy
 
-        # If the delayed time is smaller than the last item
-        # in the queue, skip it.
-        if self.latency_queue[-1][0] >= delayed_time:
-            return
+    def set_queue_budget(self, max_items, max_bytes, eviction, keep_every_nth):
+        """Bound the queue by item count and/or payload bytes (0 for unbounded)"""
+        self.latency_queue.set_budget(max_items, max_bytes, eviction, keep_every_nth)
 
-        # Otherwise, append the new data
-        self.latency_queue.append((delayed_time, data))
+    def add_to_queue(self, current_time, latency, data):
+        """Add data to the latency queue with the current time + latency"""
+        return self.latency_queue.push(current_time, latency, data)
 
     def get_ready_elements(self, current_time):
         """Get all elements that are ready to be output"""
-        ready_elements = []
-        while self.latency_queue and self.latency_queue[0][0] <= current_time:
-            ready_elements.append(self.latency_queue.popleft())
-        return ready_elements
+        return self.latency_queue.pop_ready(current_time)
 
     def start_element_processing(self, ready_elements):
         """Start processing a batch of ready elements"""
@@ -82,7 +84,13 @@ class OgnLatencyController:
         """
         Release the node, by resetting the internal state.
         """
-        pass
+        try:
+            from worvai.nodes.latency_nodes.ogn.OgnLatencyControllerDatabase import OgnLatencyControllerDatabase
+            state = OgnLatencyControllerDatabase.per_instance_state(node)
+            if state:
+                state.latency_queue.close()
+        except Exception as e:
+            carb.log_warn(f"Error releasing OgnLatencyController: {e}")
 
     @staticmethod
     def on_connected_callback(upstream_attr, downstream_attr):
@@ -116,6 +124,19 @@ class OgnLatencyController:
             # The element output should have the same type as the input (no array nesting)
             element_output_attr = downstream_node.get_attribute("outputs:element")
             element_output_attr.set_resolved_type(upstream_attr_type)
+
+            # The batch output is an array of the input type.
+            # Arrays of arrays are not supported, so array inputs leave it unresolved.
+            if upstream_attr_type.array_depth == 0:
+                elements_output_attr = downstream_node.get_attribute("outputs:elements")
+                elements_output_attr.set_resolved_type(
+                    og.Type(
+                        upstream_attr_type.base_type,
+                        upstream_attr_type.tuple_count,
+                        1,
+                        upstream_attr_type.role
+                    )
+                )
         except Exception as e:
             carb.log_error(
                 "[Latency Controller]",
@@ -145,6 +166,9 @@ class OgnLatencyController:
             # === Reset the type for element output of the LatencyController ===
             element_output_attr = downstream_node.get_attribute("outputs:element")
             element_output_attr.set_resolved_type(og.Type(og.BaseDataType.UNKNOWN))
+
+            elements_output_attr = downstream_node.get_attribute("outputs:elements")
+            elements_output_attr.set_resolved_type(og.Type(og.BaseDataType.UNKNOWN))
         except Exception as e:
             carb.log_error(
                 "[Latency Controller]",
@@ -157,6 +181,37 @@ class OgnLatencyController:
         """Returns an object that contains per-node state information"""
         return OgnLatencyControllerInternalState()
 
+    @staticmethod
+    def _write_queue_counters(db, state):
+        """Write the drop counters of the latency queue"""
+        db.outputs.droppedCount = state.latency_queue.dropped_count
+        db.outputs.evictedCount = state.latency_queue.evicted_count
+
+    @staticmethod
+    def _emit_batch(db, action_graph, ready_elements) -> bool:
+        """Write all ready elements as array outputs and fire execOut once
+
+        Nothing is written and execOut is not fired when no element is ready.
+        """
+        if not ready_elements:
+            return False
+
+        db.outputs.count = len(ready_elements)
+        db.outputs.elementTimestamps = [
+            delayed_time for delayed_time, _ in ready_elements
+        ]
+
+        # Array inputs leave elements unresolved (no arrays of arrays), so
+        # only count and elementTimestamps are written for them
+        elements_type = db.outputs.elements.type
+        if elements_type.base_type != og.BaseDataType.UNKNOWN:
+            db.outputs.elements = [
+                element_data for _, element_data in ready_elements
+            ]
+
+        action_graph.set_execution_enabled("outputs:execOut")
+        return True
+
     @staticmethod
     def compute(db) -> bool:
         """Compute the output based on inputs and internal state"""
@@ -173,11 +228,32 @@ class OgnLatencyController:
             data_in = db.inputs.dataIn
             timestamp_in = db.inputs.timestampIn
             latency = db.inputs.latency
+            state.set_queue_policy(db.inputs.queuePolicy)
+            # The shared timing wheel tells the queue when it has due elements
+            state.latency_queue.set_scheduler(
+                shared_timing_wheel() if db.inputs.useSharedScheduler else None
+            )
+            state.set_queue_budget(
+                db.inputs.maxItems,
+                db.inputs.maxBytes,
+                db.inputs.evictionPolicy,
+                db.inputs.keepEveryNth
+            )
+
+            # Batch mode: emit every ready element in this single compute
+            if db.inputs.emitMode == EMIT_MODE_BATCH:
+                if not action_graph.get_execution_enabled("inputs:execIn"):
+                    return False
+                state.add_to_queue(timestamp_in, latency, data_in.value)
+                ready_elements = state.get_ready_elements(timestamp_in)
+                OgnLatencyController._write_queue_counters(db, state)
+                return OgnLatencyController._emit_batch(db, action_graph, ready_elements)
 
             # If execIn is triggered, start a new processing cycle
             if action_graph.get_execution_enabled("inputs:execIn"):
                 # Add new data to the queue
                 state.add_to_queue(timestamp_in, latency, data_in.value)
+                OgnLatencyController._write_queue_counters(db, state)
 
                 # Get all ready elements and start processing them
                 ready_elements = state.get_ready_elements(timestamp_in)
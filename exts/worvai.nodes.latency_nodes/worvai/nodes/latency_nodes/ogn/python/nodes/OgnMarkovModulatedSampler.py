@@ -0,0 +1,202 @@
+import numpy as np
+import omni.graph.core as og
+
+from worvai.nodes.latency_nodes.latency_core import MarkovModulatedDistribution
+
+from .base.base_sampler import (
+	BaseLatencySampler,
+	LatencySamplerInternalState
+)
+
+
+class OgnMarkovModulatedInternalState(LatencySamplerInternalState):
+	"""Internal state for Markov-Modulated sampler"""
+
+	def __init__(self):
+		"""Instantiate the per-node state information"""
+		super().__init__()
+
+		# Inputs the current model was built with
+		self.model_key = None
+		self.model = None
+
+	def set_model(self, transition_matrix, families, locations, scales, shapes, initial_regime):
+		"""Build the regime model, once per parameter change
+
+		A new model restarts the chain in initial_regime.
+		A model that fails to build is not retried until a parameter changes.
+
+		Returns:
+			MarkovModulatedDistribution: the model, or None if it failed to build
+		"""
+		model_key = (
+			tuple(float(p) for p in transition_matrix),
+			tuple(str(family) for family in families),
+			tuple(float(location) for location in locations),
+			tuple(float(scale) for scale in scales),
+			tuple(float(shape) for shape in shapes),
+			initial_regime
+		)
+		if model_key == self.model_key:
+			return self.model
+
+		self.model_key = model_key
+		self.model = None
+
+		n = len(model_key[1])
+		if len(model_key[0]) != n * n:
+			raise ValueError(
+				f"Transition matrix needs {n * n} entries for {n} regimes, got {len(model_key[0])}"
+			)
+		self.model = MarkovModulatedDistribution(
+			np.reshape(model_key[0], (n, n)),
+			families=model_key[1],
+			locations=model_key[2],
+			scales=model_key[3],
+			shapes=model_key[4],
+			initial_regime=initial_regime
+		)
+		return self.model
+
+
+class OgnMarkovModulatedSampler(BaseLatencySampler):
+	"""Markov-Modulated (Gilbert-Elliott) Latency Sampler node"""
+
+	@staticmethod
+	def initialize(graph_context: og.GraphContext, node: og.Node):
+		"""Initialize any static resources or configurations"""
+		try:
+			# Base attributes
+			min_attr = node.get_attribute("inputs:min")
+			max_attr = node.get_attribute("inputs:max")
+			verbose_attr = node.get_attribute("inputs:verbose")
+
+			# === Set default values ===
+			min_attr.set(0.0)
+			max_attr.set(float('inf'))
+
+			# === Register callbacks for value changes ===
+			# This is mainly for ensuring non-negative values.
+			# The regime arrays are validated when the model is built.
+			for attr in (min_attr, max_attr):
+				attr.register_value_changed_callback(
+					OgnMarkovModulatedSampler.on_value_changed_callback
+				)
+
+			# This is for verbose mode.
+			# The callback function is defined in the BaseLatencySampler.
+			verbose_attr.register_value_changed_callback(
+				OgnMarkovModulatedSampler.on_value_changed_callback_verbose
+			)
+		except Exception as e:
+			prim_path = node.get_prim_path()
+			node_name = prim_path.split('/')[-1]
+			print(f"[{node_name}] Error in initialize: {e}")
+
+	@staticmethod
+	def on_value_changed_callback(attr: og.Attribute) -> None:
+		"""Callback for when input values change"""
+		try:
+			node = attr.get_node()
+			is_verbose = node.get_attribute("inputs:verbose").get()
+
+			value = attr.get()
+
+			# Early stop if value is already valid
+			if value >= 0:
+				return
+
+			# Clamp negative values to zero.
+			# This method is for clamping + logging.
+			clamped_value = OgnMarkovModulatedSampler.clamp_non_negative(
+				value=value,
+				name=attr.get_name(),
+				verbose=is_verbose
+			)
+			attr.set(clamped_value)
+		except Exception as e:
+			prim_path = attr.get_node().get_prim_path()
+			node_name = prim_path.split('/')[-1]
+			print(f"[{node_name}] Error in on_value_changed_callback: {e}")
+
+	@staticmethod
+	def internal_state() -> OgnMarkovModulatedInternalState:
+		"""Returns an object that contains per-node state information"""
+		return OgnMarkovModulatedInternalState()
+
+	@staticmethod
+	def draw_block(
+		rng: np.random.Generator,
+		size: int,
+		model: MarkovModulatedDistribution
+	) -> np.ndarray:
+		"""Draw 'size' samples, advancing the model's regime chain by 'size' steps"""
+		# Regime sequence from geometric run lengths, then one draw per regime
+		return model.sample(rng, size)
+
+	@staticmethod
+	def compute(db) -> bool:
+		"""Compute the output based on inputs and internal state"""
+		# === Check execution state ===
+		exec_in = db.inputs.execIn
+		if exec_in == og.ExecutionAttributeState.DISABLED:
+			return False
+
+		# === Get internal state for 'this' node ===
+		# The internal state is used for per-node.
+		state = db.per_instance_state
+
+		try:
+			# === Build the regime model (only when a parameter changes) ===
+			model = state.set_model(
+				db.inputs._transitionMatrix,
+				db.inputs._regimeDistributions,
+				db.inputs._regimeLocations,
+				db.inputs._regimeScales,
+				db.inputs._regimeShapes,
+				db.inputs.initialRegime
+			)
+			if model is None:
+				db.outputs.execOut = og.ExecutionAttributeState.DISABLED
+				return False
+
+			min = db.inputs.min
+			max = db.inputs.max
+			verbose = db.inputs.verbose
+
+			# === Per-node random stream, keyed by seed and prim path ===
+			OgnMarkovModulatedSampler.seed_state(db, state)
+
+			# === Sample from the model ===
+			# Drawn in blocks, refilled when the model or the range changes
+			latency_value = OgnMarkovModulatedSampler.draw_sample(
+				state,
+				(model,),
+				min,
+				max,
+				name="Markov-modulated sampled latency value",
+				verbose=verbose
+			)
+
+			# A block refilled before its end (new range or seed) continues
+			# the chain from the regime of this sample
+			model.continue_from(state.sample_block.last_index)
+
+			# === Update internal statistics ===
+			state.update_statistics(latency_value)
+			BaseLatencySampler._update_state_outputs(db, state, latency_value)
+
+			# === Write outputs ===
+			db.outputs.latencyOut = latency_value
+			db.outputs.regime = model.regime
+			db.outputs.execOut = og.ExecutionAttributeState.ENABLED
+
+			return True
+
+		except Exception as e:
+			# Log error and disable output
+			prim_path = db.abi_node.get_prim_path()
+			node_name = prim_path.split('/')[-1]
+			print(f"[{node_name}] Error in compute: {e}")
+			db.outputs.execOut = og.ExecutionAttributeState.DISABLED
+			return False
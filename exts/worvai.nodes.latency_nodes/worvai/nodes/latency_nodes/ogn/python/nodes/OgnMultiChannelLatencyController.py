@@ -0,0 +1,143 @@
+"""
+OmniGraph core Python API:
+  https://docs.omniverse.nvidia.com/kit/docs/omni.graph/latest/Overview.html
+
+OmniGraph bundles in Python:
+  https://docs.omniverse.nvidia.com/kit/docs/omni.graph.docs/latest/dev/ogn/ogn_code_samples_python.html
+
+Multi-Channel Latency Controller - Delays every attribute of a bundle with its own latency queue
+"""
+import carb
+import numpy as np
+import omni.graph.core as og
+
+from worvai.nodes.latency_nodes.latency_core import MultiChannelLatencyQueue, LatencyQueuePolicy
+
+
+class OgnMultiChannelLatencyControllerInternalState:
+    """Convenience class for maintaining per-node state information"""
+
+    def __init__(self):
+        """Instantiate the per-node state information"""
+        # channel id -> (Current time + latency, (attribute type, data))
+        self.latency_queues = MultiChannelLatencyQueue(policy=LatencyQueuePolicy.DROP)
+
+    def set_queue_policy(self, policy):
+        """Set how the queues handle samples that arrive out of order"""
+        if policy and policy != self.latency_queues.policy:
+            self.latency_queues.policy = policy
+
+    def add_to_queues(self, current_time, bundle, channel_ids, latencies):
+        """Queue the current value of every channel with its own latency"""
+        for channel_id, latency in zip(channel_ids, latencies):
+            attribute = bundle.attribute_by_name(channel_id)
+            if attribute is None:
+                continue
+
+            value = attribute.value
+            # Array values are views of the bundle memory, keep a copy
+            if isinstance(value, np.ndarray):
+                value = value.copy()
+
+            self.latency_queues.push(
+                channel_id, current_time, latency, (attribute.type, value)
+            )
+
+    def get_ready_elements(self, current_time):
+        """Get the ready elements of every channel"""
+        return self.latency_queues.pop_ready(current_time)
+
+
+class OgnMultiChannelLatencyController:
+    """The Ogn node class"""
+
+    @staticmethod
+    def internal_state():
+        """Returns an object that contains per-node state information"""
+        return OgnMultiChannelLatencyControllerInternalState()
+
+    @staticmethod
+    def _resolve_channels(bundle, channel_ids, latencies):
+        """Pair every channel with its latency
+
+        Returns:
+            tuple: (channel ids, latencies), or None if they cannot be paired
+        """
+        if len(channel_ids) == 0:
+            channel_ids = sorted(attribute.name for attribute in bundle.attributes)
+
+        latencies = [float(latency) for latency in latencies]
+        if len(latencies) == 1:
+            latencies = latencies * len(channel_ids)
+
+        if len(latencies) != len(channel_ids):
+            carb.log_error(
+                "[Multi-Channel Latency Controller] "
+                f"{len(latencies)} latencies given for {len(channel_ids)} channels"
+            )
+            return None
+
+        return list(channel_ids), latencies
+
+    @staticmethod
+    def _write_channel(bundle, channel_id, attribute_type, value):
+        """Write the released value of a channel to the output bundle"""
+        attribute = bundle.attribute_by_name(channel_id)
+        if attribute is None or attribute.type != attribute_type:
+            if attribute is not None:
+                bundle.remove(channel_id)
+            attribute = bundle.insert((attribute_type, channel_id))
+        attribute.value = value
+
+    @staticmethod
+    def compute(db) -> bool:
+        """Compute the output based on inputs and internal state"""
+        try:
+            state = db.per_instance_state
+
+            # === Check execution state ===
+            if db.inputs.execIn == og.ExecutionAttributeState.DISABLED:
+                return False
+
+            # === Get the inputs ===
+            timestamp_in = db.inputs.timestampIn
+            state.set_queue_policy(db.inputs.queuePolicy)
+
+            channels = OgnMultiChannelLatencyController._resolve_channels(
+                db.inputs.dataIn, db.inputs.channelIds, db.inputs.latencies
+            )
+            if channels is None:
+                db.outputs.execOut = og.ExecutionAttributeState.DISABLED
+                return False
+            channel_ids, latencies = channels
+
+            # === Queue every channel, then release all channels at once ===
+            state.add_to_queues(timestamp_in, db.inputs.dataIn, channel_ids, latencies)
+            ready = state.get_ready_elements(timestamp_in)
+
+            if not ready:
+                db.outputs.releasedChannels = []
+                db.outputs.releasedTimestamps = []
+                db.outputs.execOut = og.ExecutionAttributeState.DISABLED
+                return True
+
+            # The output bundle holds the latest released value of each channel
+            released_channels = []
+            released_timestamps = []
+            for channel_id, elements in ready.items():
+                delayed_time, (attribute_type, value) = elements[-1]
+                OgnMultiChannelLatencyController._write_channel(
+                    db.outputs.dataOut, channel_id, attribute_type, value
+                )
+                released_channels.append(channel_id)
+                released_timestamps.append(delayed_time)
+
+            db.outputs.releasedChannels = released_channels
+            db.outputs.releasedTimestamps = released_timestamps
+            db.outputs.execOut = og.ExecutionAttributeState.ENABLED
+
+            return True
+
+        except Exception as e:
+            carb.log_error(f"MultiChannelLatencyController compute error: {e}")
+            return False
@@ -1,8 +1,9 @@
-import random
-
 import carb
+import numpy as np
 import omni.graph.core as og
 
+from worvai.nodes.latency_nodes.latency_core import truncated_normal_sample
+
 from .base.base_sampler import (
 	BaseLatencySampler,
 	LatencySamplerInternalState
@@ -112,6 +113,20 @@ class OgnNormDistSampler(BaseLatencySampler):
 		"""Returns an object that contains per-node state information"""
 		return OgnNormDistInternalState()
 
+	@staticmethod
+	def draw_block(
+		rng: np.random.Generator,
+		size: int,
+		average: float,
+		std_dev: float,
+		low: float = float('-inf'),
+		high: float = float('inf')
+	) -> np.ndarray:
+		"""Draw 'size' samples from N(average, std_dev) truncated to [low, high]"""
+		# Inverse CDF over the quantile range of [low, high], no rejection loop.
+		# Unbounded, this is rng.normal
+		return truncated_normal_sample(rng, size, average, std_dev, low, high)
+
 	@staticmethod
 	def sample_distribution(**kwargs) -> float:
 		"""
@@ -120,6 +135,8 @@ class OgnNormDistSampler(BaseLatencySampler):
 		Args:
 			average (float): Mean of the distribution
 			std_dev (float): Standard deviation of the distribution
+			truncate (bool): Sample the distribution truncated to [min, max]
+				instead of clamping the sample (default False)
 			
 		Returns:
 			float: Sampled latency value from normal distribution
@@ -138,10 +155,14 @@ class OgnNormDistSampler(BaseLatencySampler):
 		max = kwargs.get('max', float('inf'))
 
 		is_verbose = kwargs.get('verbose', False)
+		bounds_mode = "truncate" if kwargs.get('truncate', False) else "clamp"
+		low, high = OgnNormDistSampler.sampling_bounds(bounds_mode, min, max)
 
 		# === Sample from normal distribution ===
-		# Used random.gauss to sample from normal distribution
-		sample = random.gauss(average, std_dev)
+		# One-off sample; compute() draws from the per-node block buffer
+		sample = float(OgnNormDistSampler.draw_block(
+			BaseLatencySampler._default_rng, 1, average, std_dev, low, high
+		)[0])
 
 		clamped_sample = OgnNormDistSampler.clamp_min_max(
 			sample,
@@ -173,12 +194,20 @@ class OgnNormDistSampler(BaseLatencySampler):
 			max = db.inputs.max
 			verbose = db.inputs.verbose
 
+			# === Truncate the distribution to [min, max], or clamp its samples ===
+			low, high = OgnNormDistSampler.sampling_bounds(db.inputs.boundsMode, min, max)
+
+			# === Per-node random stream, keyed by seed and prim path ===
+			OgnNormDistSampler.seed_state(db, state)
+
 			# === Sample from normal distribution ===
-			latency_value = OgnNormDistSampler.sample_distribution(
-				average=average, 
-				std_dev=std_dev,
-				min=min,
-				max=max,
+			# Drawn in blocks, refilled when the parameters change
+			latency_value = OgnNormDistSampler.draw_sample(
+				state,
+				(average, std_dev, low, high),
+				min,
+				max,
+				name="Normal distribution sampled latency value",
 				verbose=verbose
 			)
 			
@@ -0,0 +1,185 @@
+import numpy as np
+import omni.graph.core as og
+
+from worvai.nodes.latency_nodes.latency_core import AR1Process
+
+from .base.base_sampler import (
+	BaseLatencySampler,
+	LatencySamplerInternalState
+)
+
+
+class OgnOUProcessInternalState(LatencySamplerInternalState):
+	"""Internal state for Ornstein-Uhlenbeck sampler"""
+
+	def __init__(self):
+		"""Instantiate the per-node state information"""
+		super().__init__()
+
+		# Inputs the current process was built with
+		self.process_key = None
+		self.process = None
+		# Unclamped value of the last sample, where a new process continues from
+		self.last_value = None
+
+	def set_process(self, average, std_dev, correlation_time, time_step, min, max):
+		"""Build the process, once per parameter change
+
+		A new process discards the rest of the sample block, so it continues
+		from the last sample the node output instead of from the end of the
+		block; the latency path stays continuous when a parameter changes.
+		The range and the seed are part of the key for the same reason.
+
+		Returns:
+			AR1Process: the process
+		"""
+		process_key = (average, std_dev, correlation_time, time_step, min, max, self.seed_key)
+		if process_key == self.process_key:
+			return self.process
+
+		self.process = AR1Process.from_correlation_time(
+			average,
+			std_dev,
+			correlation_time,
+			time_step,
+			value=self.last_value
+		)
+		self.process_key = process_key
+		return self.process
+
+
+class OgnOUProcessSampler(BaseLatencySampler):
+	"""Ornstein-Uhlenbeck (AR(1)) Latency Sampler node"""
+
+	@staticmethod
+	def initialize(graph_context: og.GraphContext, node: og.Node):
+		"""Initialize any static resources or configurations"""
+		try:
+			# Base attributes
+			min_attr = node.get_attribute("inputs:min")
+			max_attr = node.get_attribute("inputs:max")
+			verbose_attr = node.get_attribute("inputs:verbose")
+
+			# Process attributes
+			std_dev_attr = node.get_attribute("inputs:_standardDeviation")
+			correlation_time_attr = node.get_attribute("inputs:_correlationTime")
+			time_step_attr = node.get_attribute("inputs:_timeStep")
+
+			# === Set default values ===
+			min_attr.set(0.0)
+			max_attr.set(float('inf'))
+
+			# === Register callbacks for value changes ===
+			# This is mainly for ensuring non-negative values.
+			# A zero time step is rejected in compute().
+			for attr in (min_attr, max_attr, std_dev_attr, correlation_time_attr, time_step_attr):
+				attr.register_value_changed_callback(
+					OgnOUProcessSampler.on_value_changed_callback
+				)
+
+			# This is for verbose mode.
+			# The callback function is defined in the BaseLatencySampler.
+			verbose_attr.register_value_changed_callback(
+				OgnOUProcessSampler.on_value_changed_callback_verbose
+			)
+		except Exception as e:
+			prim_path = node.get_prim_path()
+			node_name = prim_path.split('/')[-1]
+			print(f"[{node_name}] Error in initialize: {e}")
+
+	@staticmethod
+	def on_value_changed_callback(attr: og.Attribute) -> None:
+		"""Callback for when input values change"""
+		try:
+			node = attr.get_node()
+			is_verbose = node.get_attribute("inputs:verbose").get()
+
+			value = attr.get()
+
+			# Early stop if value is already valid
+			if value >= 0:
+				return
+
+			# Clamp negative values to zero.
+			# This method is for clamping + logging.
+			clamped_value = OgnOUProcessSampler.clamp_non_negative(
+				value=value,
+				name=attr.get_name(),
+				verbose=is_verbose
+			)
+			attr.set(clamped_value)
+		except Exception as e:
+			prim_path = attr.get_node().get_prim_path()
+			node_name = prim_path.split('/')[-1]
+			print(f"[{node_name}] Error in on_value_changed_callback: {e}")
+
+	@staticmethod
+	def internal_state() -> OgnOUProcessInternalState:
+		"""Returns an object that contains per-node state information"""
+		return OgnOUProcessInternalState()
+
+	@staticmethod
+	def draw_block(rng: np.random.Generator, size: int, process: AR1Process) -> np.ndarray:
+		"""Draw the next 'size' unclamped values of the process"""
+		# One vectorized recursion per block (see ar1_filter)
+		return process.sample(rng, size)
+
+	@staticmethod
+	def compute(db) -> bool:
+		"""Compute the output based on inputs and internal state"""
+		# === Check execution state ===
+		exec_in = db.inputs.execIn
+		if exec_in == og.ExecutionAttributeState.DISABLED:
+			return False
+
+		# === Get internal state for 'this' node ===
+		# The internal state is used for per-node.
+		state = db.per_instance_state
+
+		try:
+			# === Extract process parameters ===
+			average = db.inputs._average
+			std_dev = db.inputs._standardDeviation
+			correlation_time = db.inputs._correlationTime
+			time_step = db.inputs._timeStep
+			min = db.inputs.min
+			max = db.inputs.max
+			verbose = db.inputs.verbose
+
+			OgnOUProcessSampler.validate_positive(time_step, "Time step")
+
+			# === Per-node random stream, keyed by seed and prim path ===
+			OgnOUProcessSampler.seed_state(db, state)
+
+			# === Build the process (only when a parameter changes) ===
+			process = state.set_process(average, std_dev, correlation_time, time_step, min, max)
+
+			# === Sample the process ===
+			# Drawn in blocks, refilled when the process changes
+			latency_value = OgnOUProcessSampler.draw_sample(
+				state,
+				(process,),
+				min,
+				max,
+				name="Ornstein-Uhlenbeck sampled latency value",
+				verbose=verbose
+			)
+			state.last_value = state.sample_block.last_unclamped
+
+			# === Update internal statistics ===
+			state.update_statistics(latency_value)
+			BaseLatencySampler._update_state_outputs(db, state, latency_value)
+
+			# === Write outputs ===
+			db.outputs.latencyOut = latency_value
+			db.outputs.execOut = og.ExecutionAttributeState.ENABLED
+
+			return True
+
+		except Exception as e:
+			# Log error and disable output
+			prim_path = db.abi_node.get_prim_path()
+			node_name = prim_path.split('/')[-1]
+			print(f"[{node_name}] Error in compute: {e}")
+			db.outputs.execOut = og.ExecutionAttributeState.DISABLED
+			return False
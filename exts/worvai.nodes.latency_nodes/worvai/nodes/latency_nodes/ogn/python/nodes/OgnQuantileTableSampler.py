@@ -0,0 +1,193 @@
+import numpy as np
+import omni.graph.core as og
+
+from worvai.nodes.latency_nodes.latency_core import (
+	QuantileTable,
+	scipy_quantile_table
+)
+
+from .base.base_sampler import (
+	BaseLatencySampler,
+	LatencySamplerInternalState
+)
+
+
+class OgnQuantileTableInternalState(LatencySamplerInternalState):
+	"""Internal state for Quantile Table sampler"""
+
+	def __init__(self):
+		"""Instantiate the per-node state information"""
+		super().__init__()
+
+		# Arguments of scipy_quantile_table the current table was built with
+		self.table_key = None
+		self.table = None
+
+	def set_table(self, name, shapes, location, scale, size, tail_probability, tail):
+		"""Build the inverse-CDF table, once per parameter change
+
+		A table that fails to build is not retried until a parameter changes.
+
+		Returns:
+			QuantileTable: the table, or None if it failed to build
+		"""
+		shapes = tuple(float(shape) for shape in shapes)
+		table_key = (name, shapes, location, scale, size, tail_probability, tail)
+		if table_key == self.table_key:
+			return self.table
+
+		self.table_key = table_key
+		self.table = None
+		# The only place scipy runs; cached, so equal nodes share the table
+		self.table = scipy_quantile_table(
+			name,
+			shapes=shapes,
+			loc=location,
+			scale=scale,
+			size=size,
+			tail_probability=tail_probability,
+			tail=tail
+		)
+		return self.table
+
+
+class OgnQuantileTableSampler(BaseLatencySampler):
+	"""Quantile Table Latency Sampler node"""
+
+	@staticmethod
+	def initialize(graph_context: og.GraphContext, node: og.Node):
+		"""Initialize any static resources or configurations"""
+		try:
+			# Base attributes
+			min_attr = node.get_attribute("inputs:min")
+			max_attr = node.get_attribute("inputs:max")
+			verbose_attr = node.get_attribute("inputs:verbose")
+
+			# Distribution attributes
+			scale_attr = node.get_attribute("inputs:_scaleParameter")
+
+			# === Set default values ===
+			min_attr.set(0.0)
+			max_attr.set(float('inf'))
+
+			# === Register callbacks for value changes ===
+			# This is mainly for ensuring non-negative values.
+			# "location" and the shape parameters can be any real number.
+			for attr in (min_attr, max_attr, scale_attr):
+				attr.register_value_changed_callback(
+					OgnQuantileTableSampler.on_value_changed_callback
+				)
+
+			# This is for verbose mode.
+			# The callback function is defined in the BaseLatencySampler.
+			verbose_attr.register_value_changed_callback(
+				OgnQuantileTableSampler.on_value_changed_callback_verbose
+			)
+		except Exception as e:
+			prim_path = node.get_prim_path()
+			node_name = prim_path.split('/')[-1]
+			print(f"[{node_name}] Error in initialize: {e}")
+
+	@staticmethod
+	def on_value_changed_callback(attr: og.Attribute) -> None:
+		"""Callback for when input values change"""
+		try:
+			node = attr.get_node()
+			is_verbose = node.get_attribute("inputs:verbose").get()
+
+			value = attr.get()
+
+			# Early stop if value is already valid
+			if value >= 0:
+				return
+
+			# Clamp negative values to zero.
+			# This method is for clamping + logging.
+			clamped_value = OgnQuantileTableSampler.clamp_non_negative(
+				value=value,
+				name=attr.get_name(),
+				verbose=is_verbose
+			)
+			attr.set(clamped_value)
+		except Exception as e:
+			prim_path = attr.get_node().get_prim_path()
+			node_name = prim_path.split('/')[-1]
+			print(f"[{node_name}] Error in on_value_changed_callback: {e}")
+
+	@staticmethod
+	def internal_state() -> OgnQuantileTableInternalState:
+		"""Returns an object that contains per-node state information"""
+		return OgnQuantileTableInternalState()
+
+	@staticmethod
+	def draw_block(
+		rng: np.random.Generator,
+		size: int,
+		table: QuantileTable
+	) -> np.ndarray:
+		"""Draw 'size' samples by interpolating the inverse-CDF table"""
+		# np.interp over uniform draws, scipy never runs here
+		return table.sample(rng, size)
+
+	@staticmethod
+	def compute(db) -> bool:
+		"""Compute the output based on inputs and internal state"""
+		# === Check execution state ===
+		exec_in = db.inputs.execIn
+		if exec_in == og.ExecutionAttributeState.DISABLED:
+			return False
+
+		# === Get internal state for 'this' node ===
+		# The internal state is used for per-node.
+		state = db.per_instance_state
+
+		try:
+			# === Build the table (only when a parameter changes) ===
+			table = state.set_table(
+				db.inputs._distribution,
+				db.inputs._shapeParameters,
+				db.inputs._locationParameter,
+				db.inputs._scaleParameter,
+				db.inputs.tableSize,
+				db.inputs.tailProbability,
+				db.inputs.tailMode
+			)
+			if table is None:
+				db.outputs.execOut = og.ExecutionAttributeState.DISABLED
+				return False
+
+			min = db.inputs.min
+			max = db.inputs.max
+			verbose = db.inputs.verbose
+
+			# === Per-node random stream, keyed by seed and prim path ===
+			OgnQuantileTableSampler.seed_state(db, state)
+
+			# === Sample from the table ===
+			# Drawn in blocks, refilled when the table or the range changes
+			latency_value = OgnQuantileTableSampler.draw_sample(
+				state,
+				(table,),
+				min,
+				max,
+				name="Quantile table sampled latency value",
+				verbose=verbose
+			)
+
+			# === Update internal statistics ===
+			state.update_statistics(latency_value)
+			BaseLatencySampler._update_state_outputs(db, state, latency_value)
+
+			# === Write outputs ===
+			db.outputs.latencyOut = latency_value
+			db.outputs.execOut = og.ExecutionAttributeState.ENABLED
+
+			return True
+
+		except Exception as e:
+			# Log error and disable output
+			prim_path = db.abi_node.get_prim_path()
+			node_name = prim_path.split('/')[-1]
+			print(f"[{node_name}] Error in compute: {e}")
+			db.outputs.execOut = og.ExecutionAttributeState.DISABLED
+			return False
@@ -2,7 +2,6 @@
 ROS1 Camera Helper with Latency - A modified version of ROS1CameraHelper that includes built-in latency control
 """
 import traceback
-from collections import deque
 from copy import deepcopy
 
 import carb
@@ -15,6 +14,10 @@ from isaacsim.core.nodes import BaseWriterNode, WriterRequest
 from omni.kit.viewport.utility import get_viewport_from_window_name
 from pxr import Usd
 
+from worvai.nodes.latency_nodes.latency_core import LatencyQueue, LatencyQueuePolicy
+
+from .base.annotator_registry import annotator_name, shared_annotators
+
 
 class LatencyData:
     """Container for latency data"""
@@ -33,8 +36,9 @@ class OgnROS1CameraHelperWithLatencyInternalState(BaseWriterNode):
         self.publishStepSize = 1
         
         # Latency-specific attributes
-        self.latency_queue = deque()
-        self.annotator = None
+        self.latency_queue = LatencyQueue(policy=LatencyQueuePolicy.DROP)
+        # (render product path, annotator name) acquired from the shared registry
+        self.annotator_key = None
         self.current_render_product_path = ""
         self.current_sensor_type = ""
         self.latency_initialized = False
@@ -44,24 +48,19 @@ class OgnROS1CameraHelperWithLatencyInternalState(BaseWriterNode):
     def initialize_latency_annotator(self, render_product_path: str, sensor_type: str):
         """Initialize the annotator for latency data capture"""
         try:
-            if sensor_type == "rgb":
-                self.annotator = rep.AnnotatorRegistry.get_annotator("LdrColor")
-            elif sensor_type == "depth":
-                self.annotator = rep.AnnotatorRegistry.get_annotator("DistanceToImagePlane")
-            elif sensor_type == "depth_pcl":
-                self.annotator = rep.AnnotatorRegistry.get_annotator("DistanceToImagePlane")
-            elif sensor_type == "normals":
-                self.annotator = rep.AnnotatorRegistry.get_annotator("Normals")
-            elif sensor_type == "semantic_segmentation":
-                self.annotator = rep.AnnotatorRegistry.get_annotator("SemanticSegmentation")
-            elif sensor_type == "instance_segmentation":
-                self.annotator = rep.AnnotatorRegistry.get_annotator("InstanceSegmentation")
-            else:
+            # Initialized again after a reset: give back the annotator acquired before
+            if self.annotator_key:
+                shared_annotators().release(*self.annotator_key)
+                self.annotator_key = None
+
+            name = annotator_name(sensor_type)
+            if name is None:
                 carb.log_warn(f"Latency capture not supported for sensor type: {sensor_type}")
                 return False
 
-            # Attach the annotator to the render product
-            self.annotator.attach([render_product_path])
+            # Attach the annotator to the render product, or share the one
+            # another camera node already attached
+            self.annotator_key = shared_annotators().acquire(render_product_path, name)
             self.current_render_product_path = render_product_path
             self.current_sensor_type = sensor_type
             self.latency_initialized = True
@@ -73,11 +72,12 @@ class OgnROS1CameraHelperWithLatencyInternalState(BaseWriterNode):
 
     def capture_current_data(self, timestamp):
         """Capture the current rendered data for latency processing"""
-        if not self.latency_initialized or not self.annotator:
+        if not self.latency_initialized or not self.annotator_key:
             return None
 
         try:
-            data = self.annotator.get_data()
+            # Read back once per frame, whichever camera node asks first
+            data = shared_annotators().get_data(*self.annotator_key)
             if data is None:
                 return None
 
@@ -100,36 +100,22 @@ class OgnROS1CameraHelperWithLatencyInternalState(BaseWriterNode):
         if latency_data is None:
             return False
 
-        delayed_time = current_time + latency
-
-        # If the queue is empty, append the new data
-        if not self.latency_queue:
-            self.latency_queue.append((delayed_time, latency_data))
-            return True
-        
-        # If the delayed time is smaller than the last item, skip it
-        if self.latency_queue[-1][0] >= delayed_time:
-            return True
-
-        # Otherwise, append the new data
-        self.latency_queue.append((delayed_time, latency_data))
+        # Data released no later than the last queued data is dropped
+        self.latency_queue.push(current_time, latency, latency_data)
         return True
 
     def get_from_latency_queue(self, current_time):
         """Get data from latency queue that should be released"""
-        results = []
-        while self.latency_queue and self.latency_queue[0][0] <= current_time:
-            results.append(self.latency_queue.popleft())
-        return results
+        return self.latency_queue.pop_ready(current_time)
 
     def cleanup_latency(self):
         """Clean up latency-related resources"""
-        if self.annotator:
+        if self.annotator_key:
             try:
-                self.annotator.detach()
-            except:
-                pass
-            self.annotator = None
+                shared_annotators().release(*self.annotator_key)
+            except Exception as e:
+                carb.log_warn(f"Error releasing the ROS1 Camera Helper annotator: {e}")
+            self.annotator_key = None
         self.latency_initialized = False
         self.latency_queue.clear()
 
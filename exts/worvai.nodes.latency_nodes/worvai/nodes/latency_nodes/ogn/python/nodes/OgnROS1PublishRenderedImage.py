@@ -15,6 +15,41 @@ except ImportError:
     carb.log_warn("ROS1 not available. ROS1 Publish Rendered Image will not function.")
 
 
+def encoding_dtype(encoding: str):
+    """(numpy dtype, bytes per value) of an image encoding"""
+    if encoding in ["rgb8", "bgr8", "rgba8", "mono8"]:
+        return np.uint8, 1
+    elif encoding in ["32FC1", "32FC3", "32FC4"]:
+        return np.float32, 4
+    elif encoding in ["32SC1", "32SC3", "32SC4"]:
+        return np.int32, 4
+    elif encoding in ["32UC1", "32UC3", "32UC4"]:
+        return np.uint32, 4
+    elif encoding in ["16UC1", "16UC2", "16UC3", "16UC4"]:
+        return np.uint16, 2
+    elif encoding in ["16SC1", "16SC3", "16SC4"]:
+        return np.int16, 2
+    elif encoding in ["16FC1", "16FC3", "16FC4"]:
+        # Half float, not a standard ROS encoding
+        return np.float16, 2
+    else:
+        # Default to uint8
+        return np.uint8, 1
+
+
+def image_values(image_data, dtype, bytes_per_pixel: int, size: int) -> np.ndarray:
+    """Flat array of the image values from the image data input
+
+    The image data holds either one element per value, or the bytes of the
+    values (e.g. depth encoded by the camera nodes), reinterpreted without
+    a copy.
+    """
+    image_data = np.asarray(image_data)
+    if bytes_per_pixel > 1 and image_data.dtype == np.uint8 and image_data.size == size * bytes_per_pixel:
+        return np.frombuffer(np.ascontiguousarray(image_data), dtype=dtype)
+    return np.asarray(image_data, dtype=dtype)
+
+
 class OgnROS1PublishRenderedImageInternalState:
     """Convenience class for maintaining per-node state information"""
 
@@ -79,34 +114,14 @@ class OgnROS1PublishRenderedImageInternalState:
 
         try:
             # Determine the appropriate numpy dtype based on encoding
-            if encoding in ["rgb8", "bgr8", "rgba8", "mono8"]:
-                dtype = np.uint8
-                bytes_per_pixel = 1
-            elif encoding in ["32FC1", "32FC3", "32FC4"]:
-                dtype = np.float32
-                bytes_per_pixel = 4
-            elif encoding in ["32SC1", "32SC3", "32SC4"]:
-                dtype = np.int32
-                bytes_per_pixel = 4
-            elif encoding in ["32UC1", "32UC3", "32UC4"]:
-                dtype = np.uint32
-                bytes_per_pixel = 4
-            elif encoding in ["16UC1", "16UC3", "16UC4"]:
-                dtype = np.uint16
-                bytes_per_pixel = 2
-            elif encoding in ["16SC1", "16SC3", "16SC4"]:
-                dtype = np.int16
-                bytes_per_pixel = 2
-            else:
-                # Default to uint8
-                dtype = np.uint8
-                bytes_per_pixel = 1
+            dtype, bytes_per_pixel = encoding_dtype(encoding)
 
             # Reshape the flattened image data
+            values = image_values(image_data, dtype, bytes_per_pixel, width * height * channels)
             if channels == 1:
-                image_array = np.array(image_data, dtype=dtype).reshape((height, width))
+                image_array = values.reshape((height, width))
             else:
-                image_array = np.array(image_data, dtype=dtype).reshape((height, width, channels))
+                image_array = values.reshape((height, width, channels))
 
             # Create ROS Image message
             ros_image = Image()
@@ -145,7 +160,7 @@ class OgnROS1PublishRenderedImageInternalState:
             elif encoding == "rgba8" and channels == 4:
                 ros_image.data = image_array.tobytes()
                 ros_image.step = width * 4 * bytes_per_pixel
-            elif encoding in ["32FC1", "32SC1", "32UC1", "16UC1", "16SC1"] and channels == 1:
+            elif encoding in ["32FC1", "32SC1", "32UC1", "16UC1", "16SC1", "16FC1"] and channels == 1:
                 # Single channel non-8-bit data
                 ros_image.data = image_array.tobytes()
                 ros_image.step = width * bytes_per_pixel
@@ -228,9 +243,11 @@ class OgnROS1PublishRenderedImage:
             db.outputs.execOut = og.ExecutionAttributeState.DISABLED
             return False
 
-        # Check if image data size matches expected size
+        # Check if image data size matches expected size, one element or
+        # the bytes of each value
         expected_size = width * height * channels
-        if len(image_data) != expected_size:
+        _, bytes_per_pixel = encoding_dtype(encoding)
+        if len(image_data) not in (expected_size, expected_size * bytes_per_pixel):
             carb.log_warn(f"Image data size mismatch. Expected: {expected_size}, Got: {len(image_data)}")
             db.outputs.execOut = og.ExecutionAttributeState.DISABLED
             return False
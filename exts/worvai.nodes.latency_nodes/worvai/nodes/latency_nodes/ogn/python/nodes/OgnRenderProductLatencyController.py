@@ -2,23 +2,50 @@
 Render Product Latency Controller - Applies latency to render product data with actual image capture
 """
 from copy import deepcopy
-from collections import deque
 import carb
 import numpy as np
 import omni
 import omni.graph.core as og
-import omni.replicator.core as rep
+
+from worvai.nodes.latency_nodes.latency_core import (
+    CaptureAction,
+    DepthEncoder,
+    DepthEncoding,
+    FramePool,
+    LatencyQueue,
+    LatencyQueuePolicy,
+    NormalEncoder,
+    NormalEncoding,
+    SegmentationEncoder,
+    SegmentationEncoding,
+    plan_capture,
+    shared_timing_wheel
+)
+
+from .base.annotator_registry import annotator_name, shared_annotators
+
+# Most frames kept in the pool when the queue has no budget, about one
+# second of frames at 60 Hz; frames past it are allocated per capture
+MAX_POOLED_FRAMES = 64
 
 
 class RenderProductData:
     """Container for render product data with timestamp"""
-    def __init__(self, render_product_path, image_data, width, height, channels, timestamp):
+    def __init__(self, render_product_path, image_data, width, height, channels, timestamp, encoding=""):
         self.render_product_path = render_product_path
         self.image_data = image_data
         self.width = width
         self.height = height
         self.channels = channels
         self.timestamp = timestamp
+        self.encoding = encoding
+
+
+def uint8_encoding(data_type: str, channels: int) -> str:
+    """Image encoding of a frame captured as uint8"""
+    if data_type == "rgb" and channels in (3, 4):
+        return "rgb8" if channels == 3 else "rgba8"
+    return "mono8" if channels == 1 else f"8UC{channels}"
 
 
 class OgnRenderProductLatencyControllerInternalState:
@@ -27,31 +54,38 @@ class OgnRenderProductLatencyControllerInternalState:
     def __init__(self):
         """Instantiate the per-node state information"""
         # (Current time + latency, RenderProductData)
-        self.latency_queue = deque()
-        self.annotator = None
+        self.latency_queue = LatencyQueue(
+            policy=LatencyQueuePolicy.DROP,
+            on_evict=self.release_frame
+        )
+        # Preallocated frames for the queued image data, sized on first capture
+        self.frame_pool = None
+        # Encodings of depth, normals and segmentation, configured from the inputs
+        self.depth_encoder = DepthEncoder(DepthEncoding.FLOAT32)
+        self.normal_encoder = NormalEncoder(NormalEncoding.FLOAT32)
+        # Keeps its ID table between frames, so queued frames stay valid
+        self.segmentation_encoder = SegmentationEncoder(SegmentationEncoding.INT32)
+        # (render product path, annotator name) acquired from the shared registry
+        self.annotator_key = None
         self.current_render_product_path = ""
         self.current_data_type = ""
         self.initialized = False
+        # Timestamp of the previous compute, for the tick period of coalescing
+        self.last_timestamp = None
+        # Captures that replaced a superseded queued frame
+        self.coalesced_count = 0
 
     def initialize_annotator(self, render_product_path: str, data_type: str):
         """Initialize the annotator for the given render product and data type"""
         try:
-            if data_type == "rgb":
-                self.annotator = rep.AnnotatorRegistry.get_annotator("LdrColor")
-            elif data_type == "depth":
-                self.annotator = rep.AnnotatorRegistry.get_annotator("DistanceToImagePlane")
-            elif data_type == "normals":
-                self.annotator = rep.AnnotatorRegistry.get_annotator("Normals")
-            elif data_type == "semantic_segmentation":
-                self.annotator = rep.AnnotatorRegistry.get_annotator("SemanticSegmentation")
-            elif data_type == "instance_segmentation":
-                self.annotator = rep.AnnotatorRegistry.get_annotator("InstanceSegmentation")
-            else:
+            name = annotator_name(data_type)
+            if name is None:
                 carb.log_error(f"Unsupported data type: {data_type}")
                 return False
 
-            # Attach the annotator to the render product
-            self.annotator.attach([render_product_path])
+            # Attach the annotator to the render product, or share the one
+            # another camera node already attached
+            self.annotator_key = shared_annotators().acquire(render_product_path, name)
             self.current_render_product_path = render_product_path
             self.current_data_type = data_type
             self.initialized = True
@@ -63,50 +97,114 @@ class OgnRenderProductLatencyControllerInternalState:
 
     def capture_current_data(self, render_product_path: str):
         """Capture the current rendered data"""
-        if not self.initialized or not self.annotator:
+        if not self.initialized or not self.annotator_key:
             return None
 
         try:
-            data = self.annotator.get_data()
+            # Read back once per frame, whichever camera node asks first
+            data = shared_annotators().get_data(*self.annotator_key)
             if data is None:
                 return None
 
-            # Convert to numpy array if needed
-            if not isinstance(data, np.ndarray):
-                data = np.array(data)
+            # Segmentation annotators return their ID -> label info along with the IDs
+            if isinstance(data, dict):
+                data = data["data"]
+
+            # Convert to numpy array if needed (no copy for numpy data)
+            data = np.asarray(data)
 
             height, width = data.shape[:2]
             channels = data.shape[2] if len(data.shape) > 2 else 1
 
+            encoder = self.payload_encoder()
+            if encoder is not None:
+                # Encode depth, normals or segmentation straight into a free
+                # slab of the pool, viewed as the encoding's dtype
+                shape = encoder.frame_shape(data)
+                frame = self.acquire_frame(encoder.nbytes(data))
+                encoder.encode(data, frame.view(encoder.dtype).reshape(shape))
+                return RenderProductData(
+                    render_product_path=render_product_path,
+                    image_data=frame,
+                    width=width,
+                    height=height,
+                    channels=shape[2] if len(shape) > 2 else 1,
+                    timestamp=0,  # Will be set by caller
+                    encoding=encoder.image_encoding
+                )
+
+            # Write the frame into a free slab of the pool
+            frame = self.acquire_frame(data.size)
+            frame_view = frame.reshape(data.shape)
+
             # Convert to uint8 if needed
-            if data.dtype != np.uint8:
-                if self.current_data_type == "depth":
-                    # Normalize depth data to 0-255 range
-                    data = ((data - data.min()) / (data.max() - data.min()) * 255).astype(np.uint8)
-                elif data.dtype == np.float32 or data.dtype == np.float64:
-                    # Assume normalized float data (0-1 range)
-                    data = (data * 255).astype(np.uint8)
-                else:
-                    data = data.astype(np.uint8)
-
-            # Flatten the data
-            flattened_data = data.flatten()
-            
+            if data.dtype == np.uint8:
+                np.copyto(frame_view, data)
+            elif data.dtype == np.float32 or data.dtype == np.float64:
+                # Assume normalized float data (0-1 range)
+                np.multiply(data, 255, out=frame_view, casting='unsafe')
+            else:
+                np.copyto(frame_view, data, casting='unsafe')
+
             return RenderProductData(
                 render_product_path=render_product_path,
-                image_data=flattened_data,
+                image_data=frame,
                 width=width,
                 height=height,
                 channels=channels,
-                timestamp=0  # Will be set by caller
+                timestamp=0,  # Will be set by caller
+                encoding=uint8_encoding(self.current_data_type, channels)
             )
 
         except Exception as e:
             carb.log_error(f"Failed to capture data: {e}")
             return None
 
-    def add_to_queue(self, current_time, latency, render_product_path, data_type):
-        """Add data to the latency queue with the current time + latency"""
+    def payload_encoder(self):
+        """Encoder of the data type, None if frames are captured as uint8"""
+        if self.current_data_type == "depth":
+            return self.depth_encoder
+        if self.current_data_type == "normals":
+            return self.normal_encoder
+        if self.current_data_type in ["semantic_segmentation", "instance_segmentation"]:
+            return self.segmentation_encoder
+        return None
+
+    def acquire_frame(self, size: int) -> np.ndarray:
+        """Get a free flat uint8 frame of the given size in bytes from the pool"""
+        if self.frame_pool is None or not self.frame_pool.matches((size,), np.uint8):
+            # (Re)build the pool when the resolution, channel count or
+            # encoding changes
+            self.frame_pool = FramePool((size,), np.uint8)
+        self.frame_pool.max_capacity = self.max_pooled_frames(size)
+        return self.frame_pool.acquire()
+
+    def max_pooled_frames(self, size: int) -> int:
+        """Most frames the pool keeps, from the queue budget
+
+        The frames the budget lets the queue hold plus the one being
+        captured, or MAX_POOLED_FRAMES without a budget.
+        """
+        queue = self.latency_queue
+        limits = []
+        if queue.max_items:
+            limits.append(queue.max_items + 1)
+        if queue.max_bytes:
+            limits.append(queue.max_bytes // size + 1)
+        return min(limits) if limits else MAX_POOLED_FRAMES
+
+    def release_frame(self, render_data):
+        """Return the frame of released or dropped data to the pool"""
+        if self.frame_pool is not None and render_data is not None:
+            self.frame_pool.release(render_data.image_data)
+
+    def add_to_queue(self, current_time, latency, render_product_path, data_type, coalesce=False):
+        """Add data to the latency queue with the current time + latency
+
+        With coalesce, the frame is only read back if it can be emitted:
+        a frame the queue would drop is not captured, and a frame released
+        on the same tick as the last queued one replaces it.
+        """
         # Check if we need to reinitialize annotator
         if (not self.initialized or 
             self.current_render_product_path != render_product_path or 
@@ -116,43 +214,61 @@ class OgnRenderProductLatencyControllerInternalState:
             if not self.initialize_annotator(render_product_path, data_type):
                 return False
 
+        tick_period = current_time - self.last_timestamp if self.last_timestamp is not None else 0.0
+        self.last_timestamp = current_time
+
+        action = CaptureAction.PUSH
+        if coalesce:
+            action = plan_capture(self.latency_queue, current_time, latency, tick_period)
+            if action == CaptureAction.SKIP:
+                # Counted as dropped by the queue, no readback
+                return True
+
         # Capture current data
         render_data = self.capture_current_data(render_product_path)
         if render_data is None:
             return False
 
         render_data.timestamp = current_time
-        delayed_time = current_time + latency
 
-        # If the queue is empty, append the new data
-        if not self.latency_queue:
-            self.latency_queue.append((delayed_time, render_data))
-            return True
-        
-        # If the delayed time is smaller than the last item
-        # in the queue, skip it.
-        if self.latency_queue[-1][0] >= delayed_time:
+        if action == CaptureAction.REPLACE:
+            # The last queued frame would be released on the same tick and
+            # never emitted; its slab goes back to the pool
+            replaced = self.latency_queue.replace_last(
+                current_time, latency, render_data,
+                nbytes=render_data.image_data.nbytes
+            )
+            self.release_frame(replaced)
+            self.coalesced_count += 1
             return True
 
-        # Otherwise, append the new data
-        self.latency_queue.append((delayed_time, render_data))
+        # Data released no later than the last queued data is dropped,
+        # and the queue evicts data once it exceeds its budget
+        if not self.latency_queue.push(
+            current_time, latency, render_data,
+            nbytes=render_data.image_data.nbytes
+        ):
+            self.release_frame(render_data)
         return True
     
     def get_from_queue(self, current_time):
         """Get data from queue that should be released at current time"""
-        while self.latency_queue and self.latency_queue[0][0] <= current_time:
-            # Pop the first item from the queue and return it
-            yield self.latency_queue.popleft()
+        return self.latency_queue.pop_ready(current_time)
 
     def cleanup(self):
-        """Clean up the annotator"""
-        if self.annotator:
+        """Release the annotator, detached once no camera node uses it"""
+        if self.annotator_key:
             try:
-                self.annotator.detach()
-            except:
-                pass
-            self.annotator = None
+                shared_annotators().release(*self.annotator_key)
+            except Exception as e:
+                carb.log_warn(f"Error releasing the Render Product Latency Controller annotator: {e}")
+            self.annotator_key = None
         self.initialized = False
+        # Queued frames belong to the previous render product / data type
+        # and were encoded against the ID table reset below
+        self.latency_queue.clear()
+        self.frame_pool = None
+        self.segmentation_encoder.reset()
 
 
 class OgnRenderProductLatencyController:
@@ -178,10 +294,37 @@ class OgnRenderProductLatencyController:
         if exec_in == og.ExecutionAttributeState.DISABLED:
             return False
 
+        # The shared timing wheel tells the queue when it has due elements
+        state.latency_queue.set_scheduler(
+            shared_timing_wheel() if db.inputs.useSharedScheduler else None
+        )
+        try:
+            state.latency_queue.set_budget(
+                db.inputs.maxItems,
+                db.inputs.maxBytes,
+                db.inputs.evictionPolicy,
+                db.inputs.keepEveryNth
+            )
+            state.depth_encoder.configure(
+                db.inputs.depthEncoding,
+                db.inputs.depthMin,
+                db.inputs.depthMax
+            )
+            state.normal_encoder.configure(db.inputs.normalEncoding)
+            state.segmentation_encoder.configure(db.inputs.segmentationEncoding)
+        except ValueError as e:
+            carb.log_error(f"Invalid latency controller settings: {e}")
+            db.outputs.execOut = og.ExecutionAttributeState.DISABLED
+            return False
+
         # Add current data to queue
-        if not state.add_to_queue(timestamp_in, latency, render_product_path, data_type):
+        if not state.add_to_queue(timestamp_in, latency, render_product_path, data_type, db.inputs.coalesce):
             db.outputs.execOut = og.ExecutionAttributeState.DISABLED
             return False
+
+        db.outputs.droppedCount = state.latency_queue.dropped_count
+        db.outputs.evictedCount = state.latency_queue.evicted_count
+        db.outputs.coalescedCount = state.coalesced_count
         
         # Get data that should be released now
         results = list(state.get_from_queue(timestamp_in))
@@ -199,9 +342,17 @@ class OgnRenderProductLatencyController:
         db.outputs.width = render_data.width
         db.outputs.height = render_data.height
         db.outputs.channels = render_data.channels
+        db.outputs.encoding = render_data.encoding
+        if state.payload_encoder() is state.segmentation_encoder:
+            # Only ever extended, so it also decodes frames queued earlier
+            db.outputs.segmentationIds = state.segmentation_encoder.ids
         db.outputs.timestampOut = [delayed_time]  # Array output
         db.outputs.execOut = og.ExecutionAttributeState.ENABLED
 
+        # The outputs hold their own copy, so every released frame can be reused
+        for _, released_data in results:
+            state.release_frame(released_data)
+
         return True
 
     @staticmethod
@@ -213,5 +364,6 @@ class OgnRenderProductLatencyController:
             state = OgnRenderProductLatencyControllerDatabase.per_instance_state(node)
             if state:
                 state.cleanup()
-        except:
-            pass
+                state.latency_queue.close()
+        except Exception as e:
+            carb.log_warn(f"Error releasing OgnRenderProductLatencyController: {e}")
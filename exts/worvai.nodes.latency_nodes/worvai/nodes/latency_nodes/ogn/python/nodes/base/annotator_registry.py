@@ -0,0 +1,50 @@
+"""
+Process-wide annotator registry shared by the camera nodes.
+
+Camera Data Capture, Render Product Latency Controller and ROS1 Camera
+Helper with Latency acquire their annotators here instead of attaching
+their own, so a render product read by several of them is read back once
+per frame (see latency_core.AnnotatorCache).
+"""
+from typing import Optional
+
+import omni.kit.app
+import omni.replicator.core as rep
+
+from worvai.nodes.latency_nodes.latency_core import AnnotatorCache
+
+# Data type of the camera nodes -> replicator annotator name
+ANNOTATOR_NAMES = {
+    "rgb": "LdrColor",
+    "depth": "DistanceToImagePlane",
+    "depth_pcl": "DistanceToImagePlane",
+    "normals": "Normals",
+    "semantic_segmentation": "SemanticSegmentation",
+    "instance_segmentation": "InstanceSegmentation",
+}
+
+_shared_annotators = None
+
+
+def annotator_name(data_type: str) -> Optional[str]:
+    """Annotator name for a camera node data type, None if it is not supported"""
+    return ANNOTATOR_NAMES.get(data_type)
+
+
+def _create_annotator(render_product_path: str, name: str):
+    annotator = rep.AnnotatorRegistry.get_annotator(name)
+    annotator.attach([render_product_path])
+    return annotator
+
+
+def _update_number() -> int:
+    # Every node computed within one application update sees the same frame
+    return omni.kit.app.get_app().get_update_number()
+
+
+def shared_annotators() -> AnnotatorCache:
+    """The process-wide annotator cache all camera nodes acquire their annotators from"""
+    global _shared_annotators
+    if _shared_annotators is None:
+        _shared_annotators = AnnotatorCache(_create_annotator, _update_number)
+    return _shared_annotators
@@ -1,8 +1,27 @@
+import math
 from abc import ABC, abstractmethod
-from typing import Any, Dict, Optional
+from typing import Any, Dict, Optional, Tuple
 
 import carb
+import carb.settings
+import numpy as np
 import omni.graph.core as og
+import omni.usd
+
+from worvai.nodes.latency_nodes.latency_core import (
+    EventCounter,
+    RingBuffer,
+    SampleBlock,
+    StreamingStatistics,
+    UpdateThrottle,
+    node_rng
+)
+
+# Minimum seconds between two clamp summaries of a node
+CLAMP_LOG_INTERVAL = 5.0
+
+# carb log levels at which warnings are printed
+_WARN_LOG_LEVELS = ("verbose", "info", "warn", "warning")
 
 
 class LatencySamplerInternalState:
@@ -10,40 +29,79 @@ class LatencySamplerInternalState:
     
     def __init__(self):
         """Initialize per-node state information"""
-        self.sample_count = 0
+        # Count, min / max, mean / variance, EWMA, p50 / p95 / p99 and
+        # a ring buffer of the last 1000 samples, all O(1) per sample
+        self.statistics = StreamingStatistics(history_size=1000)
+
+        # Samples are drawn in blocks, see BaseLatencySampler.draw_sample
+        self.sample_block = SampleBlock()
+        # (seed, prim path) the sample block's generator was seeded with
+        self.seed_key = None
+
+        # When the statistics state attributes are written, see stats_due
+        self.stats_throttle = UpdateThrottle()
+        # (statsUpdateInterval, statsUpdatePeriod) the throttle is set to
+        self.stats_settings = (1, 0.0)
+
+        # Clamped samples, logged as one summary per CLAMP_LOG_INTERVAL
+        self.clamp_counter = EventCounter(CLAMP_LOG_INTERVAL)
+        # Node name used in the log messages, from the prim path
+        self.node_name = ""
 
-        self.min_latency = float('inf')
-        self.max_latency = float('-inf')
+    @property
+    def sample_count(self) -> int:
+        return self.statistics.count
 
-        self.history = []
-        self.history_size = 1000
+    @property
+    def min_latency(self) -> float:
+        return self.statistics.min
+
+    @property
+    def max_latency(self) -> float:
+        return self.statistics.max
+
+    @property
+    def history(self) -> RingBuffer:
+        return self.statistics.history
+
+    @property
+    def history_size(self) -> int:
+        return self.statistics.history.capacity
+
+    def set_seed(self, seed: int, prim_path: str):
+        """Seed the node's own random stream from its seed and prim path
+
+        The generator is only recreated when the seed or the prim path
+        change, and the rest of the current sample block is dropped.
+        """
+        seed_key = (seed, prim_path)
+        if seed_key == self.seed_key:
+            return
+        self.seed_key = seed_key
+        self.node_name = prim_path.split('/')[-1]
+        self.sample_block.rng = node_rng(seed, prim_path)
+        self.sample_block.invalidate()
 
     def update_statistics(
         self,
         latency_value: float,
     ):
         """Update internal statistics with new latency value"""
-        self.sample_count += 1
-        self.min_latency = min(self.min_latency, latency_value)
-        self.max_latency = max(self.max_latency, latency_value)
-        
-        # Maintain rolling history
-        self.history.append(latency_value)
-        if len(self.history) > self.history_size:
-            self.history.pop(0)
+        self.statistics.update(latency_value)
             
     def reset_statistics(self):
         """Reset all statistics to initial state"""
-        self.sample_count = 0
-        self.min_latency = float('inf')
-        self.max_latency = float('-inf')
-        self.history.clear()
+        self.statistics.reset()
+        self.sample_block.invalidate()
+        self.stats_throttle.reset()
+        self.clamp_counter.reset()
 
 
 class BaseLatencySampler(ABC):
     """Abstract base class for latency distribution samplers"""
-    
-    VERBOSE = True
+
+    # Generator for one-off samples from sample_distribution()
+    _default_rng = np.random.default_rng()
 
     @staticmethod
     @abstractmethod
@@ -64,7 +122,95 @@ class BaseLatencySampler(ABC):
             bool: True if computation was successful, False otherwise
         """
         pass
-    
+
+    @staticmethod
+    @abstractmethod
+    def draw_block(rng: np.random.Generator, size: int, *params) -> np.ndarray:
+        """
+        Draw a block of unclamped samples from the distribution.
+
+        Args:
+            rng: Generator to draw from
+            size: Number of samples to draw
+            *params: Distribution parameters, in the order the sampler defines
+
+        Returns:
+            np.ndarray: 'size' samples
+        """
+        pass
+
+    @classmethod
+    def draw_sample(
+        cls,
+        state: LatencySamplerInternalState,
+        params: Tuple,
+        min_value: float,
+        max_value: float,
+        name: Optional[str] = None,
+        verbose: bool = False
+    ) -> float:
+        """
+        Take the next sample from the per-node block buffer.
+
+        Blocks are drawn from the node's own generator (see
+        seed_state) with cls.draw_block and clamped to
+        [min_value, max_value] in one vectorized call; the buffer is
+        refilled when it runs out or when params / min / max change.
+
+        In verbose mode, clamped samples are counted and logged as one
+        summary per CLAMP_LOG_INTERVAL (see log_clamp_summary).
+        """
+        block = state.sample_block
+        value = block.next(cls.draw_block, params, min_value, max_value)
+
+        if verbose:
+            if value != block.last_unclamped:
+                state.clamp_counter.add("min" if block.last_unclamped < min_value else "max")
+            BaseLatencySampler.log_clamp_summary(state, name)
+        return value
+
+    @staticmethod
+    def log_clamp_summary(state: LatencySamplerInternalState, name: Optional[str] = None):
+        """Log the clamps counted in state.clamp_counter, at most once per CLAMP_LOG_INTERVAL
+
+        Nothing is formatted unless a summary is due and warnings are logged.
+        """
+        summary = state.clamp_counter.collect()
+        if summary is None or not BaseLatencySampler._warn_enabled():
+            return
+
+        counts, elapsed = summary
+        log_name = name if name else "Sampled value"
+        for event, n in counts.items():
+            carb.log_warn(
+                f"[{state.node_name}] {log_name}: {n} samples clamped "
+                f"to {event} in the last {elapsed:.0f} s."
+            )
+
+    @staticmethod
+    def _warn_enabled() -> bool:
+        """Whether carb's log level lets warnings through"""
+        level = carb.settings.get_settings().get("/log/level")
+        return level is None or str(level).lower() in _WARN_LOG_LEVELS
+
+    @staticmethod
+    def sampling_bounds(bounds_mode: str, min_value: float, max_value: float) -> Tuple[float, float]:
+        """
+        Range the distribution itself is truncated to, for the 'boundsMode' input.
+
+        'truncate' samples the distribution truncated to [min, max], so no
+        probability mass piles up on the bounds; 'clamp' samples the full
+        distribution and clamps the samples to [min, max].
+        """
+        if bounds_mode == "clamp":
+            return -math.inf, math.inf
+        return min_value, max_value
+
+    @staticmethod
+    def seed_state(db, state: LatencySamplerInternalState):
+        """Seed the per-node random stream from the 'seed' input and the prim path"""
+        state.set_seed(db.inputs.seed, db.abi_node.get_prim_path())
+
     @staticmethod
     def on_value_changed_callback_verbose(attr: og.Attribute):
         """Callback for when verbose mode changes"""
@@ -72,36 +218,107 @@ class BaseLatencySampler(ABC):
             prim_path = attr.get_node().get_prim_path()
             node_name = prim_path.split('/')[-1]
 
-            value = attr.get()
-
-            BaseLatencySampler.VERBOSE = value
-
-            if BaseLatencySampler.VERBOSE:
+            # Verbose mode is read per node from its own input in compute,
+            # this only reports the change
+            if attr.get():
                 carb.log_info(f"[{node_name}] Verbose mode enabled")
             else:
                 carb.log_info(f"[{node_name}] Verbose mode disabled")
         except Exception as e:
             print(f"[{node_name}] Error in on_value_changed_callback_verbose: {e}")
 
+    @staticmethod
+    def stats_due(db, state: LatencySamplerInternalState) -> bool:
+        """
+        Whether the statistics state attributes are written on this compute.
+
+        Writes are throttled to every 'statsUpdateInterval' samples and at
+        most one per 'statsUpdatePeriod' seconds, and with
+        'statsOnlyWhenSelected' they are skipped while the node is not
+        selected (not shown in the property panel). The statistics
+        themselves are updated on every sample regardless.
+        """
+        settings = (max(0, db.inputs.statsUpdateInterval), max(0.0, db.inputs.statsUpdatePeriod))
+        if settings != state.stats_settings:
+            state.stats_throttle.configure(*settings)
+            state.stats_settings = settings
+
+        if not state.stats_throttle.due():
+            return False
+        if db.inputs.statsOnlyWhenSelected:
+            return BaseLatencySampler._is_selected(db.abi_node.get_prim_path())
+        return True
+
+    @staticmethod
+    def _is_selected(prim_path: str) -> bool:
+        """Whether the prim is selected in the stage, i.e. shown in the property panel"""
+        selection = omni.usd.get_context().get_selection()
+        return prim_path in selection.get_selected_prim_paths()
+
     @staticmethod
     def _update_state_outputs(
         db,
         state: LatencySamplerInternalState,
         latency_value: float
-    ):
-        """Update state outputs if they exist in the node definition"""
+    ) -> bool:
+        """Update state outputs if they exist in the node definition
+
+        Skipped unless stats_due, so hot loops can avoid the writes.
+        Returns whether they were written, so nodes can write their own
+        state attributes on the same schedule.
+        """
+        if not BaseLatencySampler.stats_due(db, state):
+            return False
+
         try:
+            statistics = state.statistics
+
             if hasattr(db.state, 'latencyHistory'):
                 # Convert history to appropriate format for output
-                db.state.latencyHistory = state.history[-100:]  # Last 100 samples
+                db.state.latencyHistory = statistics.history.latest(100)  # Last 100 samples
                 
             if hasattr(db.state, 'latencyCount'):
-                db.state.latencyCount = state.sample_count
+                db.state.latencyCount = statistics.count
+
+            if hasattr(db.state, 'min'):
+                db.state.min = statistics.min
+
+            if hasattr(db.state, 'max'):
+                db.state.max = statistics.max
+
+            if hasattr(db.state, 'latencyMean'):
+                db.state.latencyMean = statistics.mean
+
+            if hasattr(db.state, 'latencyStdDev'):
+                db.state.latencyStdDev = statistics.std
+
+            if hasattr(db.state, 'latencyEwma'):
+                db.state.latencyEwma = statistics.ewma
+
+            # Streaming (P²) estimates of the percentiles
+            if hasattr(db.state, 'latencyP50'):
+                db.state.latencyP50 = statistics.quantile(0.5)
+
+            if hasattr(db.state, 'latencyP95'):
+                db.state.latencyP95 = statistics.quantile(0.95)
+
+            if hasattr(db.state, 'latencyP99'):
+                db.state.latencyP99 = statistics.quantile(0.99)
                 
         except AttributeError:
             # Some state attributes might not exist in all node definitions
             pass
 
+        return True
+
+    ### === Utility Methods for Validation === ###
+    @staticmethod
+    def validate_positive(value: float, name: Optional[str] = None):
+        """Raise a ValueError if value is not strictly positive"""
+        if not value > 0:
+            log_name = name if name else "A value"
+            raise ValueError(f"{log_name} must be positive, got {value}")
+
     ### === Utility Methods for Clamping=== ###
     @staticmethod
     def clamp_non_negative(
@@ -111,7 +328,7 @@ class BaseLatencySampler(ABC):
     ) -> float:
         """Clamp a value to be non-negative"""
         if value < 0:
-            if verbose:
+            if verbose and BaseLatencySampler._warn_enabled():
                 log_name = name if name else "A value"
                 carb.log_warn(
                     f"{log_name} was negative ({value}),"
@@ -129,7 +346,7 @@ class BaseLatencySampler(ABC):
     ) -> float:
         """Clamp a value to be at least min_value"""
         if value < min_value:
-            if verbose:
+            if verbose and BaseLatencySampler._warn_enabled():
                 log_name = name if name else "A value"
                 carb.log_warn(
                     f"{log_name} ({value}) was less than"
@@ -147,7 +364,7 @@ class BaseLatencySampler(ABC):
     ) -> float:
         """Clamp a value to be at most max_value"""
         if value > max_value:
-            if verbose:
+            if verbose and BaseLatencySampler._warn_enabled():
                 log_name = name if name else "A value"
                 carb.log_warn(
                     f"{log_name} ({value}) was greater than"
@@ -171,7 +388,7 @@ class BaseLatencySampler(ABC):
         if clamped_val > max_val:
             clamped_val = max_val
         
-        if verbose and clamped_val != value:
+        if verbose and clamped_val != value and BaseLatencySampler._warn_enabled():
             log_name = name if name else "Sampled value"
             carb.log_warn(
                 f"{log_name} ({value}) was outside range"